@@ -1,35 +1,173 @@
-import google.generativeai as genai
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
 import json
 
+from metrics import llm_request_duration, llm_requests
+from llm_backends import get_backend
+
 # Load environment variables
 load_dotenv()
 
-# Configure Google Gemini API
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
+# Model call limits; see README "AI Reliability"
+LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', '10'))
+LLM_FAILURE_THRESHOLD = int(os.getenv('LLM_FAILURE_THRESHOLD', '3'))
+LLM_COOLDOWN_SECONDS = float(os.getenv('LLM_COOLDOWN_SECONDS', '60'))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+# In-flight calls for background jobs (campaigns, fit analysis, insight refresh), kept apart from the dashboard's
+LLM_BACKGROUND_CONCURRENCY = int(os.getenv('LLM_BACKGROUND_CONCURRENCY', '4'))
+
+class CircuitOpenError(Exception):
+    """Raised when AI calls are skipped because the circuit breaker is open"""
+
+class ModelBusyError(Exception):
+    """Raised when every model call thread is still busy with an earlier call"""
+
+class CircuitBreaker:
+    """
+    Stops calling the AI provider after repeated failures
+
+    After failure_threshold consecutive failures the breaker opens and every
+    call fails fast for cooldown seconds. Then a single trial call is let
+    through: success closes the breaker, failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+    
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                return 'half-open'
+            return 'open'
+    
+    def allow(self):
+        """
+        Whether a call may be attempted now
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+    
+    def release_trial(self):
+        """
+        Give up a trial call allowed by allow() without recording a result
+        """
+        with self.lock:
+            self.trial_in_flight = False
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+circuit_breaker = CircuitBreaker(LLM_FAILURE_THRESHOLD, LLM_COOLDOWN_SECONDS)
+
+# Model calls run here so a hung request can be abandoned at the deadline
+_executor = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY + LLM_BACKGROUND_CONCURRENCY, thread_name_prefix='llm')
+# One slot per executor thread, held until the call actually returns; an
+# abandoned call keeps its thread, so interactive callers must not queue behind it
+_call_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+_background_call_slots = threading.BoundedSemaphore(LLM_BACKGROUND_CONCURRENCY)
+
+def _call_model(prompt):
+    return get_backend().generate(prompt)
+
+def _generate_content(function, prompt, background=False):
+    """
+    Send a prompt to the configured backend and return the response text, recording call latency
+
+    Raises CircuitOpenError without calling the provider while the breaker is
+    open, and TimeoutError if no response arrives within LLM_TIMEOUT_SECONDS.
+    Interactive calls raise ModelBusyError at once if all LLM_MAX_CONCURRENCY
+    calls are still running; background calls use their own
+    LLM_BACKGROUND_CONCURRENCY slots and wait up to LLM_TIMEOUT_SECONDS for one. Only timeouts and
+    provider errors count as breaker failures, not a busy process.
+    """
+    if not circuit_breaker.allow():
+        raise CircuitOpenError("AI calls paused after repeated failures")
+    slots = _background_call_slots if background else _call_slots
+    if not (slots.acquire(timeout=LLM_TIMEOUT_SECONDS) if background else slots.acquire(blocking=False)):
+        # A half-open trial that never ran must not keep the breaker waiting for it
+        circuit_breaker.release_trial()
+        raise ModelBusyError(f"All {LLM_BACKGROUND_CONCURRENCY if background else LLM_MAX_CONCURRENCY} AI call threads are busy")
+    
+    started = time.perf_counter()
+    try:
+        try:
+            future = _executor.submit(_call_model, prompt)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            text = future.result(timeout=LLM_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"AI call timed out after {LLM_TIMEOUT_SECONDS:g}s")
+    except Exception:
+        circuit_breaker.record_failure()
+        raise
+    finally:
+        llm_request_duration.observe(time.perf_counter() - started, function=function)
+    
+    circuit_breaker.record_success()
+    return text
+
+def ai_available():
+    """
+    Whether pitches will come from the AI model rather than the fallback template
+    """
+    return get_backend().available()
 
-def generate_pitch_with_ai(bd_person, market_data, connection_context=""):
+def generate_pitch_with_ai(bd_person, market_data, connection_context="", raise_on_error=False, peer_companies=None, background=False):
     """
-    Generate a personalized pitch using Google Gemini AI
+    Generate a personalized pitch using the configured AI backend (Gemini by default)
     
     Args:
         bd_person (dict): BD person information
         market_data (dict): Market data for the company
         connection_context (str): Additional connection context
+        raise_on_error (bool): Re-raise AI failures instead of falling back,
+            so callers such as batch campaigns can retry
+        peer_companies (list): Look-alike companies with similar focus and needs
+        background (bool): Call from a background job, using its own call slots
     
     Returns:
         str: Generated pitch text
     """
     
-    if not GOOGLE_API_KEY:
+    if not ai_available():
+        llm_requests.inc(function='generate_pitch', outcome='fallback')
         return generate_fallback_pitch(bd_person, market_data, connection_context)
     
     try:
-        # Configure the model
-        model = genai.GenerativeModel('gemini-pro')
+        peer_line = ""
+        if peer_companies:
+            peer_line = (f"Look-alike Companies (similar focus and needs; not necessarily Asymchem clients): "
+                         f"{', '.join(peer_companies)}\n")
         
         # Create the prompt
         prompt = f"""
@@ -41,7 +179,7 @@ def generate_pitch_with_ai(bd_person, market_data, connection_context=""):
         Pain Point: {market_data['pain_point']}
         Asymchem Solution: {market_data['solution']}
         Connection Context: {connection_context}
-        
+        {peer_line}
         Requirements:
         1. Professional and personalized tone
         2. Reference the specific pain point and solution
@@ -55,15 +193,28 @@ def generate_pitch_with_ai(bd_person, market_data, connection_context=""):
         """
         
         # Generate the response
-        response = model.generate_content(prompt)
+        text = _generate_content('generate_pitch', prompt, background=background)
         
-        if response.text:
-            return response.text
+        if text:
+            llm_requests.inc(function='generate_pitch', outcome='ai')
+            return text
+        elif raise_on_error:
+            raise ValueError("AI returned an empty pitch")
         else:
+            llm_requests.inc(function='generate_pitch', outcome='fallback')
             return generate_fallback_pitch(bd_person, market_data, connection_context)
             
+    except CircuitOpenError:
+        llm_requests.inc(function='generate_pitch', outcome='circuit_open')
+        if raise_on_error:
+            raise
+        return generate_fallback_pitch(bd_person, market_data, connection_context)
     except Exception as e:
+        if raise_on_error:
+            llm_requests.inc(function='generate_pitch', outcome='error')
+            raise
         print(f"AI generation failed: {e}")
+        llm_requests.inc(function='generate_pitch', outcome='fallback')
         return generate_fallback_pitch(bd_person, market_data, connection_context)
 
 def generate_fallback_pitch(bd_person, market_data, connection_context=""):
@@ -99,12 +250,11 @@ def analyze_company_fit(company_data, market_data):
     Analyze the fit between a company and Asymchem's capabilities
     """
     
-    if not GOOGLE_API_KEY:
+    if not ai_available():
+        llm_requests.inc(function='analyze_company_fit', outcome='fallback')
         return "AI analysis not available. Please check API configuration."
     
     try:
-        model = genai.GenerativeModel('gemini-pro')
-        
         prompt = f"""
         Analyze the business fit between {company_data['company']} and Asymchem based on the following data:
         
@@ -123,23 +273,157 @@ def analyze_company_fit(company_data, market_data):
         Keep it concise and actionable.
         """
         
-        response = model.generate_content(prompt)
-        return response.text if response.text else "Analysis not available."
+        text = _generate_content('analyze_company_fit', prompt)
+        llm_requests.inc(function='analyze_company_fit', outcome='ai' if text else 'fallback')
+        return text if text else "Analysis not available."
         
+    except CircuitOpenError:
+        llm_requests.inc(function='analyze_company_fit', outcome='circuit_open')
+        return "AI analysis not available. Please try again later."
     except Exception as e:
+        llm_requests.inc(function='analyze_company_fit', outcome='error')
         return f"Analysis failed: {e}"
 
-def generate_connection_insights(connections_text):
+def _build_fit_batch_prompt(market_rows):
+    """
+    Build one prompt asking for a JSON fit analysis of several companies
+    """
+    companies = "\n".join(
+        f"""
+        - Company: {row['company']}
+          Focus: {row['focus']}
+          Pain Point: {row['pain_point']}
+          Market Value: ${row['market_value']}M
+          Business Potential: ${row['business_potential']}M
+          Tech Mapping Score: {row['tech_mapping']}/10"""
+        for row in market_rows
+    )
+    
+    return f"""
+        Analyze the business fit between Asymchem, a leading pharmaceutical CDMO, and each of these companies:
+        {companies}
+        
+        Respond with only a JSON array and no other text. Include one object per company, in the same order,
+        with exactly these keys:
+        - "company": the company name, copied exactly
+        - "fit_score": a number from 0 to 10 for strategic fit
+        - "opportunity": one sentence on the market opportunity
+        - "approach": one sentence on the recommended approach
+        """
+
+def parse_fit_response(text, companies):
+    """
+    Parse and validate a batched fit analysis response
+    
+    Args:
+        text (str): Model response, optionally wrapped in a ```json fence
+        companies (list): Company names that were asked about
+    
+    Returns:
+        dict: company -> {'fit_score', 'opportunity', 'approach'} for every valid item
+    """
+    text = (text or '').strip()
+    if text.startswith('```'):
+        text = text.strip('`')
+        if text.lower().startswith('json'):
+            text = text[4:]
+    
+    try:
+        items = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+    
+    expected = set(companies)
+    results = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get('company') not in expected:
+            continue
+        try:
+            fit_score = float(item.get('fit_score'))
+        except (TypeError, ValueError):
+            continue
+        opportunity = item.get('opportunity')
+        approach = item.get('approach')
+        if not 0 <= fit_score <= 10 or not isinstance(opportunity, str) or not isinstance(approach, str):
+            continue
+        if not opportunity.strip() or not approach.strip():
+            continue
+        results[item['company']] = {
+            'fit_score': fit_score,
+            'opportunity': opportunity.strip(),
+            'approach': approach.strip()
+        }
+    return results
+
+def analyze_companies_fit(market_rows, batch_size=5, max_retries=2, background=False, progress=None):
+    """
+    Analyze the fit of many companies, packing batch_size companies into each AI call
+    
+    Items missing or invalid in a response are retried, in smaller groups of
+    the failed companies only, up to max_retries more times.
+    
+    Args:
+        market_rows (list): Market data dicts (company, focus, pain_point, market_value, business_potential, tech_mapping)
+        batch_size (int): Companies per prompt
+        max_retries (int): Extra attempts for companies whose result was missing or invalid
+        background (bool): Call from a background job, using its own call slots
+        progress (callable): Optional callback receiving the number of companies analyzed after each call
+    
+    Returns:
+        tuple: (dict of company -> analysis, list of companies that could not be analyzed)
+    """
+    if not ai_available():
+        llm_requests.inc(function='analyze_companies_fit', outcome='fallback')
+        return {}, [row['company'] for row in market_rows]
+    
+    results = {}
+    pending = list(market_rows)
+    for attempt in range(max_retries + 1):
+        failed = []
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                text = _generate_content('analyze_companies_fit', _build_fit_batch_prompt(batch), background=background)
+            except CircuitOpenError:
+                llm_requests.inc(function='analyze_companies_fit', outcome='circuit_open')
+                failed.extend(pending[start:])
+                return results, [row['company'] for row in failed]
+            except Exception as e:
+                print(f"Batched fit analysis failed: {e}")
+                llm_requests.inc(function='analyze_companies_fit', outcome='error')
+                failed.extend(batch)
+                continue
+            
+            parsed = parse_fit_response(text, [row['company'] for row in batch])
+            llm_requests.inc(function='analyze_companies_fit', outcome='ai' if parsed else 'error')
+            results.update(parsed)
+            failed.extend(row for row in batch if row['company'] not in parsed)
+            if progress:
+                progress(len(results))
+        
+        if not failed:
+            break
+        pending = failed
+        batch_size = max(1, batch_size // 2)
+    
+    return results, [row['company'] for row in pending if row['company'] not in results]
+
+def generate_connection_insights(connections_text, raise_on_error=False, background=False):
     """
     Generate insights about network connections
+    
+    With raise_on_error, AI failures and empty responses raise instead of
+    returning a message, so stored insights never contain error text.
+    background calls (the refresh job) use their own call slots.
     """
     
-    if not GOOGLE_API_KEY:
+    if not ai_available():
+        llm_requests.inc(function='connection_insights', outcome='fallback')
         return "AI insights not available. Please check API configuration."
     
     try:
-        model = genai.GenerativeModel('gemini-pro')
-        
         prompt = f"""
         Analyze these business connections and provide strategic insights:
         
@@ -153,8 +437,19 @@ def generate_connection_insights(connections_text):
         Keep it concise and practical.
         """
         
-        response = model.generate_content(prompt)
-        return response.text if response.text else "Insights not available."
+        text = _generate_content('connection_insights', prompt, background=background)
+        if not text and raise_on_error:
+            raise ValueError("AI returned empty insights")
+        llm_requests.inc(function='connection_insights', outcome='ai' if text else 'fallback')
+        return text if text else "Insights not available."
         
+    except CircuitOpenError:
+        llm_requests.inc(function='connection_insights', outcome='circuit_open')
+        if raise_on_error:
+            raise
+        return "AI insights not available. Please try again later."
     except Exception as e:
+        llm_requests.inc(function='connection_insights', outcome='error')
+        if raise_on_error:
+            raise
         return f"Insights generation failed: {e}"
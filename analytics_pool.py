@@ -0,0 +1,262 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from metrics import cache_requests
+
+# Worker processes for network analytics, per dashboard process (i.e. per gunicorn worker)
+ANALYTICS_WORKERS = int(os.getenv('ANALYTICS_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+
+# People kept in the influence ranking, and suggestions kept per person
+INFLUENCE_TOP_N = 50
+SUGGESTIONS_PER_PERSON = 5
+
+# Finished analyses kept, keyed by (analysis, graph version)
+RESULT_CACHE_SIZE = 8
+
+# PageRank parameters for the influence ranking
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-9
+
+ANALYSES = {
+    'influence': 'Influence ranking (PageRank over weighted connections)',
+    'suggestions': 'Introductions for everyone (common connections)'
+}
+
+_lock = threading.Lock()
+_executor = None
+# Shared adjacency per graph version, with the number of jobs using it
+_graphs: Dict[str, 'SharedGraph'] = {}
+_jobs = {}
+_results = OrderedDict()
+# Last failure per job key, reported by get_analysis until the job is submitted again
+_failed = {}
+
+
+class SharedGraph:
+    """
+    CSR adjacency arrays copied once into shared memory, so pool workers map them instead of unpickling a copy
+    """
+
+    def __init__(self, names: List[str], indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+        self.names = names
+        self.jobs = 0
+        self._blocks = []
+        self.spec = {}
+        for key, array in (('indptr', indptr), ('indices', indices), ('weights', weights)):
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self._blocks.append(block)
+            self.spec[key] = (block.name, array.dtype.str, array.shape)
+
+    def release(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def _attach(spec: Dict) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    blocks, arrays = [], {}
+    for key, (name, dtype, shape) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return blocks, arrays
+
+
+def _run_analysis(analysis: str, spec: Dict):
+    """
+    Run one analysis in a pool worker on the shared adjacency arrays
+    """
+    blocks, arrays = _attach(spec)
+    try:
+        if analysis == 'influence':
+            return _influence(arrays['indptr'], arrays['indices'], arrays['weights'])
+        if analysis == 'suggestions':
+            return _suggestions(arrays['indptr'], arrays['indices'])
+        raise ValueError(f"Unknown analysis: {analysis}")
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _influence(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted PageRank; returns the positions and scores of the INFLUENCE_TOP_N highest-ranked people
+    """
+    n = len(indptr) - 1
+    if n == 0:
+        return np.array([], dtype=np.int32), np.array([])
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    strength = np.bincount(rows, weights=weights, minlength=n)
+    dangling = strength == 0
+    share = weights / strength[rows] if len(rows) else weights.astype(np.float64)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        spread = np.bincount(indices, weights=rank[rows] * share, minlength=n)
+        updated = (1 - DAMPING) / n + DAMPING * (spread + rank[dangling].sum() / n)
+        converged = np.abs(updated - rank).sum() < TOLERANCE
+        rank = updated
+        if converged:
+            break
+
+    top = np.argsort(-rank, kind='stable')[:INFLUENCE_TOP_N]
+    return top.astype(np.int32), rank[top]
+
+
+def _suggestions(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    For every person, the unconnected people sharing the most connections with them
+
+    Returns:
+        tuple: (person, suggested, common) position and count arrays, SUGGESTIONS_PER_PERSON per person at most
+    """
+    people, suggested, common = [], [], []
+    for person in range(len(indptr) - 1):
+        neighbors = indices[indptr[person]:indptr[person + 1]]
+        if not len(neighbors):
+            continue
+        # Neighbors of neighbors, gathered in one indexing operation
+        starts, lengths = indptr[neighbors], np.diff(indptr)[neighbors]
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        candidates, counts = np.unique(indices[offsets], return_counts=True)
+        keep = ~np.isin(candidates, neighbors) & (candidates != person)
+        candidates, counts = candidates[keep], counts[keep]
+        if len(candidates) > SUGGESTIONS_PER_PERSON:
+            best = np.argpartition(-counts, SUGGESTIONS_PER_PERSON - 1)[:SUGGESTIONS_PER_PERSON]
+            candidates, counts = candidates[best], counts[best]
+        order = np.lexsort((candidates, -counts))
+        people.append(np.full(len(order), person, dtype=np.int32))
+        suggested.append(candidates[order].astype(np.int32))
+        common.append(counts[order].astype(np.int32))
+    if not people:
+        empty = np.array([], dtype=np.int32)
+        return empty, empty, empty
+    return np.concatenate(people), np.concatenate(suggested), np.concatenate(common)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # forkserver workers do not inherit the dashboard's threads and locks, unlike fork
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        _executor = ProcessPoolExecutor(max_workers=ANALYTICS_WORKERS, mp_context=multiprocessing.get_context(method))
+    return _executor
+
+
+def _job_key(analysis: str, version: str) -> str:
+    return f"{analysis}@{version}"
+
+
+def submit_analysis(analysis: str, version: str,
+                    export_adjacency: Callable[[], Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]]) -> str:
+    """
+    Start an analysis of the graph at a version in the process pool, unless it is cached or running
+
+    export_adjacency is only called when no job is using this version's
+    adjacency already. Returns the job key to pass to get_analysis.
+    """
+    if analysis not in ANALYSES:
+        raise ValueError(f"Unknown analysis: {analysis}")
+    key = _job_key(analysis, version)
+    with _lock:
+        if key in _results:
+            _results.move_to_end(key)
+            cache_requests.inc(cache='network_analytics', result='hit')
+            return key
+        if key in _jobs:
+            return key
+        cache_requests.inc(cache='network_analytics', result='miss')
+        _failed.pop(key, None)
+
+        graph = _graphs.get(version)
+        if graph is None:
+            graph = _graphs[version] = SharedGraph(*export_adjacency())
+        graph.jobs += 1
+        try:
+            future = _get_executor().submit(_run_analysis, analysis, graph.spec)
+        except Exception:
+            _release_graph(version)
+            raise
+        _jobs[key] = future
+    future.add_done_callback(lambda done: _finish(analysis, version, done))
+    return key
+
+
+def _release_graph(version: str):
+    graph = _graphs[version]
+    graph.jobs -= 1
+    if not graph.jobs:
+        graph.release()
+        del _graphs[version]
+
+
+def _finish(analysis: str, version: str, future):
+    """
+    Convert a finished job's positions to names, cache the result and free the shared adjacency
+    """
+    key = _job_key(analysis, version)
+    with _lock:
+        names = _graphs[version].names
+        try:
+            result = {'status': 'done', 'analysis': analysis, 'version': version,
+                      'result': _named_result(analysis, names, future.result())}
+        except Exception as e:
+            print(f"Error running network analysis {key}: {e}")
+            result = {'status': 'error', 'analysis': analysis, 'version': version, 'error': str(e)}
+        _jobs.pop(key, None)
+        _release_graph(version)
+        if result['status'] == 'done':
+            _results[key] = result
+            while len(_results) > RESULT_CACHE_SIZE:
+                _results.popitem(last=False)
+        else:
+            _failed[key] = result
+
+
+def _named_result(analysis: str, names: List[str], output) -> List[Dict]:
+    if analysis == 'influence':
+        positions, scores = output
+        return [{'name': names[position], 'score': float(score)} for position, score in zip(positions.tolist(), scores.tolist())]
+    people, suggested, common = output
+    return [
+        {'person': names[person], 'suggested': names[other], 'common_connections': count}
+        for person, other, count in zip(people.tolist(), suggested.tolist(), common.tolist())
+    ]
+
+
+def get_analysis(key: str) -> Optional[Dict]:
+    """
+    Get the state of a submitted analysis
+
+    Returns:
+        dict: status 'running', 'done' (with result) or 'error' (with error); None for an unknown key
+    """
+    with _lock:
+        if key in _results:
+            return _results[key]
+        if key in _jobs:
+            analysis, _, version = key.partition('@')
+            return {'status': 'running', 'analysis': analysis, 'version': version}
+        return _failed.get(key)
+
+
+@atexit.register
+def _shutdown():
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    with _lock:
+        for graph in _graphs.values():
+            graph.release()
+        _graphs.clear()
@@ -1,34 +1,89 @@
+import time
+
+_import_started = time.perf_counter()
+
 import dash
-from dash import Dash, html, dcc, dash_table, Input, Output, State, callback_context
+from dash import Dash, html, dcc, dash_table, Input, Output, State, Patch, callback_context
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 import dash_cytoscape as cyto
 import json
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Import our custom modules
-from database import init_database, populate_initial_data, get_market_data, get_bd_data, get_leadership_data, add_bd_person
+from database import init_database, populate_initial_data, get_market_data, get_bd_data, get_leadership_data, add_bd_person, get_company_fits, save_company_fits, get_connection_insights_for_company, get_follow_ups, get_data_version, parse_data_version, search_records, search_available, HIGHLIGHT_START, HIGHLIGHT_END
 from network_analyzer import NetworkAnalyzer
-from ai_pitch_generator import generate_pitch_with_ai, analyze_company_fit, generate_connection_insights
+from analytics_pool import submit_analysis, get_analysis, ANALYSES
+from ai_pitch_generator import generate_pitch_with_ai, analyze_companies_fit
+from llm_backends import get_backend
+from batch_campaign import run_campaign, export_campaign_csv, default_campaign_id
+from exports import register_export_routes, register_static_dataset
+from metrics import instrumented_callback, register_metrics_route, cache_requests
+from profiling import profiled, register_profiling_routes
+from prospect_recommender import ProspectIndex
+from opportunity_scoring import OpportunityScorer, FACTORS, DEFAULT_WEIGHTS, TIERS
+from sync_api import get_changes, register_sync_routes
+from follow_ups import format_due
 
 # Load environment variables
 load_dotenv()
 
-# Initialize database
-init_database()
-populate_initial_data()
+# Startup phases as (name, seconds), printed once the app is created
+startup_timings = [('imports', time.perf_counter() - _import_started)]
+
+@contextmanager
+def startup_phase(name):
+    """
+    Time a startup phase and record it in startup_timings
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings.append((name, time.perf_counter() - started))
+
+def format_startup_timings(timings):
+    return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings)
 
 # Initialize network analyzer
 network_analyzer = NetworkAnalyzer()
 
-# Initialize the Dash app
-app = Dash(__name__, external_stylesheets=['https://cdn.jsdelivr.net/npm/tailwindcss@2.2.19/dist/tailwind.min.css'])
+# How often open dashboards poll for changes made by other users or workers
+SYNC_INTERVAL_SECONDS = float(os.getenv('SYNC_INTERVAL_SECONDS', '10'))
+
+# Largest neighborhood drawn when a person is selected in the network graph
+EGO_MAX_NODES = int(os.getenv('EGO_MAX_NODES', '200'))
+
+# Look-alike companies listed in the prospects panel and passed to pitch generation
+LOOKALIKE_COUNT = 8
+LOOKALIKE_PITCH_PEERS = 3
+
+# Market companies drawn individually in the bubble chart: SVG up to
+# BUBBLE_WEBGL_THRESHOLD, WebGL up to BUBBLE_MAX_POINTS, grouped on a
+# BUBBLE_GRID_BINS x BUBBLE_GRID_BINS grid beyond that (re-grouped as the user zooms)
+BUBBLE_WEBGL_THRESHOLD = 1000
+BUBBLE_MAX_POINTS = int(os.getenv('BUBBLE_MAX_POINTS', '2000'))
+BUBBLE_GRID_BINS = 40
+
+# Full-text search results per page
+SEARCH_PAGE_SIZE = 10
 
-# Get initial data
-df_market = get_market_data()
-df_bd = get_bd_data()
-leadership_data = get_leadership_data()
+# Companies listed in the opportunity ranking table
+OPPORTUNITY_TABLE_ROWS = 200
+
+# Rows shown for a finished network analysis
+ANALYTICS_DISPLAY_ROWS = 15
+
+# Follow-ups listed per group (upcoming, overdue) in the follow-up panel
+FOLLOW_UP_PANEL_ROWS = 20
+
+# Companies per AI call when scoring company fit
+FIT_ANALYSIS_BATCH_SIZE = int(os.getenv('FIT_ANALYSIS_BATCH_SIZE', '5'))
 
 # Step 3: Prepare Additional Data for New Visualizations
 # Competitor Analysis Radar Chart Data
@@ -85,36 +140,127 @@ cdmo_comparison_data = [
     }
 ]
 
-# Create bubble chart
-fig_bubble = go.Figure(data=[
-    go.Scatter(
-        x=df_market['business_potential'],
-        y=df_market['tech_mapping'],
+# Create visualization functions
+def _market_column(df_market, column):
+    return pd.to_numeric(df_market[column], errors='coerce').to_numpy(dtype=np.float64)
+
+def create_bubble_chart(df_market, x_range=None, y_range=None):
+    """
+    Create the market prioritization bubble chart
+
+    Only companies inside x_range/y_range (business potential, tech mapping) are
+    drawn. Up to BUBBLE_MAX_POINTS of them are drawn individually (with WebGL
+    above BUBBLE_WEBGL_THRESHOLD); beyond that they are grouped on a grid, so
+    the figure size is bounded. Hover text is built in the browser from customdata.
+    """
+    x = _market_column(df_market, 'business_potential')
+    y = _market_column(df_market, 'tech_mapping')
+    value = np.nan_to_num(_market_column(df_market, 'market_value'))
+    visible = np.isfinite(x) & np.isfinite(y)
+    if x_range:
+        visible &= (x >= x_range[0]) & (x <= x_range[1])
+    if y_range:
+        visible &= (y >= y_range[0]) & (y <= y_range[1])
+    positions = np.flatnonzero(visible)
+    
+    title = 'Market Prioritization: Biosynthesis Opportunities'
+    if len(positions) <= BUBBLE_MAX_POINTS:
+        trace = _company_trace(df_market, positions, x, y, value)
+    else:
+        trace = _binned_trace(df_market, positions, x, y, value, x_range, y_range)
+        title += f' ({len(positions):,} companies, grouped - zoom in for detail)'
+    
+    fig = go.Figure(data=[trace])
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title='Business Potential ($M)',
+        yaxis_title='Tech Mapping (0-10)',
+        plot_bgcolor='#111827',
+        paper_bgcolor='#111827',
+        font=dict(color='white'),
+        # Keep the user's zoom when the figure is replaced with a refined one
+        uirevision='market'
+    )
+    if x_range:
+        fig.update_xaxes(range=list(x_range))
+    if y_range:
+        fig.update_yaxes(range=list(y_range))
+    
+    return fig
+
+def _company_trace(df_market, positions, x, y, value):
+    """
+    One bubble per company
+    """
+    trace_type = go.Scattergl if len(positions) > BUBBLE_WEBGL_THRESHOLD else go.Scatter
+    return trace_type(
+        x=x[positions],
+        y=y[positions],
         mode='markers',
         marker=dict(
-            size=df_market['market_value'] / 10,  # Adjusted scaling
+            size=value[positions] / 10,  # Adjusted scaling
             sizemode='area',
             sizemin=15,
-            sizeref=2 * max(df_market['market_value']) / (40**2),  # Better size reference
-            color=df_market['tech_mapping'],
+            sizeref=2 * max(value.max(initial=0), 1) / (40**2),  # Better size reference
+            color=y[positions],
             colorscale='Viridis',
             showscale=True
         ),
-        text=df_market['company'] + '<br>Pain Point: ' + df_market['pain_point'] + '<br>Potential: $' + df_market['business_potential'].astype(str) + 'M' + '<br>Focus: ' + df_market['focus'] + '<br>Solution: ' + df_market['solution'],
-        hoverinfo='text'
+        customdata=df_market.iloc[positions][['company', 'pain_point', 'focus', 'solution']].to_numpy(),
+        hovertemplate='%{customdata[0]}<br>Pain Point: %{customdata[1]}<br>Potential: $%{x}M'
+                      '<br>Focus: %{customdata[2]}<br>Solution: %{customdata[3]}<extra></extra>'
     )
-])
-
-fig_bubble.update_layout(
-    title='Market Prioritization: Biosynthesis Opportunities',
-    xaxis_title='Business Potential ($M)',
-    yaxis_title='Tech Mapping (0-10)',
-    plot_bgcolor='#111827',
-    paper_bgcolor='#111827',
-    font=dict(color='white')
-)
 
-# Create visualization functions
+def _binned_trace(df_market, positions, x, y, value, x_range, y_range):
+    """
+    One bubble per occupied cell of a BUBBLE_GRID_BINS grid over the visible range,
+    at the cell's mean position and sized by its total market value
+    """
+    def cell_of(values, bounds):
+        low, high = bounds if bounds else (values.min(), values.max())
+        span = (high - low) or 1.0
+        return np.clip(((values - low) / span * BUBBLE_GRID_BINS).astype(np.int64), 0, BUBBLE_GRID_BINS - 1)
+    
+    x, y, value = x[positions], y[positions], value[positions]
+    cells = cell_of(x, x_range) * BUBBLE_GRID_BINS + cell_of(y, y_range)
+    # Largest company first within each cell
+    order = np.lexsort((-value, cells))
+    _, first, counts = np.unique(cells[order], return_index=True, return_counts=True)
+    
+    totals = np.add.reduceat(value[order], first)
+    mean_x = np.add.reduceat(x[order], first) / counts
+    mean_y = np.add.reduceat(y[order], first) / counts
+    largest = df_market['company'].to_numpy()[positions[order[first]]]
+    
+    return go.Scattergl(
+        x=mean_x,
+        y=mean_y,
+        mode='markers',
+        marker=dict(
+            size=totals,
+            sizemode='area',
+            sizemin=6,
+            sizeref=2 * max(totals.max(), 1) / (40**2),
+            color=mean_y,
+            colorscale='Viridis',
+            showscale=True
+        ),
+        customdata=np.column_stack([counts, largest, totals]),
+        hovertemplate='%{customdata[0]} companies<br>Largest: %{customdata[1]}<br>Avg Potential: $%{x:.0f}M'
+                      '<br>Avg Tech Mapping: %{y:.1f}<br>Total Market Value: %{customdata[2]:,.0f}<extra></extra>'
+    )
+
+def _relayout_range(relayout_data, axis):
+    """
+    Axis range from a Graph's relayoutData, None if the axis was not zoomed
+    """
+    if f'{axis}.range' in relayout_data:
+        return relayout_data[f'{axis}.range']
+    if f'{axis}.range[0]' in relayout_data and f'{axis}.range[1]' in relayout_data:
+        return [relayout_data[f'{axis}.range[0]'], relayout_data[f'{axis}.range[1]']]
+    return None
+
 def create_radar_chart(data, dimensions):
     """
     Create a radar chart for competitor analysis
@@ -195,551 +341,1063 @@ def create_opportunity_matrix(data):
     
     return fig
 
-# Create network elements
-nodes, edges = network_analyzer.create_precise_network_elements(df_bd, leadership_data)
-network_elements = nodes + edges
+def create_export_links(dataset):
+    """
+    Create download links for a dataset, served by the streaming /export route
+    """
+    return html.Div(
+        className="flex space-x-2",
+        children=[
+            html.A(
+                f"⬇ {label}",
+                href=f"/export/{dataset}.{fmt}",
+                className="px-3 py-1 bg-blue-600 hover:bg-blue-700 text-white text-xs rounded transition-colors"
+            )
+            for fmt, label in [('csv', 'CSV'), ('jsonl', 'JSONL'), ('parquet', 'Parquet')]
+        ]
+    )
 
-# App layout
-app.layout = html.Div(
-    className="bg-gradient-to-br from-gray-900 via-gray-800 to-gray-900 text-white min-h-screen p-4 md:p-6 font-sans",
-    children=[
-        # Store for BD data
-        dcc.Store(id='bd-data-store', data=df_bd.to_json(date_format='iso', orient='split')),
+# Data snapshot shared by page loads, built on first use
+_data_snapshot = None
+_snapshot_lock = threading.RLock()
+
+def _build_data_snapshot():
+    """
+    Load data from the database and build the data-dependent figures and network
+    """
+    timings = []
+    
+    def phase(name, started):
+        timings.append((name, time.perf_counter() - started))
+    
+    started = time.perf_counter()
+    init_database()
+    populate_initial_data()
+    phase('database', started)
+    
+    started = time.perf_counter()
+    # Read the version first so changes made while loading are picked up by the next sync
+    version = get_data_version()
+    df_market = get_market_data()
+    df_bd = get_bd_data()
+    leadership_data = get_leadership_data()
+    df_fit = get_company_fits()
+    phase('data', started)
+    
+    started = time.perf_counter()
+    nodes, edges = network_analyzer.create_precise_network_elements(df_bd, leadership_data)
+    network_stats = network_analyzer.get_network_statistics()
+    phase('network', started)
+    
+    started = time.perf_counter()
+    figures = {
+        'bubble': create_bubble_chart(df_market),
+        'radar': create_radar_chart(competitor_data, ['Green Tech', 'Large Molecule', 'Small Molecule', 'Tech Integration', 'Global Footprint', 'Commercial Experience']),
+        'opportunity': create_opportunity_matrix(customer_opportunity_data)
+    }
+    phase('figures', started)
+    
+    print(f"Data snapshot built: {format_startup_timings(timings)}")
+    
+    return {
+        'version': version,
+        'df_market': df_market,
+        'df_bd': df_bd,
+        'df_fit': df_fit,
+        'leadership_data': leadership_data,
+        'network_elements': nodes + edges,
+        'network_stats': network_stats,
+        'figures': figures
+    }
+
+def get_data_snapshot():
+    """
+    Get the cached data snapshot, building it if needed
+    """
+    global _data_snapshot
+    snapshot = _data_snapshot
+    if snapshot is None:
+        with _snapshot_lock:
+            if _data_snapshot is None:
+                cache_requests.inc(cache='data_snapshot', result='miss')
+                _data_snapshot = _build_data_snapshot()
+            else:
+                cache_requests.inc(cache='data_snapshot', result='hit')
+            snapshot = _data_snapshot
+    else:
+        cache_requests.inc(cache='data_snapshot', result='hit')
+    return snapshot
+
+def invalidate_data_snapshot():
+    """
+    Drop the cached snapshot so the next page load re-reads the database
+    """
+    global _data_snapshot, _prospect_index, _opportunity_scorer
+    _data_snapshot = None
+    _prospect_index = None
+    _opportunity_scorer = None
+
+# Look-alike index over market text, built on first use and updated by sync_data_snapshot
+_prospect_index = None
+
+def get_prospect_index():
+    """
+    Get the look-alike prospect index for the cached snapshot, building it if needed
+    """
+    global _prospect_index
+    with _snapshot_lock:
+        snapshot = get_data_snapshot()
+        if _prospect_index is None or _prospect_index.needs_rebuild():
+            _prospect_index = ProspectIndex(snapshot['df_market'], snapshot['version'])
+        return _prospect_index
+
+# Opportunity scores over market data, rebuilt when market rows change
+_opportunity_scorer = None
+
+def get_opportunity_scorer():
+    """
+    Get the opportunity scorer for the cached snapshot's market data, building it if needed
+    """
+    global _opportunity_scorer
+    with _snapshot_lock:
+        snapshot = get_data_snapshot()
+        if _opportunity_scorer is None:
+            _opportunity_scorer = OpportunityScorer(snapshot['df_market'], snapshot['version'])
+        return _opportunity_scorer
+
+def _merge_rows(df, rows):
+    """
+    Replace or append rows (dicts with an id) in a DataFrame indexed by id
+    """
+    ids = [row['id'] for row in rows]
+    records = [{key: value for key, value in row.items() if key not in ('id', 'updated_at')} for row in rows]
+    updated = pd.DataFrame(records, index=ids, columns=df.columns)
+    return pd.concat([df.drop(index=ids, errors='ignore'), updated]).sort_index()
+
+def _is_applied(df, row):
+    """
+    Whether a changed row is already in the DataFrame with the same values
+    """
+    if row['id'] not in df.index:
+        return False
+    current = df.loc[row['id']]
+    return all(current[column] == row[column] for column in df.columns)
+
+def sync_data_snapshot():
+    """
+    Apply rows changed since the cached snapshot was built, e.g. by another worker
+    
+    Only the changed rows are read; the network is updated incrementally, and
+    the old names of renamed contacts are removed from it.
+    """
+    global _data_snapshot, _opportunity_scorer
+    with _snapshot_lock:
+        snapshot = get_data_snapshot()
+        changes = get_changes(snapshot['version'])
+        if not changes['changed']:
+            return snapshot
+        
+        updated = {'version': changes['version']}
+        
+        # Rows inside the overlap window may already be applied
+        market_rows = [row for row in changes['market'] if not _is_applied(snapshot['df_market'], row)]
+        if market_rows:
+            updated['df_market'] = _merge_rows(snapshot['df_market'], market_rows)
+            updated['figures'] = dict(snapshot['figures'], bubble=create_bubble_chart(updated['df_market']))
+            if _prospect_index is not None:
+                _prospect_index.add(market_rows)
+            _opportunity_scorer = None
+        if _prospect_index is not None:
+            _prospect_index.version = changes['version']
+        
+        bd_rows = [row for row in changes['bd'] if not _is_applied(snapshot['df_bd'], row)]
+        renamed = set()
+        if bd_rows:
+            # Old names of renamed contacts, unless another contact still has them
+            names = snapshot['df_bd']['name']
+            renamed = {names[row['id']] for row in bd_rows if row['id'] in names.index and names[row['id']] != row['name']}
+            updated['df_bd'] = _merge_rows(snapshot['df_bd'], bd_rows)
+            renamed -= set(updated['df_bd']['name'])
+        
+        leader_rows = [
+            row for row in changes['leadership']
+            if {key: row[key] for key in ('name', 'title', 'key_connections')} not in snapshot['leadership_data']
+        ]
+        if leader_rows:
+            updated['leadership_data'] = get_leadership_data()
+        
+        renamed -= {leader['name'] for leader in updated.get('leadership_data', snapshot['leadership_data'])}
+        if renamed:
+            network_analyzer.remove_people(renamed)
         
-        # Store for network statistics
-        dcc.Store(id='network-stats-store', data=json.dumps(network_analyzer.get_network_statistics())),
+        people = leader_rows + bd_rows
+        if people:
+            nodes, edges = network_analyzer.add_people(people)
+            updated['network_elements'] = nodes + edges
+            updated['network_stats'] = network_analyzer.get_network_statistics()
+        
+        _data_snapshot = dict(snapshot, **updated)
+        return _data_snapshot
 
-        html.H1("Asymchem BD Dashboard", className="text-2xl md:text-3xl lg:text-4xl font-bold text-center mb-4 md:mb-6 lg:mb-8 text-indigo-400"),
+def edges_for_changes(changes):
+    """
+    Network edges touching the people in a change feed, for /api/changes
+    """
+    sync_data_snapshot()
+    names = {row['name'] for row in changes['bd'] + changes['leadership']}
+    return network_analyzer.get_edges_for(names)
 
-        # Competitor Analysis Radar Chart Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.Div(
-                    className="flex justify-between items-center mb-3 md:mb-4",
-                    children=[
-                        html.H2("CDMO Competitor Analysis", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
-                        html.Button(
-                            "📋 Copy Data",
-                            id="copy-competitor-data",
-                            className="px-3 py-1 bg-blue-600 hover:bg-blue-700 text-white text-xs rounded transition-colors"
-                        )
-                    ]
-                ),
-                dcc.Graph(
-                    id='competitor-radar-chart',
-                    figure=create_radar_chart(competitor_data, ['Green Tech', 'Large Molecule', 'Small Molecule', 'Tech Integration', 'Global Footprint', 'Commercial Experience']),
-                    className="rounded-lg mb-6"
-                ),
-                html.H3("CDMO Competitive Analysis Table", className="text-base md:text-lg lg:text-xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
-                html.Div(
-                    className="overflow-x-auto",
-                    children=[
-                        dash_table.DataTable(
-                            id='cdmo-comparison-table',
-                            columns=[
-                                {'name': 'Criteria', 'id': 'Criteria'},
-                                {'name': 'Asymchem', 'id': 'Asymchem'},
-                                {'name': 'Lonza', 'id': 'Lonza'},
-                                {'name': 'WuXi AppTec', 'id': 'WuXi AppTec'},
-                                {'name': 'Catalent', 'id': 'Catalent'}
-                            ],
-                            data=cdmo_comparison_data,
-                            style_table={
-                                'overflowX': 'auto',
-                                'minWidth': '100%',
-                                'maxWidth': '100%',
-                                'fontSize': '12px'
-                            },
-                            style_cell={
-                                'backgroundColor': '#1f2937',
-                                'color': 'white',
-                                'fontFamily': 'sans-serif',
-                                'padding': '6px',
-                                'border': '1px solid #374151',
-                                'textAlign': 'left',
-                                'minWidth': '120px',
-                                'maxWidth': '250px',
-                                'whiteSpace': 'normal',
-                                'height': 'auto',
-                                'fontSize': '12px'
-                            },
-                            style_header={
-                                'backgroundColor': '#4338ca',
-                                'color': 'white',
-                                'fontWeight': 'bold',
-                                'textTransform': 'uppercase',
-                                'padding': '12px',
-                                'textAlign': 'center'
-                            },
-                            style_data_conditional=[
-                                {
-                                    'if': {'row_index': 'odd'},
-                                    'backgroundColor': '#374151'
-                                },
-                                {
-                                    'if': {'column_id': 'Criteria'},
-                                    'fontWeight': 'bold',
-                                    'backgroundColor': '#1e40af'
-                                }
-                            ],
+def _empty_snapshot():
+    """
+    Snapshot with no data, used to build the validation layout without touching the database
+    """
+    return {
+        'df_market': pd.DataFrame(columns=['company', 'business_potential', 'tech_mapping', 'market_value', 'pain_point', 'focus', 'solution']),
+        'df_bd': pd.DataFrame(columns=['name', 'company', 'email', 'linkedin', 'school', 'connections', 'action']),
+        'df_fit': pd.DataFrame(columns=['company', 'fit_score', 'opportunity', 'approach', 'updated_at']),
+        'version': '',
+        'leadership_data': [],
+        'network_elements': [],
+        'network_stats': {},
+        'figures': {'bubble': None, 'radar': None, 'opportunity': None}
+    }
 
-                        )
-                    ]
-                ),
-            ]
-        ),
+def serve_layout():
+    """
+    Build the page layout from the cached data snapshot, brought up to date first
+    """
+    return build_layout(sync_data_snapshot())
 
-        # Customer Opportunity Matrix Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.Div(
-                    className="flex justify-between items-center mb-3 md:mb-4",
-                    children=[
-                        html.H2("Customer Opportunity Matrix", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
-                        html.Button(
-                            "📋 Copy Data",
-                            id="copy-opportunity-data",
-                            className="px-3 py-1 bg-blue-600 hover:bg-blue-700 text-white text-xs rounded transition-colors"
-                        )
-                    ]
-                ),
-                dcc.Graph(
-                    id='opportunity-matrix-chart',
-                    figure=create_opportunity_matrix(customer_opportunity_data),
-                    className="rounded-lg"
-                ),
-            ]
-        ),
+# App layout
+def build_layout(snapshot):
+    """
+    Build the app layout for a data snapshot
+    """
+    df_market = snapshot['df_market']
+    df_bd = snapshot['df_bd']
+    figures = snapshot['figures']
+    
+    return html.Div(
+        className="bg-gradient-to-br from-gray-900 via-gray-800 to-gray-900 text-white min-h-screen p-4 md:p-6 font-sans",
+        children=[
+            # Data version this page has applied, and the highest BD id it shows
+            dcc.Store(id='sync-token-store', data={
+                'version': snapshot['version'],
+                'max_bd_id': int(df_bd.index.max()) if not df_bd.empty else 0
+            }),
+            dcc.Interval(id='sync-interval', interval=SYNC_INTERVAL_SECONDS * 1000),
+            
+            # Store for network statistics
+            dcc.Store(id='network-stats-store', data=json.dumps(snapshot['network_stats'])),
 
-        # Market Prioritization Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.H2("Market Prioritization", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
-                dcc.Graph(id='bubble-chart', figure=fig_bubble, className="rounded-lg"),
-            ]
-        ),
+            html.H1("Asymchem BD Dashboard", className="text-2xl md:text-3xl lg:text-4xl font-bold text-center mb-4 md:mb-6 lg:mb-8 text-indigo-400"),
 
-        # Market Analysis Table Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.Div(
-                    className="flex justify-between items-center mb-3 md:mb-4",
-                    children=[
-                        html.H2("Market Analysis Table", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
-                        html.Button(
-                            "📋 Copy Data",
-                            id="copy-market-data",
-                            className="px-3 py-1 bg-blue-600 hover:bg-blue-700 text-white text-xs rounded transition-colors"
-                        )
-                    ]
-                ),
-                html.Div(
-                    className="overflow-x-auto",
-                    children=[
-                        dash_table.DataTable(
-                            id='market-analysis-table',
-                            columns=[
-                                {'name': 'Company', 'id': 'company'},
-                                {'name': 'Potential ($M)', 'id': 'business_potential'},
-                                {'name': 'Tech Mapping (0-10)', 'id': 'tech_mapping'},
-                                {'name': 'Market Value ($M)', 'id': 'market_value'},
-                                {'name': 'Pain Point', 'id': 'pain_point'},
-                                {'name': 'Focus', 'id': 'focus'},
-                                {'name': "Asymchem's Value", 'id': 'solution'}
-                            ],
-                            data=df_market.to_dict('records'),
-                            style_table={
-                                'overflowX': 'auto',
-                                'minWidth': '100%',
-                                'maxWidth': '100%',
-                                'fontSize': '12px'
-                            },
-                            style_cell={
-                                'backgroundColor': '#1f2937',
-                                'color': 'white',
-                                'fontFamily': 'sans-serif',
-                                'padding': '8px',
-                                'border': '1px solid #374151',
-                                'textAlign': 'left',
-                                'minWidth': '120px',
-                                'maxWidth': '200px',
-                                'whiteSpace': 'normal',
-                                'height': 'auto'
-                            },
-                            style_header={
-                                'backgroundColor': '#4338ca',
-                                'color': 'white',
-                                'fontWeight': 'bold',
-                                'textTransform': 'uppercase',
-                                'padding': '12px',
-                                'textAlign': 'center'
-                            },
-                            style_data_conditional=[
-                                {
-                                    'if': {'row_index': 'odd'},
-                                    'backgroundColor': '#374151'
-                                }
-                            ]
-                        )
-                    ]
-                ),
-            ]
-        ),
+            # Competitor Analysis Radar Chart Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.Div(
+                        className="flex justify-between items-center mb-3 md:mb-4",
+                        children=[
+                            html.H2("CDMO Competitor Analysis", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
+                            create_export_links('competitor')
+                        ]
+                    ),
+                    dcc.Graph(
+                        id='competitor-radar-chart',
+                        figure=figures['radar'],
+                        className="rounded-lg mb-6"
+                    ),
+                    html.H3("CDMO Competitive Analysis Table", className="text-base md:text-lg lg:text-xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
+                    html.Div(
+                        className="overflow-x-auto",
+                        children=[
+                            dash_table.DataTable(
+                                id='cdmo-comparison-table',
+                                columns=[
+                                    {'name': 'Criteria', 'id': 'Criteria'},
+                                    {'name': 'Asymchem', 'id': 'Asymchem'},
+                                    {'name': 'Lonza', 'id': 'Lonza'},
+                                    {'name': 'WuXi AppTec', 'id': 'WuXi AppTec'},
+                                    {'name': 'Catalent', 'id': 'Catalent'}
+                                ],
+                                data=cdmo_comparison_data,
+                                style_table={
+                                    'overflowX': 'auto',
+                                    'minWidth': '100%',
+                                    'maxWidth': '100%',
+                                    'fontSize': '12px'
+                                },
+                                style_cell={
+                                    'backgroundColor': '#1f2937',
+                                    'color': 'white',
+                                    'fontFamily': 'sans-serif',
+                                    'padding': '6px',
+                                    'border': '1px solid #374151',
+                                    'textAlign': 'left',
+                                    'minWidth': '120px',
+                                    'maxWidth': '250px',
+                                    'whiteSpace': 'normal',
+                                    'height': 'auto',
+                                    'fontSize': '12px'
+                                },
+                                style_header={
+                                    'backgroundColor': '#4338ca',
+                                    'color': 'white',
+                                    'fontWeight': 'bold',
+                                    'textTransform': 'uppercase',
+                                    'padding': '12px',
+                                    'textAlign': 'center'
+                                },
+                                style_data_conditional=[
+                                    {
+                                        'if': {'row_index': 'odd'},
+                                        'backgroundColor': '#374151'
+                                    },
+                                    {
+                                        'if': {'column_id': 'Criteria'},
+                                        'fontWeight': 'bold',
+                                        'backgroundColor': '#1e40af'
+                                    }
+                                ],
 
-        # Network Statistics Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.H2("Network Statistics", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
-                html.Div(id='network-stats-display', className="text-right"),
-            ]
-        ),
+                            )
+                        ]
+                    ),
+                ]
+            ),
 
-        # BD Personnel Network Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.Div(
-                    className="flex justify-between items-center mb-3 md:mb-4",
-                    children=[
-                        html.H2("BD Personnel Network", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
-                        html.Button(
-                            "📋 Copy Data",
-                            id="copy-bd-data",
-                            className="px-3 py-1 bg-blue-600 hover:bg-blue-700 text-white text-xs rounded transition-colors"
-                        )
-                    ]
-                ),
-                html.P("Enter person information to dynamically update the network graph.", className="text-gray-400 mb-4 text-right"),
-                
-                # Enhanced input form
-                html.Div(
-                    className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-3 md:gap-4 mb-4",
-                    children=[
-                        dcc.Input(id='new-name-input', type='text', placeholder='Enter Name...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
-                        dcc.Input(id='new-company-input', type='text', placeholder='Enter Company...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
-                        dcc.Input(id='new-email-input', type='email', placeholder='Enter Email...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
-                        dcc.Input(id='new-linkedin-input', type='url', placeholder='Enter LinkedIn URL...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
-                        dcc.Input(id='new-school-input', type='text', placeholder='Enter School...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
-                        dcc.Textarea(id='new-connections-input', placeholder='Enter Connections... (e.g., Becky: CPHI 2025; Chen: Merck network)', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
-                    ]
-                ),
-                
-                html.Button('Add to Network', id='add-person-button', n_clicks=0, className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-gray-900 bg-indigo-400 hover:bg-indigo-300 transition-colors duration-200 mb-4 text-sm md:text-base"),
-                
-                # Network Graph
-                cyto.Cytoscape(
-                    id='network-graph',
-                    layout={'name': 'cose', 'animate': True, 'animationDuration': 1000},
-                    style={'width': '100%', 'height': '400px', 'minHeight': '300px', 'backgroundColor': 'rgba(31, 41, 55, 0.8)', 'borderRadius': '1rem', 'border': '1px solid rgba(75, 85, 99, 0.3)'},
-                    stylesheet=[
-                        {
-                            'selector': 'node',
-                            'style': {
-                                'label': 'data(label)',
-                                'text-valign': 'bottom',
-                                'text-halign': 'center',
-                                'font-family': 'sans-serif',
-                                'font-size': '11px',
-                                'font-weight': 'bold',
-                                'color': 'white',
-                                'height': 'data(size)',
-                                'width': 'data(size)',
-                                'border-width': 3,
-                                'border-color': 'rgba(255, 255, 255, 0.3)',
-                                'text-wrap': 'wrap',
-                                'text-max-width': '80px',
-                                'background-color': '#60a5fa',
-                                'background-opacity': 0.8,
-                                'transition-property': 'background-color, border-color, height, width',
-                                'transition-duration': '0.3s'
-                            }
-                        },
-                        {
-                            'selector': '.leader',
-                            'style': {
-                                'background-color': '#f59e0b',
-                                'background-opacity': 0.9,
-                                'border-color': 'rgba(245, 158, 11, 0.5)',
-                                'border-width': 4
-                            }
+            # Customer Opportunity Matrix Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.Div(
+                        className="flex justify-between items-center mb-3 md:mb-4",
+                        children=[
+                            html.H2("Customer Opportunity Matrix", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
+                            create_export_links('opportunity')
+                        ]
+                    ),
+                    dcc.Graph(
+                        id='opportunity-matrix-chart',
+                        figure=figures['opportunity'],
+                        className="rounded-lg"
+                    ),
+                ]
+            ),
+
+            # Market Prioritization Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("Market Prioritization", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
+                    dcc.Graph(id='bubble-chart', figure=figures['bubble'], className="rounded-lg"),
+                ]
+            ),
+
+            # Opportunity Ranking Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("Opportunity Ranking", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-left"),
+                    html.Div(
+                        className="grid grid-cols-1 md:grid-cols-3 gap-4 mb-4",
+                        children=[
+                            html.Div([
+                                html.Label(f"{label} weight", className="text-gray-300 text-sm"),
+                                dcc.Slider(id=f'opportunity-weight-{column}', min=0, max=10, step=1, value=DEFAULT_WEIGHTS[column])
+                            ])
+                            for column, label in FACTORS.items()
+                        ]
+                    ),
+                    html.P(id='opportunity-tiers', className="text-gray-300 text-sm mb-2"),
+                    dash_table.DataTable(
+                        id='opportunity-table',
+                        columns=[
+                            {'name': 'Rank', 'id': 'rank'},
+                            {'name': 'Company', 'id': 'company'},
+                            {'name': 'Score', 'id': 'score'},
+                            {'name': 'Percentile', 'id': 'percentile'},
+                            {'name': 'Tier', 'id': 'tier'}
+                        ],
+                        page_size=20,
+                        style_table={'overflowX': 'auto'},
+                        style_cell={
+                            'backgroundColor': '#1f2937',
+                            'color': 'white',
+                            'fontFamily': 'sans-serif',
+                            'padding': '8px',
+                            'border': '1px solid #374151',
+                            'textAlign': 'left'
                         },
-                        {
-                            'selector': '.bd_person',
-                            'style': {
-                                'background-color': '#f87171',
-                                'background-opacity': 0.9,
-                                'border-color': 'rgba(248, 113, 113, 0.5)',
-                                'border-width': 4
-                            }
+                        style_header={
+                            'backgroundColor': '#4338ca',
+                            'color': 'white',
+                            'fontWeight': 'bold',
+                            'textTransform': 'uppercase'
                         },
-                        {
-                            'selector': 'edge',
-                            'style': {
-                                'line-color': 'rgba(156, 163, 175, 0.6)',
-                                'width': 2,
-                                'curve-style': 'bezier',
-                                'opacity': 0.7,
-                                'transition-property': 'line-color, width, opacity',
-                                'transition-duration': '0.3s'
-                            }
-                        }
-                    ],
-                    elements=network_elements
-                ),
-                
-                html.P("Hover over nodes to see details. Node size indicates the number of connections.", className="text-gray-400 mb-4 text-right"),
-                
-                # BD Personnel Table
-                html.Div(
-                    className="overflow-x-auto",
-                    children=[
-                        dash_table.DataTable(
-                            id='bd-personnel-table',
-                            columns=[{'name': i, 'id': i} for i in df_bd.columns],
-                            data=df_bd.to_dict('records'),
-                            style_table={
-                                'overflowX': 'auto',
-                                'minWidth': '100%',
-                                'maxWidth': '100%',
-                                'fontSize': '12px'
+                        style_data_conditional=[
+                            {'if': {'filter_query': '{tier} = "A"', 'column_id': 'tier'}, 'backgroundColor': '#059669'},
+                            {'if': {'filter_query': '{tier} = "B"', 'column_id': 'tier'}, 'backgroundColor': '#2563eb'},
+                            {'if': {'filter_query': '{tier} = "C"', 'column_id': 'tier'}, 'backgroundColor': '#d97706'}
+                        ]
+                    )
+                ]
+            ),
+
+            # Market Analysis Table Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.Div(
+                        className="flex justify-between items-center mb-3 md:mb-4",
+                        children=[
+                            html.H2("Market Analysis Table", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
+                            create_export_links('market')
+                        ]
+                    ),
+                    html.Div(
+                        className="overflow-x-auto",
+                        children=[
+                            dash_table.DataTable(
+                                id='market-analysis-table',
+                                columns=[
+                                    {'name': 'Company', 'id': 'company'},
+                                    {'name': 'Potential ($M)', 'id': 'business_potential'},
+                                    {'name': 'Tech Mapping (0-10)', 'id': 'tech_mapping'},
+                                    {'name': 'Market Value ($M)', 'id': 'market_value'},
+                                    {'name': 'Pain Point', 'id': 'pain_point'},
+                                    {'name': 'Focus', 'id': 'focus'},
+                                    {'name': "Asymchem's Value", 'id': 'solution'}
+                                ],
+                                data=df_market.to_dict('records'),
+                                style_table={
+                                    'overflowX': 'auto',
+                                    'minWidth': '100%',
+                                    'maxWidth': '100%',
+                                    'fontSize': '12px'
+                                },
+                                style_cell={
+                                    'backgroundColor': '#1f2937',
+                                    'color': 'white',
+                                    'fontFamily': 'sans-serif',
+                                    'padding': '8px',
+                                    'border': '1px solid #374151',
+                                    'textAlign': 'left',
+                                    'minWidth': '120px',
+                                    'maxWidth': '200px',
+                                    'whiteSpace': 'normal',
+                                    'height': 'auto'
+                                },
+                                style_header={
+                                    'backgroundColor': '#4338ca',
+                                    'color': 'white',
+                                    'fontWeight': 'bold',
+                                    'textTransform': 'uppercase',
+                                    'padding': '12px',
+                                    'textAlign': 'center'
+                                },
+                                style_data_conditional=[
+                                    {
+                                        'if': {'row_index': 'odd'},
+                                        'backgroundColor': '#374151'
+                                    }
+                                ]
+                            )
+                        ]
+                    ),
+                ]
+            ),
+
+            # Look-alike Prospects Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("Look-alike Prospects", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-left"),
+                    html.Div(
+                        className="flex flex-col sm:flex-row items-center space-y-2 sm:space-y-0 sm:space-x-4 mb-4",
+                        children=[
+                            dcc.Dropdown(
+                                id='lookalike-company',
+                                options=[{'label': company, 'value': company} for company in df_market['company'].unique()],
+                                value=df_market.iloc[0]['company'] if not df_market.empty else None,
+                                placeholder="Companies like...",
+                                className="bg-gray-700 text-white rounded-md flex-grow w-full sm:w-auto",
+                                style={'width': '100%', 'minWidth': '200px', 'backgroundColor': '#374151', 'color': 'white'}
+                            ),
+                            dcc.Input(
+                                id='lookalike-query',
+                                type='text',
+                                debounce=True,
+                                placeholder="...or describe a focus, pain point or solution",
+                                className="p-2 md:p-3 rounded-md bg-gray-700 text-white border border-gray-600 focus:border-indigo-500 focus:outline-none text-sm md:text-base w-full"
+                            )
+                        ]
+                    ),
+                    html.Div(id='lookalike-output', className="bg-gray-700 p-4 rounded-lg text-white text-left")
+                ]
+            ),
+
+            # Full-text Search Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("Search", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-left"),
+                    html.Div(
+                        className="flex flex-col sm:flex-row items-center space-y-2 sm:space-y-0 sm:space-x-4 mb-4",
+                        children=[
+                            dcc.Input(
+                                id='search-input',
+                                type='search',
+                                debounce=True,
+                                placeholder='Search contacts, connections and actions, e.g. "BIO 2025" or CPHI',
+                                className="p-2 md:p-3 rounded-md bg-gray-700 text-white border border-gray-600 focus:border-indigo-500 focus:outline-none text-sm md:text-base w-full"
+                            ),
+                            dcc.RadioItems(
+                                id='search-scope',
+                                options=[
+                                    {'label': 'Contacts', 'value': 'bd'},
+                                    {'label': 'Market', 'value': 'market'}
+                                ],
+                                value='bd',
+                                inline=True,
+                                className="text-gray-300 text-sm whitespace-nowrap",
+                                inputClassName="mr-1",
+                                labelClassName="mr-3"
+                            )
+                        ]
+                    ),
+                    dcc.Store(id='search-page', data=1),
+                    html.Div(id='search-results', className="space-y-2"),
+                    html.Div(
+                        className="flex justify-between items-center mt-3",
+                        children=[
+                            html.Button('Previous', id='search-prev', n_clicks=0, className="px-3 py-1 bg-gray-700 hover:bg-gray-600 text-white text-sm rounded"),
+                            html.P(id='search-status', className="text-gray-400 text-sm"),
+                            html.Button('Next', id='search-next', n_clicks=0, className="px-3 py-1 bg-gray-700 hover:bg-gray-600 text-white text-sm rounded")
+                        ]
+                    )
+                ]
+            ),
+
+            # Company Fit Analysis Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.Div(
+                        className="flex justify-between items-center mb-3 md:mb-4",
+                        children=[
+                            html.H2("Company Fit Analysis", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
+                            html.Button(
+                                'Run Fit Analysis',
+                                id='fit-analysis-button',
+                                n_clicks=0,
+                                className="px-3 py-1 bg-blue-600 hover:bg-blue-700 text-white text-xs rounded transition-colors"
+                            )
+                        ]
+                    ),
+                    html.P(id='fit-analysis-status', className="text-gray-400 mb-4 text-right"),
+                    dcc.Interval(id='fit-analysis-interval', interval=2000, disabled=True),
+                    html.Div(
+                        className="overflow-x-auto",
+                        children=[
+                            dash_table.DataTable(
+                                id='fit-analysis-table',
+                                columns=[
+                                    {'name': 'Company', 'id': 'company'},
+                                    {'name': 'Fit Score (0-10)', 'id': 'fit_score', 'type': 'numeric'},
+                                    {'name': 'Opportunity', 'id': 'opportunity'},
+                                    {'name': 'Approach', 'id': 'approach'},
+                                    {'name': 'Updated', 'id': 'updated_at'}
+                                ],
+                                data=snapshot['df_fit'].to_dict('records'),
+                                sort_action='native',
+                                sort_by=[{'column_id': 'fit_score', 'direction': 'desc'}],
+                                style_table={
+                                    'overflowX': 'auto',
+                                    'minWidth': '100%',
+                                    'maxWidth': '100%',
+                                    'fontSize': '12px'
+                                },
+                                style_cell={
+                                    'backgroundColor': '#1f2937',
+                                    'color': 'white',
+                                    'fontFamily': 'sans-serif',
+                                    'padding': '8px',
+                                    'border': '1px solid #374151',
+                                    'textAlign': 'left',
+                                    'minWidth': '120px',
+                                    'maxWidth': '300px',
+                                    'whiteSpace': 'normal',
+                                    'height': 'auto'
+                                },
+                                style_header={
+                                    'backgroundColor': '#4338ca',
+                                    'color': 'white',
+                                    'fontWeight': 'bold',
+                                    'textTransform': 'uppercase',
+                                    'padding': '12px',
+                                    'textAlign': 'center'
+                                },
+                                style_data_conditional=[
+                                    {
+                                        'if': {'row_index': 'odd'},
+                                        'backgroundColor': '#374151'
+                                    }
+                                ]
+                            )
+                        ]
+                    ),
+                ]
+            ),
+
+            # Network Statistics Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("Network Statistics", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
+                    html.Div(id='network-stats-display', className="text-right"),
+                ]
+            ),
+
+            # Network Analytics Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("Network Analytics", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-left"),
+                    html.Div(
+                        className="flex flex-col sm:flex-row items-center space-y-2 sm:space-y-0 sm:space-x-4 mb-4",
+                        children=[
+                            dcc.Dropdown(
+                                id='analytics-analysis',
+                                options=[{'label': label, 'value': name} for name, label in ANALYSES.items()],
+                                value='influence',
+                                clearable=False,
+                                className="w-full sm:w-96 text-gray-900"
+                            ),
+                            html.Button(
+                                'Run Analysis',
+                                id='analytics-button',
+                                n_clicks=0,
+                                className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-gray-900 bg-indigo-400 hover:bg-indigo-300 transition-colors duration-200 text-sm md:text-base w-full sm:w-auto"
+                            ),
+                            html.Div(id='analytics-status', className="text-gray-400 text-sm"),
+                        ]
+                    ),
+                    html.Div(id='analytics-output', className="text-left"),
+                    dcc.Store(id='analytics-job'),
+                    dcc.Interval(id='analytics-interval', interval=1000, disabled=True),
+                ]
+            ),
+
+            # Follow-ups Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.Div(
+                        className="flex flex-col sm:flex-row justify-between items-center mb-3 md:mb-4",
+                        children=[
+                            html.H2("Follow-ups", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
+                            dcc.Dropdown(
+                                id='follow-up-window',
+                                options=[{'label': f"Next {days} days", 'value': days} for days in (7, 14, 30)],
+                                value=7,
+                                clearable=False,
+                                className="w-full sm:w-48 text-gray-900"
+                            ),
+                        ]
+                    ),
+                    html.Div(id='follow-up-output', className="grid grid-cols-1 md:grid-cols-2 gap-4 text-left"),
+                ]
+            ),
+
+            # BD Personnel Network Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.Div(
+                        className="flex justify-between items-center mb-3 md:mb-4",
+                        children=[
+                            html.H2("BD Personnel Network", className="text-lg md:text-xl lg:text-2xl font-semibold text-indigo-300 text-center md:text-left"),
+                            create_export_links('bd')
+                        ]
+                    ),
+                    html.P("Enter person information to dynamically update the network graph.", className="text-gray-400 mb-4 text-right"),
+                    
+                    # Enhanced input form
+                    html.Div(
+                        className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-3 md:gap-4 mb-4",
+                        children=[
+                            dcc.Input(id='new-name-input', type='text', placeholder='Enter Name...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                            dcc.Input(id='new-company-input', type='text', placeholder='Enter Company...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                            dcc.Input(id='new-email-input', type='email', placeholder='Enter Email...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                            dcc.Input(id='new-linkedin-input', type='url', placeholder='Enter LinkedIn URL...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                            dcc.Input(id='new-school-input', type='text', placeholder='Enter School...', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                            dcc.Textarea(id='new-connections-input', placeholder='Enter Connections... (e.g., Becky: CPHI 2025; Chen: Merck network)', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                            dcc.Input(id='new-action-input', type='text', placeholder='Next Action... (e.g., Email Sep 10, 2025: Pitch biocatalysis)', className='bg-gray-700 p-2 md:p-3 rounded-md text-white border border-gray-600 text-sm md:text-base'),
+                        ]
+                    ),
+                    
+                    html.Button('Add to Network', id='add-person-button', n_clicks=0, className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-gray-900 bg-indigo-400 hover:bg-indigo-300 transition-colors duration-200 mb-4 text-sm md:text-base"),
+                    html.Div(id='add-person-status', className="text-red-400 text-sm mb-4"),
+                    
+                    # Network view filters
+                    html.Div(
+                        className="grid grid-cols-1 sm:grid-cols-3 gap-3 md:gap-4 mb-4",
+                        children=[
+                            dcc.Dropdown(
+                                id='network-type-filter',
+                                options=[{'label': t.title(), 'value': t} for t in ['alumni', 'work', 'event', 'network', 'other']],
+                                placeholder='All connection types',
+                                className='text-gray-900'
+                            ),
+                            dcc.Dropdown(
+                                id='network-company-filter',
+                                options=[{'label': c, 'value': c} for c in sorted(set(df_bd['company'].dropna()) | {'Asymchem'})],
+                                placeholder='All companies',
+                                className='text-gray-900'
+                            ),
+                            dcc.RadioItems(
+                                id='network-role-filter',
+                                options=[
+                                    {'label': 'Everyone', 'value': 'all'},
+                                    {'label': 'Leaders', 'value': 'leader'},
+                                    {'label': 'BD Personnel', 'value': 'bd_person'}
+                                ],
+                                value='all',
+                                inline=True,
+                                className='text-gray-300 text-sm md:text-base self-center',
+                                inputClassName='mr-1 ml-3'
+                            ),
+                        ]
+                    ),
+                    
+                    # Ego network controls: click a person to show only their neighborhood
+                    dcc.Store(id='ego-center-store'),
+                    html.Div(
+                        className="flex flex-wrap items-center gap-3 mb-4",
+                        children=[
+                            html.Label("Hops", htmlFor='ego-hops-input', className="text-gray-300 text-sm md:text-base"),
+                            dcc.Input(id='ego-hops-input', type='number', value=2, min=1, max=4, step=1, className='bg-gray-700 p-2 rounded-md text-white border border-gray-600 w-20 text-sm md:text-base'),
+                            html.Button('Show Full Network', id='ego-reset-button', n_clicks=0, className="px-4 py-2 rounded-md font-bold text-gray-900 bg-gray-300 hover:bg-gray-200 transition-colors duration-200 text-sm md:text-base"),
+                            html.Div(id='ego-status', className="text-gray-400 text-sm md:text-base"),
+                        ]
+                    ),
+                    
+                    # Network Graph
+                    cyto.Cytoscape(
+                        id='network-graph',
+                        layout={'name': 'cose', 'animate': True, 'animationDuration': 1000},
+                        style={'width': '100%', 'height': '400px', 'minHeight': '300px', 'backgroundColor': 'rgba(31, 41, 55, 0.8)', 'borderRadius': '1rem', 'border': '1px solid rgba(75, 85, 99, 0.3)'},
+                        stylesheet=[
+                            {
+                                'selector': 'node',
+                                'style': {
+                                    'label': 'data(label)',
+                                    'text-valign': 'bottom',
+                                    'text-halign': 'center',
+                                    'font-family': 'sans-serif',
+                                    'font-size': '11px',
+                                    'font-weight': 'bold',
+                                    'color': 'white',
+                                    'height': 'data(size)',
+                                    'width': 'data(size)',
+                                    'border-width': 3,
+                                    'border-color': 'rgba(255, 255, 255, 0.3)',
+                                    'text-wrap': 'wrap',
+                                    'text-max-width': '80px',
+                                    'background-color': '#60a5fa',
+                                    'background-opacity': 0.8,
+                                    'transition-property': 'background-color, border-color, height, width',
+                                    'transition-duration': '0.3s'
+                                }
                             },
-                            style_cell={
-                                'backgroundColor': '#1f2937',
-                                'color': 'white',
-                                'fontFamily': 'sans-serif',
-                                'padding': '6px',
-                                'border': '1px solid #374151',
-                                'textAlign': 'left',
-                                'minWidth': '100px',
-                                'maxWidth': '180px',
-                                'whiteSpace': 'normal',
-                                'height': 'auto',
-                                'fontSize': '12px'
+                            {
+                                'selector': '.leader',
+                                'style': {
+                                    'background-color': '#f59e0b',
+                                    'background-opacity': 0.9,
+                                    'border-color': 'rgba(245, 158, 11, 0.5)',
+                                    'border-width': 4
+                                }
                             },
-                            style_header={
-                                'backgroundColor': '#4338ca',
-                                'color': 'white',
-                                'fontWeight': 'bold',
-                                'textTransform': 'uppercase',
-                                'padding': '12px',
-                                'textAlign': 'center'
+                            {
+                                'selector': '.bd_person',
+                                'style': {
+                                    'background-color': '#f87171',
+                                    'background-opacity': 0.9,
+                                    'border-color': 'rgba(248, 113, 113, 0.5)',
+                                    'border-width': 4
+                                }
                             },
-                            style_data_conditional=[
-                                {
-                                    'if': {'row_index': 'odd'},
-                                    'backgroundColor': '#374151'
+                            {
+                                'selector': '.ego_center',
+                                'style': {
+                                    'border-color': '#ffffff',
+                                    'border-width': 6
+                                }
+                            },
+                            {
+                                'selector': 'edge',
+                                'style': {
+                                    'line-color': 'rgba(156, 163, 175, 0.6)',
+                                    'width': 'mapData(weight, 1, 4, 2, 8)',
+                                    'curve-style': 'bezier',
+                                    'opacity': 0.7,
+                                    'transition-property': 'line-color, width, opacity',
+                                    'transition-duration': '0.3s'
                                 }
-                            ]
-                        )
-                    ]
-                ),
-            ]
-        ),
-
-        # AI-Powered Pitch Generation Section
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
-            children=[
-                html.H2("AI-Powered Pitch Generation", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
-                
-                # Company selection and analysis
-                html.Div(
-                    className="flex flex-col sm:flex-row items-center space-y-2 sm:space-y-0 sm:space-x-4 mb-4 justify-center sm:justify-end",
-                    children=[
-                        dcc.Dropdown(
-                            id='company-dropdown',
-                            options=[{'label': d['company'], 'value': d['company']} for d in df_bd.to_dict('records')],
-                            value=df_bd.iloc[0]['company'] if not df_bd.empty else None,
-                            className="bg-gray-700 text-white rounded-md flex-grow w-full sm:w-auto",
-                            style={
-                                'width': '100%',
-                                'minWidth': '200px',
-                                'backgroundColor': '#374151',
-                                'color': 'white'
                             }
-                        ),
-                        html.Button(
-                            'Generate AI Pitch',
-                            id='pitch-button',
-                            n_clicks=0,
-                            className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-gray-900 bg-indigo-400 hover:bg-indigo-300 transition-colors duration-200 text-sm md:text-base w-full sm:w-auto"
-                        )
-                    ]
-                ),
-                
-
-                
-                # Pitch Output
-                html.Div(
-                    id='pitch-output',
-                    className="bg-gray-700 p-4 rounded-lg text-white text-left"
-                ),
-            ]
-        ),
+                        ],
+                        elements=snapshot['network_elements']
+                    ),
+                    
+                    html.P("Hover over nodes to see details. Click a person to show their neighborhood. Node size indicates the number of connections.", className="text-gray-400 mb-4 text-right"),
+                    
+                    # BD Personnel Table
+                    html.Div(
+                        className="overflow-x-auto",
+                        children=[
+                            dash_table.DataTable(
+                                id='bd-personnel-table',
+                                columns=[{'name': i, 'id': i} for i in df_bd.columns],
+                                data=df_bd.to_dict('records'),
+                                style_table={
+                                    'overflowX': 'auto',
+                                    'minWidth': '100%',
+                                    'maxWidth': '100%',
+                                    'fontSize': '12px'
+                                },
+                                style_cell={
+                                    'backgroundColor': '#1f2937',
+                                    'color': 'white',
+                                    'fontFamily': 'sans-serif',
+                                    'padding': '6px',
+                                    'border': '1px solid #374151',
+                                    'textAlign': 'left',
+                                    'minWidth': '100px',
+                                    'maxWidth': '180px',
+                                    'whiteSpace': 'normal',
+                                    'height': 'auto',
+                                    'fontSize': '12px'
+                                },
+                                style_header={
+                                    'backgroundColor': '#4338ca',
+                                    'color': 'white',
+                                    'fontWeight': 'bold',
+                                    'textTransform': 'uppercase',
+                                    'padding': '12px',
+                                    'textAlign': 'center'
+                                },
+                                style_data_conditional=[
+                                    {
+                                        'if': {'row_index': 'odd'},
+                                        'backgroundColor': '#374151'
+                                    }
+                                ]
+                            )
+                        ]
+                    ),
+                ]
+            ),
 
-        # Footer
-        html.Div(
-            className="bg-gray-800/50 backdrop-blur-sm p-6 rounded-xl shadow-2xl text-right border border-gray-700/50",
-            children=[
-                html.P('Assumptions: Data is based on public reports, events, and alumni networks for reference only.', className="text-sm text-gray-400 mb-2"),
-                html.P('Data Sources:', className="text-sm font-semibold text-gray-400"),
-                html.A('LinkedIn', href='https://www.linkedin.com', target='_blank', className="text-blue-400 hover:underline text-sm mr-4"),
-                html.A('Company Websites', href='https://www.crisprtx.com', target='_blank', className="text-blue-400 hover:underline text-sm mr-4"),
-                html.A('Public News', href='https://www.merck.com/news', target='_blank', className="text-blue-400 hover:underline text-sm mr-4"),
-                html.A('Event Schedules', href='https://www.cphi.com', target='_blank', className="text-blue-400 hover:underline text-sm")
-            ]
-        )
-    ]
-)
+            # AI-Powered Pitch Generation Section
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-4 md:p-6 rounded-xl shadow-2xl mb-6 md:mb-8 border border-gray-700/50",
+                children=[
+                    html.H2("AI-Powered Pitch Generation", className="text-lg md:text-xl lg:text-2xl font-semibold mb-3 md:mb-4 text-indigo-300 text-center md:text-right"),
+                    
+                    # Company selection and analysis
+                    html.Div(
+                        className="flex flex-col sm:flex-row items-center space-y-2 sm:space-y-0 sm:space-x-4 mb-4 justify-center sm:justify-end",
+                        children=[
+                            dcc.Dropdown(
+                                id='company-dropdown',
+                                options=[{'label': d['company'], 'value': d['company']} for d in df_bd.to_dict('records')],
+                                value=df_bd.iloc[0]['company'] if not df_bd.empty else None,
+                                className="bg-gray-700 text-white rounded-md flex-grow w-full sm:w-auto",
+                                style={
+                                    'width': '100%',
+                                    'minWidth': '200px',
+                                    'backgroundColor': '#374151',
+                                    'color': 'white'
+                                }
+                            ),
+                            html.Button(
+                                'Generate AI Pitch',
+                                id='pitch-button',
+                                n_clicks=0,
+                                className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-gray-900 bg-indigo-400 hover:bg-indigo-300 transition-colors duration-200 text-sm md:text-base w-full sm:w-auto"
+                            )
+                        ]
+                    ),
+                    
+
+                    
+                    # Pitch Output
+                    html.Div(
+                        id='pitch-output',
+                        className="bg-gray-700 p-4 rounded-lg text-white text-left"
+                    ),
+                    
+                    # Stored connection insights for the selected company
+                    html.Div(
+                        id='connection-insights-output',
+                        className="bg-gray-700/50 p-4 rounded-lg text-white text-left mt-4"
+                    ),
+                    
+                    # Batch campaign controls
+                    html.Div(
+                        className="flex flex-col sm:flex-row items-center space-y-2 sm:space-y-0 sm:space-x-4 mt-4 justify-center sm:justify-end",
+                        children=[
+                            html.Div(id='campaign-status', className="text-gray-400 text-sm"),
+                            html.Button(
+                                'Run Batch Campaign',
+                                id='campaign-button',
+                                n_clicks=0,
+                                className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-gray-900 bg-indigo-400 hover:bg-indigo-300 transition-colors duration-200 text-sm md:text-base w-full sm:w-auto"
+                            ),
+                            html.Button(
+                                'Download Campaign CSV',
+                                id='campaign-download-button',
+                                n_clicks=0,
+                                className="px-4 md:px-6 py-2 md:py-3 rounded-md font-bold text-white bg-blue-600 hover:bg-blue-700 transition-colors duration-200 text-sm md:text-base w-full sm:w-auto"
+                            ),
+                        ]
+                    ),
+                    dcc.Interval(id='campaign-interval', interval=2000, disabled=True),
+                    dcc.Download(id='campaign-download'),
+                ]
+            ),
+
+            # Footer
+            html.Div(
+                className="bg-gray-800/50 backdrop-blur-sm p-6 rounded-xl shadow-2xl text-right border border-gray-700/50",
+                children=[
+                    html.P('Assumptions: Data is based on public reports, events, and alumni networks for reference only.', className="text-sm text-gray-400 mb-2"),
+                    html.P('Data Sources:', className="text-sm font-semibold text-gray-400"),
+                    html.A('LinkedIn', href='https://www.linkedin.com', target='_blank', className="text-blue-400 hover:underline text-sm mr-4"),
+                    html.A('Company Websites', href='https://www.crisprtx.com', target='_blank', className="text-blue-400 hover:underline text-sm mr-4"),
+                    html.A('Public News', href='https://www.merck.com/news', target='_blank', className="text-blue-400 hover:underline text-sm mr-4"),
+                    html.A('Event Schedules', href='https://www.cphi.com', target='_blank', className="text-blue-400 hover:underline text-sm")
+                ]
+            )
+        ]
+    )
 
 # Callbacks
 
-# Copy data callbacks
-@app.callback(
-    Output('copy-competitor-data', 'children'),
-    Input('copy-competitor-data', 'n_clicks')
-)
-def copy_competitor_data(n_clicks):
-    if n_clicks:
-        import pyperclip
-        try:
-            # Format competitor data for copying
-            data_text = "CDMO Competitor Analysis\n\n"
-            for item in cdmo_comparison_data:
-                data_text += f"{item['Criteria']}:\n"
-                data_text += f"  Asymchem: {item['Asymchem'].replace('<br>', ' ')}\n"
-                data_text += f"  Lonza: {item['Lonza'].replace('<br>', ' ')}\n"
-                data_text += f"  WuXi AppTec: {item['WuXi AppTec'].replace('<br>', ' ')}\n"
-                data_text += f"  Catalent: {item['Catalent'].replace('<br>', ' ')}\n\n"
-            
-            pyperclip.copy(data_text)
-            return "✅ Copied!"
-        except:
-            return "📋 Copy Data"
-    return "📋 Copy Data"
-
-@app.callback(
-    Output('copy-opportunity-data', 'children'),
-    Input('copy-opportunity-data', 'n_clicks')
-)
-def copy_opportunity_data(n_clicks):
-    if n_clicks:
-        import pyperclip
-        try:
-            # Format opportunity data for copying
-            data_text = "Customer Opportunity Matrix\n\n"
-            for item in customer_opportunity_data:
-                data_text += f"{item['client']}:\n"
-                data_text += f"  Technical Fit: {item['x']}/10\n"
-                data_text += f"  Commercial Potential: ${item['y']}M\n"
-                data_text += f"  Note: {item['note']}\n\n"
-            
-            pyperclip.copy(data_text)
-            return "✅ Copied!"
-        except:
-            return "📋 Copy Data"
-    return "📋 Copy Data"
-
-@app.callback(
-    Output('copy-market-data', 'children'),
-    Input('copy-market-data', 'n_clicks')
-)
-def copy_market_data(n_clicks):
-    if n_clicks:
-        import pyperclip
-        try:
-            # Format market data for copying
-            data_text = "Market Analysis Data\n\n"
-            for _, row in df_market.iterrows():
-                data_text += f"{row['company']}:\n"
-                data_text += f"  Business Potential: ${row['business_potential']}M\n"
-                data_text += f"  Tech Mapping: {row['tech_mapping']}/10\n"
-                data_text += f"  Market Value: ${row['market_value']}M\n"
-                data_text += f"  Pain Point: {row['pain_point']}\n"
-                data_text += f"  Focus: {row['focus']}\n"
-                data_text += f"  Solution: {row['solution']}\n\n"
-            
-            pyperclip.copy(data_text)
-            return "✅ Copied!"
-        except:
-            return "📋 Copy Data"
-    return "📋 Copy Data"
-
-@app.callback(
-    Output('copy-bd-data', 'children'),
-    Input('copy-bd-data', 'n_clicks'),
-    State('bd-data-store', 'data')
-)
-def copy_bd_data(n_clicks, current_data):
-    if n_clicks:
-        import pyperclip
-        try:
-            # Get current BD data
-            import io
-            df_bd_current = pd.read_json(io.StringIO(current_data), orient='split')
-            
-            # Format BD data for copying
-            data_text = "BD Personnel Data\n\n"
-            for _, row in df_bd_current.iterrows():
-                data_text += f"{row['name']} ({row['company']}):\n"
-                data_text += f"  Email: {row['email']}\n"
-                data_text += f"  LinkedIn: {row['linkedin']}\n"
-                data_text += f"  School: {row['school']}\n"
-                data_text += f"  Connections: {row['connections']}\n"
-                data_text += f"  Action: {row['action']}\n\n"
-            
-            pyperclip.copy(data_text)
-            return "✅ Copied!"
-        except:
-            return "📋 Copy Data"
-    return "📋 Copy Data"
-
-@app.callback(
-    Output('bd-data-store', 'data'),
+@instrumented_callback(
+    Output('sync-token-store', 'data'),
     Output('bd-personnel-table', 'data'),
-    Output('network-graph', 'elements'),
     Output('network-stats-store', 'data'),
+    Output('add-person-status', 'children'),
     Input('add-person-button', 'n_clicks'),
+    Input('sync-interval', 'n_intervals'),
     State('new-name-input', 'value'),
     State('new-company-input', 'value'),
     State('new-email-input', 'value'),
     State('new-linkedin-input', 'value'),
     State('new-school-input', 'value'),
     State('new-connections-input', 'value'),
-    State('bd-data-store', 'data')
+    State('new-action-input', 'value'),
+    State('sync-token-store', 'data')
 )
-def update_bd_data(n_clicks, new_name, new_company, new_email, new_linkedin, new_school, new_connections, current_data):
-    if not n_clicks or not new_name or not new_company:
+@profiled
+def update_bd_data(n_clicks, n_intervals, new_name, new_company, new_email, new_linkedin, new_school, new_connections, new_action, sync_state):
+    triggered = callback_context.triggered_id
+    status = dash.no_update
+    if triggered == 'add-person-button':
+        if not n_clicks or not new_name or not new_company:
+            raise dash.exceptions.PreventUpdate
+        try:
+            add_bd_person(new_name, new_company, new_email, new_linkedin, new_school, new_connections, new_action)
+        except ValueError as e:
+            print(f"Error adding BD person: {e}")
+            return dash.no_update, dash.no_update, dash.no_update, f"Not saved: {e}"
+        status = ''
+    elif triggered != 'sync-interval':
         raise dash.exceptions.PreventUpdate
-
-    # Add to database
-    add_bd_person(new_name, new_company, new_email, new_linkedin, new_school, new_connections, '')
     
-    # Refresh data from database
-    df_bd_updated = get_bd_data()
-    leadership_data_updated = get_leadership_data()
+    # Apply the new person and anything other users added through the change feed
+    snapshot = sync_data_snapshot()
+    sync_state = sync_state or {}
+    if snapshot['version'] == sync_state.get('version'):
+        if status == '':
+            return dash.no_update, dash.no_update, dash.no_update, status
+        raise dash.exceptions.PreventUpdate
     
-    # Update network
-    global network_analyzer
-    nodes, edges = network_analyzer.create_precise_network_elements(df_bd_updated, leadership_data_updated)
-    network_elements_updated = nodes + edges
+    df_bd = snapshot['df_bd']
+    max_bd_id = sync_state.get('max_bd_id', 0)
+    try:
+        since = parse_data_version(sync_state.get('version'))
+        client_changes = get_changes(sync_state.get('version', ''))['bd']
+    except ValueError:
+        since, client_changes = None, None
     
-    # Get updated statistics
-    stats = network_analyzer.get_network_statistics()
+    # Rows at or below the page's highest id that changed after its version are
+    # edits; anything else in the overlap window is a row the page already shows
+    edited = client_changes is None or since is None or any(
+        row['id'] <= max_bd_id and datetime.fromisoformat(row['updated_at']) > since for row in client_changes
+    )
+    if edited:
+        table_data = df_bd.to_dict('records')
+    else:
+        # Only new rows: append them to the table in the browser
+        table_data = Patch()
+        table_data.extend(df_bd[df_bd.index > max_bd_id].to_dict('records'))
     
+    new_state = {'version': snapshot['version'], 'max_bd_id': int(df_bd.index.max()) if not df_bd.empty else 0}
     return (
-        df_bd_updated.to_json(date_format='iso', orient='split'),
-        df_bd_updated.to_dict('records'),
-        network_elements_updated,
-        json.dumps(stats)
+        new_state,
+        table_data,
+        json.dumps(snapshot['network_stats']),
+        status
     )
 
-@app.callback(
+@instrumented_callback(
+    Output('ego-center-store', 'data'),
+    Input('network-graph', 'tapNodeData'),
+    Input('ego-reset-button', 'n_clicks'),
+    prevent_initial_call=True
+)
+def select_ego_center(node_data, reset_clicks):
+    if callback_context.triggered_id == 'ego-reset-button' or not node_data:
+        return None
+    return node_data['id']
+
+@instrumented_callback(
+    Output('network-graph', 'elements'),
+    Output('ego-status', 'children'),
+    Input('network-stats-store', 'data'),
+    Input('network-type-filter', 'value'),
+    Input('network-company-filter', 'value'),
+    Input('network-role-filter', 'value'),
+    Input('ego-center-store', 'data'),
+    Input('ego-hops-input', 'value'),
+    prevent_initial_call=True
+)
+@profiled
+def render_network(stats_data, connection_type, company, role, ego_center, hops):
+    snapshot = sync_data_snapshot()
+    
+    if ego_center:
+        hops = max(1, min(int(hops or 2), 4))
+        nodes, edges = network_analyzer.get_ego_elements(ego_center, hops, EGO_MAX_NODES)
+        if nodes:
+            status = f"{hops}-hop network around {ego_center}: {len(nodes)} people"
+            if len(nodes) >= EGO_MAX_NODES:
+                status += f" (limited to {EGO_MAX_NODES})"
+            return nodes + edges, status
+    
+    role = None if role == 'all' else role
+    if not (connection_type or company or role):
+        return snapshot['network_elements'], ''
+    
+    nodes, edges = network_analyzer.get_filtered_elements(connection_type, company, role)
+    return nodes + edges, ''
+
+@instrumented_callback(
     Output('network-stats-display', 'children'),
     Input('network-stats-store', 'data')
 )
@@ -752,25 +1410,109 @@ def update_network_stats(stats_data):
     return html.Div([
         html.P(f"Total People: {stats.get('total_people', 0)}", className="text-gray-300 text-sm md:text-base"),
         html.P(f"Total Connections: {stats.get('total_connections', 0)}", className="text-gray-300 text-sm md:text-base"),
-        html.P(f"Valid Connections: {stats.get('valid_connections', 0)}", className="text-gray-300 text-sm md:text-base"),
+        html.P(f"Connected Pairs: {stats.get('valid_connections', 0)}", className="text-gray-300 text-sm md:text-base"),
         html.P(f"Average Connections: {stats.get('average_connections', 0):.1f}", className="text-gray-300 text-sm md:text-base"),
+        html.P(f"Most Connected: {', '.join(p['name'] for p in stats.get('central_people', [])[:3]) or '-'}", className="text-gray-300 text-sm md:text-base"),
     ])
 
-@app.callback(
+def _format_follow_up(follow_up, today):
+    """
+    Render one follow-up as a list item: when it is due, the person and what to do
+    """
+    details = ' · '.join(part for part in (follow_up['channel'], follow_up['owner'] and f"owner {follow_up['owner']}") if part)
+    return html.Li([
+        html.Span(f"{follow_up['due_date']:%b %d, %Y} ({format_due(follow_up['due_date'], today)}) ", className="font-semibold text-indigo-200"),
+        html.Span(f"{follow_up['name']} ({follow_up['company']}): {follow_up['summary']}", className="text-gray-300"),
+        html.Span(f" [{details}]" if details else '', className="text-gray-500")
+    ], className="text-sm mb-1")
+
+@instrumented_callback(
+    Output('follow-up-output', 'children'),
+    Input('follow-up-window', 'value'),
+    Input('sync-token-store', 'data')
+)
+def update_follow_ups(days, sync_state):
+    today = datetime.now().date()
+    follow_ups = get_follow_ups(days=days or 7, limit=FOLLOW_UP_PANEL_ROWS, today=today)
+    groups = []
+    for group, title in (('overdue', 'Overdue'), ('upcoming', f"Due in the next {days or 7} days")):
+        items, total = follow_ups[group], follow_ups[f"{group}_total"]
+        children = [html.H3(f"{title} ({total})", className="text-md font-semibold mb-2 text-gray-200")]
+        if items:
+            children.append(html.Ul([_format_follow_up(item, today) for item in items]))
+            if total > len(items):
+                children.append(html.P(f"...and {total - len(items)} more", className="text-gray-500 text-sm"))
+        else:
+            children.append(html.P("Nothing here.", className="text-gray-400 text-sm"))
+        groups.append(html.Div(children))
+    return groups
+
+def _format_analysis(state):
+    """
+    Render a finished network analysis as a list of its top rows
+    """
+    rows = state['result']
+    if state['analysis'] == 'influence':
+        lines = [f"{row['name']} ({row['score']:.2%} of network influence)" for row in rows[:ANALYTICS_DISPLAY_ROWS]]
+    else:
+        # Each pair is suggested to both people; list it once
+        pairs = {}
+        for row in sorted(rows, key=lambda row: row['common_connections'], reverse=True):
+            pairs.setdefault(tuple(sorted((row['person'], row['suggested']))), row['common_connections'])
+        lines = [f"{first} and {second}: {count} common connections"
+                 for (first, second), count in list(pairs.items())[:ANALYTICS_DISPLAY_ROWS]]
+    if not lines:
+        return html.P("No results: the network has no connections yet.", className="text-gray-400 text-sm")
+    return html.Ol([html.Li(line, className="text-sm text-gray-300") for line in lines], className="list-decimal ml-6")
+
+@instrumented_callback(
+    Output('analytics-status', 'children'),
+    Output('analytics-output', 'children'),
+    Output('analytics-interval', 'disabled'),
+    Output('analytics-job', 'data'),
+    Input('analytics-button', 'n_clicks'),
+    Input('analytics-interval', 'n_intervals'),
+    State('analytics-analysis', 'value'),
+    State('analytics-job', 'data'),
+    prevent_initial_call=True
+)
+@profiled
+def update_network_analytics(n_clicks, n_intervals, analysis, job_key):
+    """
+    Start a network analysis in the analytics process pool and poll until it finishes
+    """
+    if callback_context.triggered_id == 'analytics-button':
+        # Export the adjacency and read the version together, so results match the graph
+        with _snapshot_lock:
+            snapshot = sync_data_snapshot()
+            job_key = submit_analysis(analysis, snapshot['version'], network_analyzer.export_adjacency)
+    if not job_key:
+        raise dash.exceptions.PreventUpdate
+    
+    state = get_analysis(job_key)
+    if state is None:
+        # Jobs are kept per dashboard process
+        return "Analysis not found in this worker; run it again.", None, True, None
+    label = ANALYSES[state['analysis']]
+    if state['status'] == 'running':
+        return f"{label}: running...", dash.no_update, False, job_key
+    if state['status'] == 'error':
+        return f"{label} failed: {state['error']}", None, True, job_key
+    return f"{label}: finished", _format_analysis(state), True, job_key
+
+@instrumented_callback(
     Output('pitch-output', 'children'),
     Input('pitch-button', 'n_clicks'),
-    State('company-dropdown', 'value'),
-    State('bd-data-store', 'data')
+    State('company-dropdown', 'value')
 )
-def generate_pitch(n_clicks, company_name, current_data):
+@profiled
+def generate_pitch(n_clicks, company_name):
     if n_clicks is None or not company_name:
         raise dash.exceptions.PreventUpdate
     
-    # Get current BD data
-    import io
-    df_bd_current = pd.read_json(io.StringIO(current_data), orient='split')
-    
     # Find matching BD data
+    snapshot = get_data_snapshot()
+    df_bd_current = snapshot['df_bd']
     target_bd = df_bd_current[df_bd_current['company'] == company_name]
     if target_bd.empty:
         return "No BD data found for this company."
@@ -778,22 +1520,310 @@ def generate_pitch(n_clicks, company_name, current_data):
     target_bd_row = target_bd.iloc[0]
     
     # Find matching market data
+    df_market = snapshot['df_market']
     target_market = df_market[df_market['company'] == company_name]
     if target_market.empty:
         return "No market data found for this company."
     
     target_market_row = target_market.iloc[0]
     
-    # Generate AI pitch
+    # Generate AI pitch, mentioning look-alike companies as context
+    peers = [match['company'] for match in get_prospect_index().similar_to(company_name, LOOKALIKE_PITCH_PEERS)]
     pitch_text = generate_pitch_with_ai(
         target_bd_row.to_dict(),
         target_market_row.to_dict(),
-        target_bd_row.get('connections', '')
+        target_bd_row.get('connections', ''),
+        peer_companies=peers
     )
     
     return dcc.Markdown(pitch_text)
 
+@instrumented_callback(
+    Output('lookalike-output', 'children'),
+    Input('lookalike-company', 'value'),
+    Input('lookalike-query', 'value')
+)
+@profiled
+def show_lookalikes(company_name, query):
+    index = get_prospect_index()
+    if query and query.strip():
+        matches = index.search(query, LOOKALIKE_COUNT)
+        heading = f'Companies matching "{query.strip()}"'
+    elif company_name:
+        matches = index.similar_to(company_name, LOOKALIKE_COUNT)
+        heading = f"Companies like {company_name}"
+    else:
+        return None
+    
+    if not matches:
+        return html.P("No similar companies found.", className="text-gray-400 text-sm")
+    
+    df_market = get_data_snapshot()['df_market']
+    children = [html.H3(heading, className="text-base font-semibold text-indigo-300 mb-2")]
+    for match in matches:
+        row = df_market.loc[match['id']] if match['id'] in df_market.index else None
+        detail = f" - {row['focus']}; pain point: {row['pain_point']}" if row is not None else ''
+        children.append(html.P(f"{match['company']} ({match['similarity']:.0%} similar){detail}", className="text-sm text-gray-300"))
+    return children
+
+@instrumented_callback(
+    Output('bubble-chart', 'figure'),
+    Input('bubble-chart', 'relayoutData'),
+    prevent_initial_call=True
+)
+@profiled
+def refine_bubble_chart(relayout_data):
+    """
+    Redraw the bubble chart for the zoomed range, so grouped companies split up as the user zooms in
+    """
+    if not relayout_data:
+        raise dash.exceptions.PreventUpdate
+    snapshot = get_data_snapshot()
+    # With every company drawn, plotly zooms in the browser
+    if len(snapshot['df_market']) <= BUBBLE_MAX_POINTS:
+        raise dash.exceptions.PreventUpdate
+    if any(key.endswith('autorange') for key in relayout_data):
+        return snapshot['figures']['bubble']
+
+    x_range = _relayout_range(relayout_data, 'xaxis')
+    y_range = _relayout_range(relayout_data, 'yaxis')
+    if x_range is None and y_range is None:
+        raise dash.exceptions.PreventUpdate
+    return create_bubble_chart(snapshot['df_market'], x_range, y_range)
+
+@instrumented_callback(
+    Output('opportunity-table', 'data'),
+    Output('opportunity-tiers', 'children'),
+    [Input(f'opportunity-weight-{column}', 'value') for column in FACTORS]
+)
+@profiled
+def update_opportunity_ranking(*weight_values):
+    scorer = get_opportunity_scorer()
+    weights = dict(zip(FACTORS, weight_values))
+    rows = scorer.ranked(weights, OPPORTUNITY_TABLE_ROWS)
+    counts = scorer.tier_counts(weights)
+    tiers = ', '.join(f"{name}: {counts[name]}" for name, _ in TIERS)
+    return rows, f"{len(scorer)} companies by tier - {tiers} (top {min(len(scorer), OPPORTUNITY_TABLE_ROWS)} listed)"
+
+def _highlight(snippet):
+    """
+    Convert a search snippet with highlight markers into text and html.Mark children
+    """
+    children = []
+    for part in (snippet or '').split(HIGHLIGHT_START):
+        matched, _, rest = part.rpartition(HIGHLIGHT_END)
+        if matched:
+            children.append(html.Mark(matched, className="bg-indigo-400 text-gray-900 rounded px-0.5"))
+        if rest:
+            children.append(rest)
+    return children
+
+@instrumented_callback(
+    Output('search-results', 'children'),
+    Output('search-status', 'children'),
+    Output('search-page', 'data'),
+    Input('search-input', 'value'),
+    Input('search-scope', 'value'),
+    Input('search-prev', 'n_clicks'),
+    Input('search-next', 'n_clicks'),
+    State('search-page', 'data')
+)
+@profiled
+def search(query, scope, prev_clicks, next_clicks, page):
+    if not query or not query.strip():
+        return None, "", 1
+    if not search_available():
+        return None, "Full-text search needs a SQLite database.", 1
+    
+    # A new query or scope starts from the first page
+    triggered = callback_context.triggered_id
+    if triggered == 'search-next':
+        page = (page or 1) + 1
+    elif triggered == 'search-prev':
+        page = max((page or 1) - 1, 1)
+    else:
+        page = 1
+    
+    found = search_records(query, scope, page, SEARCH_PAGE_SIZE)
+    pages = max(1, -(-found['total'] // SEARCH_PAGE_SIZE))
+    if page > pages:
+        page = pages
+        found = search_records(query, scope, page, SEARCH_PAGE_SIZE)
+    if not found['total']:
+        return html.P("No matches.", className="text-gray-400 text-sm"), "", 1
+    
+    results = [
+        html.Div(
+            className="bg-gray-700 p-3 rounded-lg text-left",
+            children=[
+                html.P(' - '.join(str(result[column]) for column in result if column not in ('id', 'snippet') and result[column]),
+                       className="text-sm font-semibold text-indigo-200"),
+                html.P(_highlight(result['snippet']), className="text-sm text-gray-300")
+            ]
+        )
+        for result in found['results']
+    ]
+    first = (page - 1) * SEARCH_PAGE_SIZE + 1
+    status = f"{first}-{first + len(found['results']) - 1} of {found['total']} (page {page} of {pages})"
+    return results, status, page
+
+@instrumented_callback(
+    Output('connection-insights-output', 'children'),
+    Input('company-dropdown', 'value')
+)
+def show_connection_insights(company_name):
+    if not company_name:
+        return None
+    
+    insights = get_connection_insights_for_company(company_name)
+    if not insights:
+        return html.P("No connection insights yet. They are generated by the nightly refresh (python connection_insights.py).", className="text-gray-400 text-sm")
+    
+    children = [html.H3("Connection Insights", className="text-base font-semibold text-indigo-300 mb-2")]
+    for item in insights:
+        updated = item['updated_at'].strftime('%Y-%m-%d') if item['updated_at'] else ''
+        children.append(html.P(f"{item['name']} (updated {updated})", className="text-sm font-semibold text-gray-300"))
+        children.append(dcc.Markdown(item['insight'], className="text-sm mb-2"))
+    return children
+
+# Fit analysis progress for this process; one run at a time
+fit_analysis_run = {}
+
+@profiled(name='run_fit_analysis')
+def _run_fit_analysis_in_background(run):
+    try:
+        market_rows = get_data_snapshot()['df_market'].to_dict('records')
+        run['total'] = len(market_rows)
+        results, failed = analyze_companies_fit(
+            market_rows, batch_size=FIT_ANALYSIS_BATCH_SIZE, background=True,
+            progress=lambda analyzed: run.update(analyzed=analyzed)
+        )
+        save_company_fits(results, backend=get_backend().name)
+        invalidate_data_snapshot()
+        run.update(analyzed=len(results), failed=failed, finished=True)
+    except Exception as e:
+        print(f"Error running fit analysis: {e}")
+        run.update(finished=True, error=str(e))
+
+def _format_fit_analysis_status(run):
+    if run.get('error'):
+        return f"Fit analysis failed: {run['error']}"
+    if not run.get('finished'):
+        return f"Fit analysis running: {run.get('analyzed', 0)}/{run.get('total', 0)} companies analyzed"
+    status = f"Analyzed {run['analyzed']} of {run['total']} companies."
+    if run.get('failed'):
+        status += f" Could not analyze: {', '.join(run['failed'])}"
+    return status
+
+@instrumented_callback(
+    Output('fit-analysis-table', 'data'),
+    Output('fit-analysis-status', 'children'),
+    Output('fit-analysis-interval', 'disabled'),
+    Input('fit-analysis-button', 'n_clicks'),
+    Input('fit-analysis-interval', 'n_intervals'),
+    prevent_initial_call=True
+)
+def run_fit_analysis(n_clicks, n_intervals):
+    global fit_analysis_run
+    run = fit_analysis_run
+    
+    # Analyzing every company takes many AI calls, so it runs in a thread polled by the interval
+    if callback_context.triggered_id == 'fit-analysis-button' and (not run or run.get('finished')):
+        run = fit_analysis_run = {'total': 0, 'analyzed': 0}
+        threading.Thread(target=_run_fit_analysis_in_background, args=(run,), daemon=True).start()
+    
+    if not run:
+        raise dash.exceptions.PreventUpdate
+    
+    finished = bool(run.get('finished'))
+    table_data = get_company_fits().to_dict('records') if finished else dash.no_update
+    return table_data, _format_fit_analysis_status(run), finished
+
+# Batch campaign progress, keyed by campaign id
+campaign_runs = {}
+
+def _run_campaign_in_background(campaign_id):
+    def record_progress(summary):
+        campaign_runs[campaign_id] = summary
+    
+    try:
+        summary = run_campaign(campaign_id, progress=record_progress)
+        summary['finished'] = True
+    except Exception as e:
+        summary = dict(campaign_runs.get(campaign_id, {}), finished=True, error=str(e))
+    campaign_runs[campaign_id] = summary
+
+def _format_campaign_status(summary):
+    if summary.get('error'):
+        return f"Campaign {summary['campaign_id']} failed: {summary['error']}"
+    completed = summary.get('resumed', 0) + summary.get('generated', 0) + summary.get('fallback', 0) + summary.get('failed', 0) + summary.get('skipped', 0)
+    state = "finished" if summary.get('finished') else "running"
+    return f"Campaign {summary['campaign_id']} {state}: {completed}/{summary.get('total', 0)} contacts"
+
+@instrumented_callback(
+    Output('campaign-status', 'children'),
+    Output('campaign-interval', 'disabled'),
+    Input('campaign-button', 'n_clicks'),
+    Input('campaign-interval', 'n_intervals'),
+    prevent_initial_call=True
+)
+def update_campaign(n_clicks, n_intervals):
+    campaign_id = default_campaign_id()
+    summary = campaign_runs.get(campaign_id)
+    
+    if callback_context.triggered_id == 'campaign-button' and (summary is None or summary.get('finished')):
+        summary = {'campaign_id': campaign_id, 'total': 0}
+        campaign_runs[campaign_id] = summary
+        threading.Thread(target=_run_campaign_in_background, args=(campaign_id,), daemon=True).start()
+    
+    if summary is None:
+        raise dash.exceptions.PreventUpdate
+    
+    return _format_campaign_status(summary), bool(summary.get('finished'))
+
+@instrumented_callback(
+    Output('campaign-download', 'data'),
+    Input('campaign-download-button', 'n_clicks'),
+    prevent_initial_call=True
+)
+def download_campaign(n_clicks):
+    campaign_id = default_campaign_id()
+    return dcc.send_string(export_campaign_csv(campaign_id), f"campaign_{campaign_id}.csv")
+
+def create_app():
+    """
+    Create the Dash app; data is loaded lazily on the first page load
+    
+    Callbacks are registered globally through instrumented_callback.
+    """
+    with startup_phase('app'):
+        app = Dash(__name__, external_stylesheets=['https://cdn.jsdelivr.net/npm/tailwindcss@2.2.19/dist/tailwind.min.css'])
+        
+        # Validate callbacks against an empty layout so no data is loaded at startup
+        app.validation_layout = build_layout(_empty_snapshot())
+        app.layout = serve_layout
+    
+    with startup_phase('routes'):
+        register_static_dataset(
+            'competitor',
+            [('Criteria', 'string'), ('Asymchem', 'string'), ('Lonza', 'string'), ('WuXi AppTec', 'string'), ('Catalent', 'string')],
+            [{key: value.replace('<br>', ' ') for key, value in item.items()} for item in cdmo_comparison_data]
+        )
+        register_static_dataset(
+            'opportunity',
+            [('client', 'string'), ('x', 'float'), ('y', 'float'), ('note', 'string')],
+            customer_opportunity_data
+        )
+        register_export_routes(app.server)
+        register_metrics_route(app.server)
+        register_profiling_routes(app.server)
+        register_sync_routes(app.server, edges_for_changes)
+    
+    return app
 
+app = create_app()
+server = app.server
+print(f"Startup: {format_startup_timings(startup_timings)} (total {sum(t for _, t in startup_timings) * 1000:.0f}ms)")
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8050)
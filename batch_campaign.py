@@ -0,0 +1,169 @@
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database import (init_database, get_bd_contacts, get_market_data, get_campaign_checkpoint,
+                      save_campaign_pitch, get_campaign_pitches)
+from ai_pitch_generator import generate_pitch_with_ai, generate_fallback_pitch, ai_available
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how often the AI API is called
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available, then take it
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def default_campaign_id() -> str:
+    """
+    Campaign id for the current quarter, e.g. "2025Q3"
+    """
+    today = datetime.utcnow()
+    return f"{today.year}Q{(today.month - 1) // 3 + 1}"
+
+
+def _generate_with_retries(contact: Dict, market_row: Dict, bucket: TokenBucket,
+                           max_retries: int, backoff: float) -> Dict:
+    """
+    Generate one pitch, retrying AI failures with exponential backoff and full jitter
+    """
+    error = None
+    for attempt in range(1, max_retries + 2):
+        bucket.acquire()
+        try:
+            pitch = generate_pitch_with_ai(contact, market_row, contact.get('connections') or '', raise_on_error=True, background=True)
+            status = 'generated' if ai_available() else 'fallback'
+            return {'status': status, 'pitch': pitch, 'attempts': attempt, 'error': None}
+        except Exception as e:
+            error = str(e)
+            if attempt <= max_retries:
+                time.sleep(random.uniform(0, backoff * 2 ** (attempt - 1)))
+
+    pitch = generate_fallback_pitch(contact, market_row, contact.get('connections') or '')
+    return {'status': 'fallback', 'pitch': pitch, 'attempts': max_retries + 1, 'error': error}
+
+
+def run_campaign(campaign_id: Optional[str] = None, rate: float = 1.0, max_workers: int = 4,
+                 max_retries: int = 3, backoff: float = 1.0, progress=None) -> Dict:
+    """
+    Generate pitches for every BD contact, resuming from any earlier run of the same campaign
+
+    Results are written to the campaign_pitches table as each pitch completes, so an
+    interrupted run picks up where it stopped. Only generated pitches count as done:
+    contacts that ended on the fallback template, failed, or were skipped for lack of
+    market data are retried on the next run.
+
+    Args:
+        campaign_id (str): Campaign identifier, defaults to the current quarter
+        rate (float): Maximum AI requests per second across all workers
+        max_workers (int): Size of the thread pool
+        max_retries (int): Retries per contact before using the fallback pitch
+        backoff (float): Base backoff in seconds between retries
+        progress (callable): Optional callback receiving the summary after each result
+
+    Returns:
+        dict: Counts per status for this run
+    """
+    campaign_id = campaign_id or default_campaign_id()
+    init_database()
+
+    market_by_company = {row['company']: row for row in get_market_data().to_dict('records')}
+    done = get_campaign_checkpoint(campaign_id)
+    pending = [c for c in get_bd_contacts() if c['id'] not in done]
+
+    summary = {'campaign_id': campaign_id, 'total': len(pending) + len(done), 'resumed': len(done),
+               'generated': 0, 'fallback': 0, 'failed': 0, 'skipped': 0}
+    bucket = TokenBucket(rate)
+
+    to_generate: List[Dict] = []
+    for contact in pending:
+        if contact['company'] in market_by_company:
+            to_generate.append(contact)
+        else:
+            save_campaign_pitch(campaign_id, contact['id'], contact['name'], contact['company'],
+                                'skipped', None, 0, 'No market data found for this company.')
+            summary['skipped'] += 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_generate_with_retries, contact, market_by_company[contact['company']],
+                            bucket, max_retries, backoff): contact
+            for contact in to_generate
+        }
+        # Results are saved from this thread only, keeping SQLite writes serialized
+        for future in as_completed(futures):
+            contact = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Record the contact as failed and keep going; the next run retries it
+                print(f"Error generating campaign pitch for {contact['name']}: {e}")
+                result = {'status': 'failed', 'pitch': None, 'attempts': max_retries + 1, 'error': str(e)}
+            save_campaign_pitch(campaign_id, contact['id'], contact['name'], contact['company'],
+                                result['status'], result['pitch'], result['attempts'], result['error'])
+            summary[result['status']] += 1
+            if progress:
+                progress(dict(summary))
+
+    return summary
+
+
+def export_campaign_csv(campaign_id: str, path: Optional[str] = None) -> str:
+    """
+    Export a campaign's pitches as CSV, writing to path if given
+    """
+    df = get_campaign_pitches(campaign_id)
+    if path:
+        df.to_csv(path, index=False)
+    return df.to_csv(index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate AI pitches for every BD contact")
+    parser.add_argument('--campaign', default=None, help="Campaign id (default: current quarter, e.g. 2025Q3)")
+    parser.add_argument('--rate', type=float, default=1.0, help="Max AI requests per second")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent worker threads")
+    parser.add_argument('--retries', type=int, default=3, help="Retries per contact before falling back")
+    parser.add_argument('--csv', default=None, help="Write the campaign results to this CSV file")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    summary = run_campaign(args.campaign, rate=args.rate, max_workers=args.workers, max_retries=args.retries)
+    print(f"Campaign {summary['campaign_id']}: {summary['generated']} generated, "
+          f"{summary['fallback']} fallback, {summary['failed']} failed, {summary['skipped']} skipped, {summary['resumed']} already done")
+
+    if args.csv:
+        export_campaign_csv(summary['campaign_id'], args.csv)
+        print(f"Results written to {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+import database
+from database import BDData, configure_database, init_database, get_engine, get_bd_data, add_bd_person, upsert_bd_people, search_records, \
+    backfill_follow_ups, get_follow_ups
+from network_analyzer import NetworkAnalyzer
+from prospect_recommender import ProspectIndex
+from opportunity_scoring import OpportunityScorer, DEFAULT_WEIGHTS
+from benchmarks.synthetic import generate_for_edges, generate_market
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def measure(func: Callable, repeat: int = 1, trace_memory: bool = True) -> Dict:
+    """
+    Time func (best of repeat runs) and, separately, its peak Python memory allocation
+    and the memory still allocated while its return value is held (retained)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    result = {'seconds': best}
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        value = func()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        result['peak_mb'] = peak / 1024 / 1024
+        result['retained_mb'] = current / 1024 / 1024
+        tracemalloc.stop()
+        del value
+    return result
+
+
+def _load_database(df_bd, chunk_size: int = 10_000):
+    engine = get_engine()
+    records = df_bd.to_dict('records')
+    with engine.begin() as conn:
+        for start in range(0, len(records), chunk_size):
+            conn.execute(BDData.__table__.insert(), records[start:start + chunk_size])
+
+
+def run_scale(edges: int, seed: int, repeat: int, trace_memory: bool, db_dir: str) -> Dict:
+    """
+    Run every benchmark for one synthetic network size
+    """
+    df_bd, leadership = generate_for_edges(edges, seed=seed)
+    listed_edges = int(df_bd['connections'].str.count(';').sum() + len(df_bd)) + \
+        sum(person['key_connections'].count(';') + 1 for person in leadership)
+    print(f"Scale {edges:,} edges: {len(df_bd):,} contacts, {len(leadership):,} leaders, {listed_edges:,} listed connections")
+
+    def build_analyzer():
+        fresh = NetworkAnalyzer()
+        fresh.create_precise_network_elements(df_bd, leadership)
+        return fresh
+
+    analyzer = NetworkAnalyzer()
+    sample_people = list(df_bd['name'].iloc[:5])
+    benchmarks = {
+        'create_precise_network_elements': measure(
+            lambda: analyzer.create_precise_network_elements(df_bd, leadership), repeat, trace_memory),
+        # Retained memory here is what the analyzer keeps resident per worker
+        'analyzer_memory': measure(build_analyzer, 1, trace_memory),
+        'get_network_statistics': measure(analyzer.get_network_statistics, repeat, trace_memory),
+        'find_central_people': measure(analyzer.find_central_people, repeat, trace_memory),
+        'suggest_connections': measure(
+            lambda: [analyzer.suggest_connections(name) for name in sample_people], repeat, trace_memory),
+    }
+    benchmarks['suggest_connections']['calls'] = len(sample_people)
+
+    added = iter(range(10 ** 9))
+
+    def add_to_network(count=20):
+        for _ in range(count):
+            n = next(added)
+            analyzer.add_person({'name': f"Bench Added {n}", 'company': 'Moderna',
+                                 'connections': f"{sample_people[n % len(sample_people)]}: Attended BIO 2025"})
+
+    benchmarks['add_person'] = measure(add_to_network, repeat, trace_memory)
+    benchmarks['add_person']['calls'] = 20
+
+    # One market company per contact, so 1M edges gives a 100k-company look-alike index
+    df_market = generate_market(len(df_bd), seed=seed)
+    prospects = ProspectIndex(df_market)
+    sample_companies = list(df_market['company'].iloc[:5])
+    benchmarks['prospect_index_build'] = measure(lambda: ProspectIndex(df_market), 1, trace_memory)
+    benchmarks['similar_companies'] = measure(
+        lambda: [prospects.similar_to(company) for company in sample_companies], repeat, trace_memory)
+    benchmarks['similar_companies']['calls'] = len(sample_companies)
+    # Uncached: a fresh scorer per run, as after a market data change
+    benchmarks['opportunity_ranking'] = measure(
+        lambda: OpportunityScorer(df_market).ranked(DEFAULT_WEIGHTS, 200), repeat, trace_memory)
+    # Full-range figure, grouped on a grid above BUBBLE_MAX_POINTS companies
+    from app import create_bubble_chart  # Importing app creates the Dash app, so only when benchmarking
+    benchmarks['bubble_chart'] = measure(lambda: create_bubble_chart(df_market), repeat, trace_memory)
+
+    configure_database(f"sqlite:///{os.path.join(db_dir, f'bench_{edges}.db')}")
+    init_database()
+    _load_database(df_bd)
+    benchmarks['get_bd_data'] = measure(get_bd_data, repeat, trace_memory)
+    search_queries = ['BIO 2025', 'CPHI', '"Harvard Business School"', 'follow']
+    benchmarks['search_records'] = measure(
+        lambda: [search_records(query, 'bd', page=2) for query in search_queries], repeat, trace_memory)
+    benchmarks['search_records']['calls'] = len(search_queries)
+    # Synthetic actions are "Email Sep <day>, 2025: ...": parse them all, then query mid-month
+    benchmarks['backfill_follow_ups'] = measure(lambda: backfill_follow_ups(get_engine()), 1, trace_memory)
+    benchmarks['get_follow_ups'] = measure(lambda: get_follow_ups(days=7, today=date(2025, 9, 14)), repeat, trace_memory)
+
+    counter = iter(range(10 ** 9))
+
+    def add_people(count=20):
+        for _ in range(count):
+            n = next(counter)
+            add_bd_person(f"Bench Person {n}", 'Moderna', f"bench{n}@example.com", '', '', 'Becky: Attended BIO 2025', '')
+
+    benchmarks['add_bd_person'] = measure(add_people, repeat, trace_memory)
+    benchmarks['add_bd_person']['calls'] = 20
+
+    # Re-importing the same contacts: after the first run every row matches a stored email and is updated
+    imported = [{'name': f"Bench Import {n}", 'company': 'Moderna', 'email': f"import{n}@example.com",
+                 'connections': 'Becky: Attended BIO 2025'} for n in range(1000)]
+    benchmarks['upsert_bd_people'] = measure(lambda: upsert_bd_people(imported), repeat, trace_memory)
+    benchmarks['upsert_bd_people']['calls'] = len(imported)
+    database.get_engine().dispose()
+
+    for name, result in benchmarks.items():
+        memory = f", peak {result['peak_mb']:.1f} MB, retained {result['retained_mb']:.1f} MB" if 'peak_mb' in result else ''
+        print(f"  {name:34s} {result['seconds'] * 1000:10.1f} ms{memory}")
+
+    return {
+        'edges': edges,
+        'listed_connections': listed_edges,
+        'contacts': len(df_bd),
+        'leaders': len(leadership),
+        'benchmarks': benchmarks
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(current: Dict, baseline_path: str):
+    """
+    Print the time and memory ratio of each benchmark against a saved baseline
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    baseline_by_edges = {run['edges']: run['benchmarks'] for run in baseline['results']}
+
+    print(f"\nCompared with {baseline['meta']['commit']} ({baseline_path}):")
+    for run in current['results']:
+        old = baseline_by_edges.get(run['edges'])
+        if not old:
+            continue
+        for name, result in run['benchmarks'].items():
+            if name not in old:
+                continue
+            time_ratio = result['seconds'] / old[name]['seconds'] if old[name]['seconds'] else float('inf')
+            line = f"  {run['edges']:>9,} {name:34s} time x{time_ratio:.2f}"
+            if 'peak_mb' in result and old[name].get('peak_mb'):
+                line += f", memory x{result['peak_mb'] / old[name]['peak_mb']:.2f}"
+            if result.get('retained_mb') and old[name].get('retained_mb'):
+                line += f", retained x{result['retained_mb'] / old[name]['retained_mb']:.2f}"
+            print(line)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark NetworkAnalyzer and database accessors on synthetic data")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Listed-connection counts to run")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per benchmark (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument('--output', default=None, help="Results JSON path (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument('--compare', default=None, help="Baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    results = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'results': []
+    }
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        for edges in args.scales:
+            results['results'].append(run_scale(edges, args.seed, args.repeat, not args.no_memory, db_dir))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.utcnow():%Y%m%d-%H%M%S}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
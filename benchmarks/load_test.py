@@ -0,0 +1,291 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# Callbacks the load test can drive, keyed by a short name. Each entry gives
+# an output that identifies the callback and the values to send for its
+# inputs and states ("id.property" -> function of the request number).
+SCENARIOS = {
+    'update_bd_data': {
+        'output': 'sync-token-store.data',
+        'values': {
+            'add-person-button.n_clicks': lambda i: i + 1,
+            'new-name-input.value': lambda i: f"Load Test {os.getpid()}-{i}-{time.time_ns()}",
+            'new-company-input.value': lambda i: 'Moderna',
+            'new-email-input.value': lambda i: '',
+            'new-linkedin-input.value': lambda i: '',
+            'new-school-input.value': lambda i: 'Harvard Business School',
+            'new-connections-input.value': lambda i: 'Becky: Attended BIO 2025; James Gage: Harvard University alumni network',
+        }
+    },
+    'generate_pitch': {
+        'output': 'pitch-output.children',
+        'values': {
+            'pitch-button.n_clicks': lambda i: i + 1,
+            'company-dropdown.value': lambda i: 'CRISPR Therapeutics',
+        }
+    },
+    'network_stats': {
+        'output': 'network-stats-display.children',
+        'values': {}
+    }
+}
+
+LOCK_MARKERS = ('database is locked', 'database table is locked')
+
+
+def _split_outputs(output: str):
+    """
+    Turn a Dash output string into the "outputs" request field
+    """
+    def parse(spec):
+        component_id, prop = spec.rsplit('.', 1)
+        return {'id': component_id, 'property': prop}
+
+    if output.startswith('..') and output.endswith('..'):
+        return [parse(spec) for spec in output[2:-2].split('...')]
+    return parse(output)
+
+
+def _find_prop(layout, component_id: str, prop: str):
+    """
+    Find a property value in the serialized layout
+    """
+    if isinstance(layout, dict):
+        props = layout.get('props', {})
+        if props.get('id') == component_id and prop in props:
+            return props[prop]
+        for value in props.values():
+            found = _find_prop(value, component_id, prop)
+            if found is not None:
+                return found
+    elif isinstance(layout, list):
+        for item in layout:
+            found = _find_prop(item, component_id, prop)
+            if found is not None:
+                return found
+    return None
+
+
+def build_request_factory(dependencies: List[Dict], layout: Dict, scenario: Dict) -> Callable[[int], Dict]:
+    """
+    Build a function producing the /_dash-update-component body for request i
+    """
+    dependency = next((d for d in dependencies if scenario['output'] in d['output']), None)
+    if dependency is None:
+        raise ValueError(f"No callback with output {scenario['output']}")
+
+    def value_for(item, i):
+        key = f"{item['id']}.{item['property']}"
+        if key in scenario['values']:
+            return scenario['values'][key](i)
+        return _find_prop(layout, item['id'], item['property'])
+
+    def make_body(i):
+        inputs = [dict(item, value=value_for(item, i)) for item in dependency['inputs']]
+        return {
+            'output': dependency['output'],
+            'outputs': _split_outputs(dependency['output']),
+            'inputs': inputs,
+            'state': [dict(item, value=value_for(item, i)) for item in dependency.get('state', [])],
+            'changedPropIds': [f"{inputs[0]['id']}.{inputs[0]['property']}"] if inputs else []
+        }
+
+    return make_body
+
+
+class InProcessClient:
+    """
+    Sends requests straight to the Flask app, one test client per thread
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.local = threading.local()
+
+    def _client(self):
+        if not hasattr(self.local, 'client'):
+            self.local.client = self.server.test_client()
+        return self.local.client
+
+    def get_json(self, path):
+        return self._client().get(path).get_json()
+
+    def post(self, path, body):
+        response = self._client().post(path, json=body)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class HttpClient:
+    """
+    Sends requests to a running server over HTTP
+    """
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def get_json(self, path):
+        with urllib.request.urlopen(self.base_url + path, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def post(self, path, body):
+        request = urllib.request.Request(self.base_url + path, data=json.dumps(body).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8', 'replace')
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_load(client, scenarios: List[str], requests_per_scenario: int, concurrency: int) -> Dict:
+    """
+    Send requests for each scenario interleaved across a thread pool and collect latencies
+    """
+    dependencies = client.get_json('/_dash-dependencies')
+    layout = client.get_json('/_dash-layout')
+    factories = {name: build_request_factory(dependencies, layout, SCENARIOS[name]) for name in scenarios}
+
+    samples = {name: [] for name in scenarios}
+    errors = {name: {} for name in scenarios}
+    lock = threading.Lock()
+
+    def send(name, i):
+        body = factories[name](i)
+        started = time.perf_counter()
+        try:
+            status, text = client.post('/_dash-update-component', body)
+            error = None if status in (200, 204) else f"HTTP {status}"
+        except Exception as e:
+            text, error = str(e), type(e).__name__
+        elapsed = time.perf_counter() - started
+        if error and any(marker in text.lower() for marker in LOCK_MARKERS):
+            error = 'sqlite_locked'
+        with lock:
+            samples[name].append(elapsed)
+            if error:
+                errors[name][error] = errors[name].get(error, 0) + 1
+
+    jobs = [(name, i) for i in range(requests_per_scenario) for name in scenarios]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda job: send(*job), jobs))
+    wall = time.perf_counter() - started
+
+    report = {'concurrency': concurrency, 'wall_seconds': wall, 'throughput': len(jobs) / wall, 'callbacks': {}}
+    for name in scenarios:
+        latencies = sorted(samples[name])
+        report['callbacks'][name] = {
+            'requests': len(latencies),
+            'errors': errors[name],
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'max_ms': (latencies[-1] if latencies else 0) * 1000
+        }
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\n{report['throughput']:.1f} req/s over {report['wall_seconds']:.1f}s at concurrency {report['concurrency']}")
+    print(f"{'callback':18s} {'reqs':>6s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}  errors")
+    for name, stats in report['callbacks'].items():
+        errors = ', '.join(f"{kind}: {count}" for kind, count in stats['errors'].items()) or '-'
+        print(f"{name:18s} {stats['requests']:6d} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} "
+              f"{stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}  {errors}")
+    locked = sum(stats['errors'].get('sqlite_locked', 0) for stats in report['callbacks'].values())
+    if locked:
+        print(f"WARNING: {locked} requests failed with SQLite lock errors")
+
+
+def _test_environment(db_dir: str) -> Dict[str, str]:
+    """
+    Environment for the server under test: a throwaway database and the
+    deterministic local AI backend, so no network access is needed
+    """
+    db_path = os.path.join(db_dir, 'load_test.db')
+    return {'DATABASE_URL': f"sqlite:///{db_path}", 'LLM_BACKEND': 'local'}
+
+
+def _start_gunicorn(workers: int, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    gunicorn = shutil.which('gunicorn')
+    if gunicorn is None:
+        raise SystemExit("gunicorn is not installed (pip install gunicorn)")
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [gunicorn, 'app:server', '--workers', str(workers), '--bind', f"127.0.0.1:{port}"],
+        cwd=repo_root, env=dict(os.environ, **env), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    client = HttpClient(f"http://127.0.0.1:{port}")
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            client.get_json('/_dash-layout')
+            return process
+        except (OSError, ValueError):
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("gunicorn did not start within 30 seconds")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load-test Dash callback endpoints")
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=50, help="Requests per scenario")
+    parser.add_argument('--concurrency', type=int, default=8)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', default=None, help="Test an already running server, e.g. http://localhost:8050")
+    target.add_argument('--gunicorn', type=int, metavar='WORKERS', default=None,
+                        help="Start a local gunicorn with this many workers against a temp database")
+    parser.add_argument('--port', type=int, default=8765, help="Port for --gunicorn")
+    parser.add_argument('--output', default=None, help="Save the report as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        process = None
+        if args.url:
+            client = HttpClient(args.url)
+        elif args.gunicorn:
+            process = _start_gunicorn(args.gunicorn, args.port, _test_environment(db_dir))
+            client = HttpClient(f"http://127.0.0.1:{args.port}")
+        else:
+            os.environ.update(_test_environment(db_dir))
+            repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            sys.path.insert(0, repo_root)
+            from app import server
+            server.config['PROPAGATE_EXCEPTIONS'] = True
+            client = InProcessClient(server)
+
+        try:
+            report = run_load(client, args.scenarios, args.requests, args.concurrency)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import random
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+FIRST_NAMES = ['Adam', 'Sam', 'Paul', 'Wei', 'Maria', 'Priya', 'Kenji', 'Laura', 'Omar', 'Chen', 'Sofia', 'David',
+               'Aisha', 'Lucas', 'Mei', 'James', 'Elena', 'Hiro', 'Grace', 'Raj']
+LAST_NAMES = ['Macnaughton', 'Kay', 'Kong', 'Zhang', 'Garcia', 'Patel', 'Sato', 'Muller', 'Haddad', 'Liu', 'Rossi',
+              'Smith', 'Okafor', 'Silva', 'Wang', 'Brown', 'Ivanova', 'Tanaka', 'Kim', 'Gupta']
+COMPANIES = ['CRISPR Therapeutics', 'Mersana Therapeutics', 'LaNova Medicines', 'Beam Therapeutics', 'Sana Biotechnology',
+             'Intellia Therapeutics', 'Moderna', 'Verve Therapeutics', 'Caribou Biosciences', 'Editas Medicine']
+SCHOOLS = ['Harvard Business School', 'McGill University', 'Stanford University', 'Peking University', 'MIT']
+TITLES = ['CSO', 'CTO', 'Co-CEO', 'Sr. Director of BD', 'BD Director', 'VP Operations']
+
+# One template per connection type so the classifier sees a realistic mix
+DETAIL_TEMPLATES = [
+    '{school} alumni network',
+    'Shared {company} work history',
+    'Attended BIO 2025 conference',
+    'Met at CPHI event',
+    'Shared Merck and Roche network',
+    'Introduced by a mutual friend'
+]
+
+
+def _person_name(index: int) -> str:
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    return f"{first} {last} {index}"
+
+
+def _connections_text(rng: random.Random, names: List[str], degree: int, unknown_ratio: float) -> str:
+    parts = []
+    for _ in range(degree):
+        if rng.random() < unknown_ratio:
+            target = f"Unknown Contact {rng.randrange(1_000_000)}"
+        else:
+            target = names[rng.randrange(len(names))]
+        detail = rng.choice(DETAIL_TEMPLATES).format(school=rng.choice(SCHOOLS), company=rng.choice(COMPANIES))
+        parts.append(f"{target}: {detail}")
+    return '; '.join(parts)
+
+
+def generate_network(n_contacts: int, n_leaders: int, avg_degree: int = 10, unknown_ratio: float = 0.1,
+                     seed: int = 0) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Generate synthetic BD contacts and leadership records with "Name: detail; ..." connection strings
+
+    Args:
+        n_contacts (int): Number of BD contacts
+        n_leaders (int): Number of leadership/BD team records
+        avg_degree (int): Average number of connections listed per person
+        unknown_ratio (float): Share of connections naming people outside the dataset
+        seed (int): Random seed, so runs are reproducible
+
+    Returns:
+        tuple: (BD DataFrame shaped like get_bd_data(), leadership list shaped like get_leadership_data())
+    """
+    rng = random.Random(seed)
+    contact_names = [_person_name(i) for i in range(n_contacts)]
+    leader_names = [f"Leader {_person_name(i)}" for i in range(n_leaders)]
+    all_names = contact_names + leader_names
+
+    bd_records = []
+    for name in contact_names:
+        degree = max(1, int(rng.expovariate(1 / avg_degree)))
+        company = rng.choice(COMPANIES)
+        bd_records.append({
+            'name': name,
+            'company': company,
+            'email': f"{name.lower().replace(' ', '.')}@example.com",
+            'linkedin': f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}",
+            'school': rng.choice(SCHOOLS),
+            'connections': _connections_text(rng, all_names, degree, unknown_ratio),
+            'action': f"Email Sep {rng.randint(1, 28)}, 2025: Pitch {company} follow-up"
+        })
+
+    leadership = []
+    for name in leader_names:
+        degree = max(1, int(rng.expovariate(1 / avg_degree)))
+        leadership.append({
+            'name': name,
+            'title': rng.choice(TITLES),
+            'key_connections': _connections_text(rng, all_names, degree, unknown_ratio)
+        })
+
+    return pd.DataFrame(bd_records), leadership
+
+
+def generate_for_edges(target_edges: int, avg_degree: int = 10, seed: int = 0) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Generate a network with roughly target_edges listed connections
+    """
+    people = max(2, target_edges // avg_degree)
+    n_leaders = max(1, people // 100)
+    return generate_network(people - n_leaders, n_leaders, avg_degree=avg_degree, seed=seed)
+
+
+MODALITIES = ['gene therapy', 'CRISPR gene editing', 'base editing', 'mRNA therapeutics', 'ADC', 'cell therapy',
+              'small molecule', 'peptide', 'oligonucleotide', 'biologics', 'vaccine', 'radiopharmaceutical']
+INDICATIONS = ['oncology', 'cardiovascular diseases', 'rare diseases', 'inherited diseases', 'immunology',
+               'neurology', 'infectious diseases', 'metabolic disorders', 'ophthalmology']
+REGIONS = ['US', 'EU', 'APAC', 'China', 'Japan', 'global']
+PAIN_POINTS = ['Scalability', 'Cost', 'Regulatory', 'Efficiency', 'Yield', 'Supply chain', 'Speed to clinic', 'Purity']
+SOLUTIONS = ['Biocatalysis reduces impurities', 'Flow chemistry improves efficiency', 'OEB5 facility supports multi-kg scaling',
+             'STAR AI optimizes yields', 'Continuous manufacturing cuts costs', 'Dual-site supply secures timelines',
+             'Analytical development speeds regulatory filings', 'Lipid nanoparticle formulation improves delivery']
+
+
+def generate_market(n_companies: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate synthetic market data shaped like get_market_data(), indexed by row id
+    """
+    rng = random.Random(seed)
+    records = []
+    for index in range(n_companies):
+        modality = rng.choice(MODALITIES)
+        records.append({
+            'company': f"{rng.choice(LAST_NAMES)} {rng.choice(['Therapeutics', 'Bio', 'Medicines', 'Pharma'])} {index}",
+            'business_potential': rng.randint(50, 600),
+            'tech_mapping': round(rng.uniform(3, 10), 1),
+            'market_value': rng.randint(100, 1200),
+            'pain_point': rng.choice(PAIN_POINTS),
+            'focus': f"{modality} for {rng.choice(INDICATIONS)} in {rng.choice(REGIONS)} markets",
+            'solution': f"{rng.choice(SOLUTIONS)} for {modality} programs."
+        })
+    return pd.DataFrame(records, index=range(1, n_companies + 1))
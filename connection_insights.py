@@ -0,0 +1,99 @@
+import argparse
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict
+
+from database import (init_database, get_bd_contacts, get_connection_insight_hashes, save_connection_insight,
+                      delete_connection_insights)
+from ai_pitch_generator import generate_connection_insights, ai_available
+from batch_campaign import TokenBucket
+from llm_backends import get_backend
+
+
+def connections_hash(connections_text: str) -> str:
+    """
+    Hash connection text, ignoring differences in whitespace
+    """
+    normalized = re.sub(r'\s+', ' ', connections_text or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _generate(contact: Dict, bucket: TokenBucket) -> str:
+    bucket.acquire()
+    return generate_connection_insights(contact['connections'], raise_on_error=True, background=True)
+
+
+def refresh_connection_insights(force: bool = False, rate: float = 1.0, max_workers: int = 4) -> Dict:
+    """
+    Regenerate stored connection insights for contacts whose connections changed
+
+    Each stored insight keeps the hash of the connections text it came from.
+    Only contacts whose current hash differs (or that have no insight yet)
+    are sent to the AI backend; contacts whose connections were cleared lose
+    their stored insight.
+
+    Args:
+        force (bool): Regenerate every contact regardless of hash
+        rate (float): Maximum AI requests per second
+        max_workers (int): Concurrent AI calls
+
+    Returns:
+        dict: Counts of checked, unchanged, refreshed, failed and removed contacts
+    """
+    init_database()
+    if not ai_available():
+        raise RuntimeError("AI backend is not configured; set GOOGLE_API_KEY or LLM_BACKEND=local")
+
+    stored = get_connection_insight_hashes()
+    contacts = get_bd_contacts()
+    summary = {'checked': len(contacts), 'unchanged': 0, 'refreshed': 0, 'failed': 0, 'removed': 0}
+
+    changed = []
+    cleared = []
+    for contact in contacts:
+        if not (contact['connections'] or '').strip():
+            if contact['id'] in stored:
+                cleared.append(contact['id'])
+            continue
+        contact['hash'] = connections_hash(contact['connections'])
+        if force or stored.get(contact['id']) != contact['hash']:
+            changed.append(contact)
+        else:
+            summary['unchanged'] += 1
+
+    delete_connection_insights(cleared)
+    summary['removed'] = len(cleared)
+
+    bucket = TokenBucket(rate)
+    backend_name = get_backend().name
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_generate, contact, bucket): contact for contact in changed}
+        for future in as_completed(futures):
+            contact = futures[future]
+            try:
+                insight = future.result()
+            except Exception as e:
+                print(f"Insights for {contact['name']} failed: {e}")
+                summary['failed'] += 1
+                continue
+            save_connection_insight(contact['id'], contact['hash'], insight, backend_name)
+            summary['refreshed'] += 1
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh stored connection insights for contacts whose connections changed")
+    parser.add_argument('--force', action='store_true', help="Regenerate insights for every contact")
+    parser.add_argument('--rate', type=float, default=1.0, help="Max AI requests per second")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent AI calls")
+    args = parser.parse_args()
+
+    summary = refresh_connection_insights(force=args.force, rate=args.rate, max_workers=args.workers)
+    print(f"Checked {summary['checked']} contacts: {summary['refreshed']} refreshed, {summary['unchanged']} unchanged, "
+          f"{summary['failed']} failed, {summary['removed']} removed")
+
+
+if __name__ == '__main__':
+    main()
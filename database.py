@@ -1,11 +1,22 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, DateTime
+from sqlalchemy import create_engine, select, func, text, inspect, bindparam, Column, Integer, String, Text, Float, Date, DateTime, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from datetime import datetime, timedelta
+import os
+import re
+from urllib.parse import unquote
 import pandas as pd
 
+from follow_ups import parse_action
+
 Base = declarative_base()
 
+DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///asymchem_bd.db')
+
+_engine = None
+_Session = None
+
 class MarketData(Base):
     __tablename__ = 'market_data'
     
@@ -18,7 +29,7 @@ class MarketData(Base):
     focus = Column(Text, nullable=False)
     solution = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class BDData(Base):
     __tablename__ = 'bd_data'
@@ -31,8 +42,13 @@ class BDData(Base):
     school = Column(String(255))
     connections = Column(Text)
     action = Column(Text)
+    # Normalized email and LinkedIn URL identifying a contact (see upsert_bd_people); NULL if blank
+    email_key = Column(String(255), unique=True, index=True)
+    linkedin_key = Column(String(500), unique=True, index=True)
+    # Normalized name|company, matching contacts that have neither key; not unique
+    name_key = Column(String(511), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class LeadershipData(Base):
     __tablename__ = 'leadership_data'
@@ -42,7 +58,7 @@ class LeadershipData(Base):
     title = Column(String(255), nullable=False)
     key_connections = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class NetworkConnection(Base):
     __tablename__ = 'network_connections'
@@ -54,17 +70,165 @@ class NetworkConnection(Base):
     connection_detail = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class CampaignPitch(Base):
+    __tablename__ = 'campaign_pitches'
+    __table_args__ = (UniqueConstraint('campaign_id', 'bd_id'),)
+    
+    id = Column(Integer, primary_key=True)
+    campaign_id = Column(String(100), nullable=False, index=True)
+    bd_id = Column(Integer, nullable=False)
+    name = Column(String(255), nullable=False)
+    company = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False)  # 'generated', 'fallback', 'failed' or 'skipped'
+    pitch = Column(Text)
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class FollowUp(Base):
+    __tablename__ = 'follow_ups'
+    
+    id = Column(Integer, primary_key=True)
+    # One follow-up per BD row, parsed from its action text
+    bd_id = Column(Integer, nullable=False, unique=True)
+    name = Column(String(255), nullable=False)
+    company = Column(String(255), nullable=False)
+    due_date = Column(Date, index=True)
+    channel = Column(String(20))  # 'email', 'call', 'meeting', 'linkedin', 'event' or None
+    owner = Column(String(255))
+    summary = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CompanyFit(Base):
+    __tablename__ = 'company_fit'
+    
+    id = Column(Integer, primary_key=True)
+    company = Column(String(255), nullable=False, unique=True)
+    fit_score = Column(Float, nullable=False)
+    opportunity = Column(Text)
+    approach = Column(Text)
+    backend = Column(String(50))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ConnectionInsight(Base):
+    __tablename__ = 'connection_insights'
+    
+    id = Column(Integer, primary_key=True)
+    bd_id = Column(Integer, nullable=False, unique=True)
+    connections_hash = Column(String(64), nullable=False)
+    insight = Column(Text, nullable=False)
+    backend = Column(String(50))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+def get_engine():
+    """Get the shared database engine, creating it on first use"""
+    global _engine, _Session
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL, echo=False)
+        _Session = sessionmaker(bind=_engine)
+    return _engine
+
+def configure_database(url):
+    """Point the module at a different database URL (e.g. a temp SQLite file)"""
+    global DATABASE_URL, _engine, _Session
+    if _engine is not None:
+        _engine.dispose()
+    DATABASE_URL = url
+    _engine = None
+    _Session = None
+
 def init_database():
     """Initialize the database and create tables"""
-    engine = create_engine('sqlite:///asymchem_bd.db', echo=False)
+    engine = get_engine()
     Base.metadata.create_all(engine)
+    migrate_schema(engine)
     return engine
 
+def migrate_schema(engine):
+    """Bring tables created by older versions up to date (create_all skips existing tables)"""
+    add_contact_keys(engine)
+    add_name_keys(engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    create_search_indexes(engine)
+    backfill_follow_ups(engine)
+
+def add_contact_keys(engine):
+    """
+    Add and backfill the email_key/linkedin_key columns of a bd_data table created without them
+
+    Rows repeating an earlier row's email or LinkedIn URL keep their data but get
+    no key, so the unique indexes can be created; later upserts update the first row.
+    """
+    if 'email_key' in {column['name'] for column in inspect(engine).get_columns('bd_data')}:
+        return
+    table = BDData.__table__
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE bd_data ADD COLUMN email_key VARCHAR(255)"))
+        conn.execute(text("ALTER TABLE bd_data ADD COLUMN linkedin_key VARCHAR(500)"))
+        
+        seen = {'email_key': set(), 'linkedin_key': set()}
+        updates, duplicates = [], 0
+        for row in conn.execute(select(table.c.id, table.c.email, table.c.linkedin).order_by(table.c.id)):
+            keys = contact_keys(row.email, row.linkedin)
+            for column, key in keys.items():
+                if key in seen[column]:
+                    keys[column] = None
+                    duplicates += 1
+                elif key:
+                    seen[column].add(key)
+            if keys['email_key'] or keys['linkedin_key']:
+                updates.append({'row_id': row.id, 'new_email_key': keys['email_key'], 'new_linkedin_key': keys['linkedin_key']})
+        if updates:
+            # Keep updated_at, so the backfill is not sent to dashboards as a change
+            conn.execute(
+                table.update().where(table.c.id == bindparam('row_id')).values(
+                    email_key=bindparam('new_email_key'), linkedin_key=bindparam('new_linkedin_key'),
+                    updated_at=table.c.updated_at),
+                updates
+            )
+    print(f"Added contact keys to {len(updates)} BD rows" + (f" ({duplicates} duplicate emails/LinkedIn URLs left unkeyed)" if duplicates else ""))
+
+def add_name_keys(engine):
+    """Add and backfill the name_key column of a bd_data table created without it"""
+    if 'name_key' in {column['name'] for column in inspect(engine).get_columns('bd_data')}:
+        return
+    table = BDData.__table__
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE bd_data ADD COLUMN name_key VARCHAR(511)"))
+        updates = [{'row_id': row.id, 'new_name_key': name_key(row.name, row.company)}
+                   for row in conn.execute(select(table.c.id, table.c.name, table.c.company))]
+        if updates:
+            # Keep updated_at, so the backfill is not sent to dashboards as a change
+            conn.execute(
+                table.update().where(table.c.id == bindparam('row_id')).values(
+                    name_key=bindparam('new_name_key'), updated_at=table.c.updated_at),
+                updates
+            )
+    print(f"Added name keys to {len(updates)} BD rows")
+
+def backfill_follow_ups(engine):
+    """Create follow-ups for BD rows with an action but none yet (e.g. rows from before the table existed)"""
+    bd, follow_ups = BDData.__table__, FollowUp.__table__
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(bd.c.id, bd.c.name, bd.c.company, bd.c.action)
+            .outerjoin(follow_ups, follow_ups.c.bd_id == bd.c.id)
+            .where(follow_ups.c.id.is_(None), bd.c.action.is_not(None), bd.c.action != '')
+        ).all()
+        if rows:
+            _write_follow_ups(conn, rows)
+            print(f"Parsed follow-ups for {len(rows)} BD rows")
+
 def get_session():
     """Get a database session"""
-    engine = create_engine('sqlite:///asymchem_bd.db', echo=False)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    get_engine()
+    return _Session()
 
 def populate_initial_data():
     """Populate the database with initial data"""
@@ -125,7 +289,8 @@ def populate_initial_data():
     ]
     
     for data in bd_data:
-        bd_record = BDData(**data)
+        bd_record = BDData(**data, **contact_keys(data['email'], data['linkedin']),
+                           name_key=name_key(data['name'], data['company']))
         session.add(bd_record)
     
     # Leadership Data
@@ -156,13 +321,17 @@ def populate_initial_data():
     
     session.commit()
     session.close()
+    backfill_follow_ups(get_engine())
 
 def get_market_data():
     """Get market data from database"""
     session = get_session()
     data = session.query(MarketData).all()
     session.close()
-    return pd.DataFrame([{
+    return pd.DataFrame([_market_record(d) for d in data], index=[d.id for d in data])
+
+def _market_record(d):
+    return {
         'company': d.company,
         'business_potential': d.business_potential,
         'tech_mapping': d.tech_mapping,
@@ -170,14 +339,17 @@ def get_market_data():
         'pain_point': d.pain_point,
         'focus': d.focus,
         'solution': d.solution
-    } for d in data])
+    }
 
 def get_bd_data():
     """Get BD data from database"""
     session = get_session()
     data = session.query(BDData).all()
     session.close()
-    return pd.DataFrame([{
+    return pd.DataFrame([_bd_record(d) for d in data], index=[d.id for d in data])
+
+def _bd_record(d):
+    return {
         'name': d.name,
         'company': d.company,
         'email': d.email,
@@ -185,32 +357,552 @@ def get_bd_data():
         'school': d.school,
         'connections': d.connections,
         'action': d.action
-    } for d in data])
+    }
+
+def _iter_query_chunks(columns, chunk_size):
+    """Stream rows of the given columns from the database in lists of chunk_size dicts"""
+    session = get_session()
+    try:
+        result = session.execute(select(*columns).execution_options(yield_per=chunk_size))
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+    finally:
+        session.close()
+
+def iter_market_data_chunks(chunk_size=1000):
+    """Stream market data from the database in chunks"""
+    return _iter_query_chunks([
+        MarketData.company, MarketData.business_potential, MarketData.tech_mapping, MarketData.market_value,
+        MarketData.pain_point, MarketData.focus, MarketData.solution
+    ], chunk_size)
+
+def iter_bd_data_chunks(chunk_size=1000):
+    """Stream BD data from the database in chunks"""
+    return _iter_query_chunks([
+        BDData.name, BDData.company, BDData.email, BDData.linkedin,
+        BDData.school, BDData.connections, BDData.action
+    ], chunk_size)
 
 def get_leadership_data():
     """Get leadership data from database"""
     session = get_session()
     data = session.query(LeadershipData).all()
     session.close()
-    return [{
+    return [_leadership_record(d) for d in data]
+
+def _leadership_record(d):
+    return {
         'name': d.name,
         'title': d.title,
         'key_connections': d.key_connections
-    } for d in data]
+    }
+
+# Tables covered by the data version and change feed, with their record builders
+SYNCED_TABLES = {
+    'market': (MarketData, _market_record),
+    'bd': (BDData, _bd_record),
+    'leadership': (LeadershipData, _leadership_record)
+}
+
+def get_data_version():
+    """
+    Get a version token for the synced tables
+
+    The token is the latest updated_at plus the sum of the highest row ids,
+    so an insert that commits with an older timestamp still changes it.
+    """
+    session = get_session()
+    try:
+        stats = [session.query(func.max(model.updated_at), func.max(model.id)).one() for model, _ in SYNCED_TABLES.values()]
+    finally:
+        session.close()
+    timestamps = [latest for latest, _ in stats if latest is not None]
+    latest = max(timestamps).isoformat() if timestamps else ''
+    return f"{latest}/{sum(max_id or 0 for _, max_id in stats)}"
+
+def parse_data_version(version):
+    """Get the updated_at timestamp of a version token (None for an empty token); raises ValueError if malformed"""
+    if not version:
+        return None
+    timestamp, _, watermark = version.partition('/')
+    int(watermark)
+    return datetime.fromisoformat(timestamp) if timestamp else None
+
+def get_changes_since(since=None):
+    """Get rows of the synced tables updated at or after since (all rows when since is None)"""
+    session = get_session()
+    changes = {}
+    try:
+        for name, (model, to_record) in SYNCED_TABLES.items():
+            query = session.query(model)
+            if since is not None:
+                query = query.filter(model.updated_at >= since)
+            changes[name] = [
+                dict(to_record(d), id=d.id, updated_at=d.updated_at)
+                for d in query.order_by(model.updated_at, model.id)
+            ]
+    finally:
+        session.close()
+    return changes
+
+# Full-text search indexes (SQLite FTS5): indexed columns, their bm25 weights and the columns shown with a match
+SEARCH_INDEXES = {
+    'bd': {
+        'table': 'bd_data', 'fts': 'bd_search',
+        'columns': ('name', 'company', 'school', 'connections', 'action'),
+        'weights': (10.0, 5.0, 2.0, 1.0, 1.0),
+        'display': ('name', 'company')
+    },
+    'market': {
+        'table': 'market_data', 'fts': 'market_search',
+        'columns': ('focus', 'solution'),
+        'weights': (2.0, 1.0),
+        'display': ('company', 'pain_point')
+    }
+}
+
+# Markers around matched terms in search snippets
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+def search_available():
+    """Whether full-text search is supported by the configured database (SQLite with FTS5)"""
+    return get_engine().dialect.name == 'sqlite'
+
+def create_search_indexes(engine):
+    """
+    Create the FTS5 tables over BD and market text, kept in sync by triggers
+
+    The tables index the existing rows when they are first created. Other
+    databases than SQLite are skipped.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.begin() as conn:
+        for index in SEARCH_INDEXES.values():
+            table, fts, columns = index['table'], index['fts'], ', '.join(index['columns'])
+            new_values = ', '.join(f"new.{column}" for column in index['columns'])
+            old_values = ', '.join(f"old.{column}" for column in index['columns'])
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': fts}).first()
+            if not exists:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                ))
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+
+def _match_query(query):
+    """
+    Turn search box input into an FTS5 query: words must all match, "quoted text"
+    must match as a phrase and the last word also matches as a prefix
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\w+)', query or ''):
+        words = re.findall(r'\w+', phrase) if phrase else [word]
+        if words:
+            terms.append('"' + ' '.join(words) + '"')
+    if not terms:
+        return None
+    if re.search(r'\w$', query.strip()):
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+def search_records(query, scope='bd', page=1, page_size=20):
+    """
+    Full-text search over contacts ('bd') or market data ('market'), ranked by bm25
+
+    Returns:
+        dict: total match count and the page of results (id, display columns and a
+              snippet with matched terms between HIGHLIGHT_START and HIGHLIGHT_END)
+    """
+    index = SEARCH_INDEXES[scope]
+    match = _match_query(query)
+    if match is None:
+        return {'total': 0, 'results': []}
+    
+    table, fts = index['table'], index['fts']
+    weights = ', '.join(str(weight) for weight in index['weights'])
+    display = ', '.join(f"{table}.{column}" for column in index['display'])
+    params = {'match': match, 'start': HIGHLIGHT_START, 'end': HIGHLIGHT_END,
+              'limit': page_size, 'offset': (max(page, 1) - 1) * page_size}
+    with get_engine().connect() as conn:
+        total = conn.execute(text(f"SELECT count(*) FROM {fts} WHERE {fts} MATCH :match"), params).scalar()
+        rows = conn.execute(text(
+            f"SELECT {fts}.rowid AS id, {display}, snippet({fts}, -1, :start, :end, '…', 16) AS snippet "
+            f"FROM {fts} JOIN {table} ON {table}.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :match ORDER BY bm25({fts}, {weights}) LIMIT :limit OFFSET :offset"
+        ), params).mappings().all()
+    return {'total': total, 'results': [dict(row) for row in rows]}
 
 def add_bd_person(name, company, email, linkedin, school, connections, action):
-    """Add a new BD person to the database"""
-    session = get_session()
-    new_person = BDData(
-        name=name,
-        company=company,
-        email=email or '',
-        linkedin=linkedin or '',
-        school=school or '',
-        connections=connections or '',
-        action=action or ''
-    )
-    session.add(new_person)
+    """Add a BD person to the database, or update them if their email or LinkedIn URL is already there"""
+    upsert_bd_people([{
+        'name': name,
+        'company': company,
+        'email': email,
+        'linkedin': linkedin,
+        'school': school,
+        'connections': connections,
+        'action': action
+    }])
+    return True
+
+def normalize_email(email):
+    """Trimmed, lowercased email (None if blank)"""
+    return (email or '').strip().lower() or None
+
+_LINKEDIN_PROFILE = re.compile(r'^(?:https?://)?(?:[a-z0-9-]+\.)?linkedin\.com/(in|pub|company)/([^/?#\s]+)')
+
+def normalize_linkedin(url):
+    """
+    LinkedIn URL without scheme, subdomain, query or trailing slash, e.g. linkedin.com/in/swkay (None if blank)
+    """
+    url = (url or '').strip().lower()
+    if not url:
+        return None
+    match = _LINKEDIN_PROFILE.match(url)
+    if match:
+        return f"linkedin.com/{match.group(1)}/{unquote(match.group(2))}"
+    return re.sub(r'^(?:https?://)?(?:www\.)?', '', url).split('#')[0].split('?')[0].rstrip('/') or None
+
+def contact_keys(email, linkedin):
+    """The email_key and linkedin_key column values for a contact"""
+    return {'email_key': normalize_email(email), 'linkedin_key': normalize_linkedin(linkedin)}
+
+def name_key(name, company):
+    """Casefolded name and company with whitespace collapsed, e.g. 'ana ruiz|moderna' (None if the name is blank)"""
+    name, company = (' '.join((value or '').split()).casefold() for value in (name, company))
+    return f"{name}|{company}" if name else None
+
+# Fields set from upserted contacts; blank values keep the stored ones
+UPSERT_COLUMNS = ('name', 'company', 'email', 'linkedin', 'school', 'connections', 'action')
+
+def upsert_bd_people(people):
+    """
+    Insert BD people, updating existing contacts with the same normalized email or LinkedIn URL
+    
+    People in the batch sharing either key are merged first, later non-blank
+    fields winning. Each contact is then looked up by both keys through their
+    unique indexes, so one first saved with only a LinkedIn URL is updated when
+    it comes back with an email. Matches are updated (blank fields keep their
+    stored values), the rest inserted, and follow-ups re-parsed from the
+    resulting actions, all in one transaction. People with neither key match
+    by normalized name and company instead: the first contact in the batch, or
+    else the oldest stored one, with that name at that company. Raises ValueError, leaving the database unchanged, if an
+    email and a LinkedIn URL given for one person belong to different contacts.
+    
+    Returns:
+        int: Number of contacts inserted or updated
+    """
+    contacts = _merge_contacts(people)
+    engine = get_engine()
+    for attempt in range(2):
+        try:
+            with engine.begin() as conn:
+                return _write_contacts(conn, contacts)
+        except IntegrityError as e:
+            # Another writer added one of the keys after it was looked up; look up again once
+            if attempt:
+                raise ValueError(f"Contact conflicts with an existing contact's email or LinkedIn URL: {e.orig}") from e
+
+def _merge_contact(contact, other):
+    """
+    Merge the fields of other (the later one) into a copy of contact
+    
+    The contacts are the same person by a shared key; two different emails
+    mean the shared LinkedIn URL is claimed by two people.
+    """
+    if contact['email_key'] and other['email_key'] and contact['email_key'] != other['email_key']:
+        raise ValueError(f"LinkedIn URL {other['linkedin'] or contact['linkedin']} is given for two different emails: "
+                         f"{contact['email']} and {other['email']}")
+    merged = dict(contact)
+    merged.update({column: value for column, value in other.items() if value})
+    return merged
+
+def _merge_contacts(people):
+    """
+    Normalize people into contact rows, merging those sharing an email or LinkedIn key (in input order)
+    
+    People with neither key merge into the first contact with their name_key.
+    """
+    contacts = {}
+    # Key value -> number of the contact holding it, for every key a merged contact has held
+    owners = {'email_key': {}, 'linkedin_key': {}, 'name_key': {}}
+    held = {}
+    for number, person in enumerate(people):
+        row = {column: person.get(column) or '' for column in UPSERT_COLUMNS}
+        row.update(contact_keys(row['email'], row['linkedin']), name_key=name_key(row['name'], row['company']))
+        match_on = ('email_key', 'linkedin_key') if row['email_key'] or row['linkedin_key'] else ('name_key',)
+        matched = sorted({owners[key][row[key]] for key in match_on if row[key] and row[key] in owners[key]})
+        target = matched[0] if matched else number
+        merged, keys = None, {(key, row[key]) for key in owners if row[key]}
+        for other in matched:
+            merged = contacts.pop(other) if merged is None else _merge_contact(merged, contacts.pop(other))
+            keys |= held.pop(other)
+        contacts[target] = row if merged is None else _merge_contact(merged, row)
+        held[target] = keys
+        for key, value in keys:
+            # A name stays with the first contact holding it
+            if key != 'name_key' or owners[key].get(value, target) in matched + [target]:
+                owners[key][value] = target
+    for contact in contacts.values():
+        contact['name_key'] = name_key(contact['name'], contact['company'])
+    return list(contacts.values())
+
+def _write_contacts(conn, contacts):
+    """
+    Update the stored contacts matching merged contacts by either key (or by name_key
+    if they have neither) and insert the rest
+    """
+    table = BDData.__table__
+    unkeyed = [contact for contact in contacts if not contact['email_key'] and not contact['linkedin_key']]
+    stored = {}
+    for key, lookup in (('email_key', contacts), ('linkedin_key', contacts), ('name_key', unkeyed)):
+        values = list({contact[key] for contact in lookup if contact[key]})
+        for start in range(0, len(values), 500):
+            for row in conn.execute(
+                select(table.c.id, table.c.email_key, table.c.linkedin_key, table.c.name_key,
+                       table.c.name, table.c.company, table.c.action)
+                .where(table.c[key].in_(values[start:start + 500])).order_by(table.c.id.desc())
+            ):
+                # Descending ids leave the oldest row sharing a name_key
+                stored[(key, getattr(row, key))] = row
+    
+    updates, inserts = {}, []
+    for contact in contacts:
+        match_on = ('email_key', 'linkedin_key') if contact['email_key'] or contact['linkedin_key'] else ('name_key',)
+        rows = {stored[(key, contact[key])].id: stored[(key, contact[key])]
+                for key in match_on if (key, contact[key]) in stored}
+        if len(rows) > 1:
+            raise ValueError(f"Email {contact['email']} and LinkedIn URL {contact['linkedin']} belong to different contacts")
+        if not rows:
+            inserts.append(contact)
+            continue
+        row_id, row = rows.popitem()
+        if contact['email_key'] and row.email_key and contact['email_key'] != row.email_key:
+            raise ValueError(f"LinkedIn URL {contact['linkedin']} belongs to a contact with a different email")
+        # Contacts matching the same stored row by different keys become one update
+        updates[row_id] = (_merge_contact(updates[row_id][0], contact) if row_id in updates else contact, row)
+    
+    now = datetime.utcnow()
+    affected = []
+    if updates:
+        conn.execute(
+            table.update().where(table.c.id == bindparam('row_id')).values(
+                {column: func.coalesce(func.nullif(bindparam(f"new_{column}"), ''), table.c[column])
+                 for column in UPSERT_COLUMNS + ('email_key', 'linkedin_key')}
+            ).values(name_key=bindparam('new_name_key'), updated_at=now),
+            [dict({f"new_{column}": contact[column] for column in UPSERT_COLUMNS + ('email_key', 'linkedin_key')},
+                  row_id=row_id, new_name_key=name_key(contact['name'] or row.name, contact['company'] or row.company))
+             for row_id, (contact, row) in updates.items()]
+        )
+        affected.extend(
+            (row_id, contact['name'] or row.name, contact['company'] or row.company, contact['action'] or row.action)
+            for row_id, (contact, row) in updates.items()
+        )
+    if inserts:
+        ids = conn.execute(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True),
+            [dict(contact, created_at=now, updated_at=now) for contact in inserts]
+        ).scalars().all()
+        affected.extend((row_id, contact['name'], contact['company'], contact['action'])
+                        for row_id, contact in zip(ids, inserts))
+    _write_follow_ups(conn, affected)
+    return len(updates) + len(inserts)
+
+def _write_follow_ups(conn, rows):
+    """
+    Replace the follow-ups of BD rows, given as (id, name, company, action), with ones parsed from their actions
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    follow_ups = FollowUp.__table__
+    ids = [row[0] for row in rows]
+    for start in range(0, len(ids), 500):
+        conn.execute(follow_ups.delete().where(follow_ups.c.bd_id.in_(ids[start:start + 500])))
+    now = datetime.utcnow()
+    records = []
+    for bd_id, name, company, action in rows:
+        parsed = parse_action(action)
+        if parsed:
+            records.append(dict(parsed, bd_id=bd_id, name=name, company=company, created_at=now, updated_at=now))
+    if records:
+        conn.execute(follow_ups.insert(), records)
+
+def get_follow_ups(days=7, limit=20, today=None):
+    """
+    Get follow-ups due within the next days (from today) and overdue ones
+    
+    Each list is a range scan on the due_date index, soonest (upcoming) or
+    most recently due (overdue) first, capped at limit.
+    
+    Returns:
+        dict: 'upcoming' and 'overdue' lists of follow-up dicts, with their full counts
+              in 'upcoming_total' and 'overdue_total'
+    """
+    today = today or datetime.now().date()
+    end = today + timedelta(days=days)
+    session = get_session()
+    try:
+        upcoming = FollowUp.due_date.between(today, end)
+        overdue = FollowUp.due_date < today
+        result = {
+            'upcoming': session.query(FollowUp).filter(upcoming).order_by(FollowUp.due_date, FollowUp.id).limit(limit).all(),
+            'overdue': session.query(FollowUp).filter(overdue).order_by(FollowUp.due_date.desc(), FollowUp.id).limit(limit).all(),
+            'upcoming_total': session.query(func.count(FollowUp.id)).filter(upcoming).scalar(),
+            'overdue_total': session.query(func.count(FollowUp.id)).filter(overdue).scalar()
+        }
+    finally:
+        session.close()
+    for group in ('upcoming', 'overdue'):
+        result[group] = [{
+            'bd_id': f.bd_id,
+            'name': f.name,
+            'company': f.company,
+            'due_date': f.due_date,
+            'channel': f.channel,
+            'owner': f.owner,
+            'summary': f.summary
+        } for f in result[group]]
+    return result
+
+def get_bd_contacts():
+    """Get BD contacts (with ids) for batch processing"""
+    session = get_session()
+    data = session.query(BDData).order_by(BDData.id).all()
+    session.close()
+    return [{
+        'id': d.id,
+        'name': d.name,
+        'company': d.company,
+        'email': d.email,
+        'linkedin': d.linkedin,
+        'school': d.school,
+        'connections': d.connections,
+        'action': d.action
+    } for d in data]
+
+def get_campaign_checkpoint(campaign_id):
+    """Get the BD ids that already have a generated pitch in a campaign"""
+    session = get_session()
+    rows = session.query(CampaignPitch.bd_id).filter(
+        CampaignPitch.campaign_id == campaign_id,
+        CampaignPitch.status == 'generated'
+    ).all()
+    session.close()
+    return {row.bd_id for row in rows}
+
+def save_campaign_pitch(campaign_id, bd_id, name, company, status, pitch, attempts, error=None):
+    """Insert or replace a campaign pitch result"""
+    session = get_session()
+    record = session.query(CampaignPitch).filter_by(campaign_id=campaign_id, bd_id=bd_id).first()
+    if record is None:
+        record = CampaignPitch(campaign_id=campaign_id, bd_id=bd_id)
+        session.add(record)
+    record.name = name
+    record.company = company
+    record.status = status
+    record.pitch = pitch
+    record.attempts = attempts
+    record.error = error
     session.commit()
     session.close()
-    return True
+
+def get_campaign_pitches(campaign_id):
+    """Get all pitch results for a campaign"""
+    session = get_session()
+    data = session.query(CampaignPitch).filter_by(campaign_id=campaign_id).order_by(CampaignPitch.bd_id).all()
+    session.close()
+    return pd.DataFrame([{
+        'name': d.name,
+        'company': d.company,
+        'status': d.status,
+        'attempts': d.attempts,
+        'error': d.error,
+        'pitch': d.pitch,
+        'updated_at': d.updated_at
+    } for d in data], columns=['name', 'company', 'status', 'attempts', 'error', 'pitch', 'updated_at'])
+
+def save_company_fits(results, backend=None):
+    """Insert or update fit analysis results, keyed by company"""
+    session = get_session()
+    existing = {
+        record.company: record
+        for record in session.query(CompanyFit).filter(CompanyFit.company.in_(list(results))).all()
+    }
+    for company, analysis in results.items():
+        record = existing.get(company)
+        if record is None:
+            record = CompanyFit(company=company)
+            session.add(record)
+        record.fit_score = analysis['fit_score']
+        record.opportunity = analysis['opportunity']
+        record.approach = analysis['approach']
+        record.backend = backend
+    session.commit()
+    session.close()
+
+def get_company_fits():
+    """Get stored fit analysis results, best fit first"""
+    session = get_session()
+    data = session.query(CompanyFit).order_by(CompanyFit.fit_score.desc()).all()
+    session.close()
+    return pd.DataFrame([{
+        'company': d.company,
+        'fit_score': d.fit_score,
+        'opportunity': d.opportunity,
+        'approach': d.approach,
+        'updated_at': d.updated_at.strftime('%Y-%m-%d %H:%M') if d.updated_at else ''
+    } for d in data], columns=['company', 'fit_score', 'opportunity', 'approach', 'updated_at'])
+
+def get_connection_insight_hashes():
+    """Get the connections hash each stored insight was generated from, keyed by BD id"""
+    session = get_session()
+    rows = session.query(ConnectionInsight.bd_id, ConnectionInsight.connections_hash).all()
+    session.close()
+    return {row.bd_id: row.connections_hash for row in rows}
+
+def save_connection_insight(bd_id, connections_hash, insight, backend=None):
+    """Insert or replace the stored insight for a BD contact"""
+    session = get_session()
+    record = session.query(ConnectionInsight).filter_by(bd_id=bd_id).first()
+    if record is None:
+        record = ConnectionInsight(bd_id=bd_id)
+        session.add(record)
+    record.connections_hash = connections_hash
+    record.insight = insight
+    record.backend = backend
+    session.commit()
+    session.close()
+
+def delete_connection_insights(bd_ids):
+    """Remove stored insights for the given BD ids"""
+    if not bd_ids:
+        return
+    session = get_session()
+    session.query(ConnectionInsight).filter(ConnectionInsight.bd_id.in_(list(bd_ids))).delete(synchronize_session=False)
+    session.commit()
+    session.close()
+
+def get_connection_insights_for_company(company):
+    """Get stored connection insights for the BD contacts at a company"""
+    session = get_session()
+    rows = session.query(BDData.name, ConnectionInsight.insight, ConnectionInsight.updated_at).join(
+        ConnectionInsight, ConnectionInsight.bd_id == BDData.id
+    ).filter(BDData.company == company).order_by(BDData.name).all()
+    session.close()
+    return [{'name': row.name, 'insight': row.insight, 'updated_at': row.updated_at} for row in rows]
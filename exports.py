@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from flask import Response, abort, request, stream_with_context
+
+from database import iter_market_data_chunks, iter_bd_data_chunks
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+MARKET_COLUMNS = [
+    ('company', 'string'), ('business_potential', 'float'), ('tech_mapping', 'float'), ('market_value', 'float'),
+    ('pain_point', 'string'), ('focus', 'string'), ('solution', 'string')
+]
+
+BD_COLUMNS = [
+    ('name', 'string'), ('company', 'string'), ('email', 'string'), ('linkedin', 'string'),
+    ('school', 'string'), ('connections', 'string'), ('action', 'string')
+]
+
+# dataset name -> (column specs, function returning an iterator of row chunks)
+export_datasets: Dict[str, Tuple[List[Tuple[str, str]], Callable[[int], Iterable[List[Dict]]]]] = {
+    'market': (MARKET_COLUMNS, iter_market_data_chunks),
+    'bd': (BD_COLUMNS, iter_bd_data_chunks)
+}
+
+
+def register_static_dataset(name: str, columns: List[Tuple[str, str]], rows: List[Dict]):
+    """
+    Make an in-memory dataset (e.g. the competitor table) available for export
+    """
+    def chunks(chunk_size):
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    export_datasets[name] = (columns, chunks)
+
+
+def iter_csv(columns: List[Tuple[str, str]], chunks: Iterable[List[Dict]]) -> Iterator[str]:
+    """
+    Encode row chunks as CSV, yielding one piece of text per chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[name for name, _ in columns], extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+def iter_jsonl(columns: List[Tuple[str, str]], chunks: Iterable[List[Dict]]) -> Iterator[str]:
+    """
+    Encode row chunks as JSON Lines
+    """
+    names = [name for name, _ in columns]
+    for chunk in chunks:
+        yield ''.join(json.dumps({name: row.get(name) for name in names}, default=str) + '\n' for row in chunk)
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file object that hands back what was written since the last drain,
+    while reporting the total position so Parquet footer offsets stay correct
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_parquet(columns: List[Tuple[str, str]], chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """
+    Encode row chunks as Parquet, one row group per chunk
+
+    Requires pyarrow, which is an optional dependency.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {'string': pa.string(), 'float': pa.float64(), 'int': pa.int64()}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_export(dataset: str, fmt: str, chunk_size: int = 1000) -> Iterator:
+    """
+    Stream a dataset in the given format without materializing it in memory
+    """
+    columns, chunk_source = export_datasets[dataset]
+    encoders = {'csv': iter_csv, 'jsonl': iter_jsonl, 'parquet': iter_parquet}
+    return encoders[fmt](columns, chunk_source(chunk_size))
+
+
+def register_export_routes(server):
+    """
+    Register /export/<dataset>.<format> on the Flask server
+    """
+
+    @server.route('/export/<dataset>.<fmt>')
+    def export_dataset(dataset, fmt):
+        if dataset not in export_datasets or fmt not in EXPORT_FORMATS:
+            abort(404)
+
+        if fmt == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                return Response("Parquet export requires pyarrow (pip install pyarrow).", status=501)
+
+        chunk_size = min(max(request.args.get('chunk_size', 1000, type=int), 1), 50000)
+        return Response(
+            stream_with_context(stream_export(dataset, fmt, chunk_size)),
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename={dataset}.{fmt}'}
+        )
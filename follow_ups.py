@@ -0,0 +1,89 @@
+import re
+from datetime import date, datetime
+from typing import Dict, Optional
+
+# Channel keywords; the one appearing first in an action wins
+CHANNELS = {
+    'email': ('email', 'e-mail'),
+    'call': ('call', 'phone'),
+    'meeting': ('meet', 'meeting', 'coffee', 'lunch', 'dinner', 'visit'),
+    'linkedin': ('linkedin', 'inmail'),
+    'event': ('cphi', 'bio 20', 'conference', 'summit', 'expo')
+}
+_CHANNEL_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(word) for words in CHANNELS.values() for word in words) + r')', re.IGNORECASE
+)
+_CHANNEL_OF = {word: channel for channel, words in CHANNELS.items() for word in words}
+
+_MONTHS = {month: number for number, month in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+# "Sep 10, 2025", "September 10 2025", "Sep 10" or "2025-09-10"
+_DATE_PATTERN = re.compile(
+    r'\b(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.? (?P<day>\d{1,2})(?:st|nd|rd|th)?'
+    r'(?:,? (?P<year>\d{4}))?\b|\b(?P<iso>\d{4}-\d{2}-\d{2})\b',
+    re.IGNORECASE
+)
+# "Becky meets at CPHI, ..." - a team member leading the action
+_OWNER_PATTERN = re.compile(r"^(?P<owner>[A-Z][\w.'-]*(?: [A-Z][\w.'-]*)?) (?:meets?|calls?|emails?|messages?|visits?|follows? up|pitch(?:es)?)\b")
+
+
+def parse_due_date(action: str, today: Optional[date] = None) -> Optional[date]:
+    """
+    The first date mentioned in an action; a date without a year gets the year putting it nearest to today
+    """
+    match = _DATE_PATTERN.search(action or '')
+    if not match:
+        return None
+    try:
+        if match.group('iso'):
+            return date.fromisoformat(match.group('iso'))
+        month, day = _MONTHS[match.group('month').lower()[:3]], int(match.group('day'))
+        if match.group('year'):
+            return date(int(match.group('year')), month, day)
+        today = today or date.today()
+        candidates = []
+        for year in (today.year - 1, today.year, today.year + 1):
+            try:
+                candidates.append(date(year, month, day))
+            except ValueError:
+                pass
+        return min(candidates, key=lambda candidate: abs(candidate - today)) if candidates else None
+    except ValueError:
+        return None
+
+
+def parse_action(action: str, today: Optional[date] = None) -> Optional[Dict]:
+    """
+    Parse a free-text BD action such as "Email Sep 10, 2025: Pitch biocatalysis"
+
+    Returns:
+        dict: due_date (or None), channel (email, call, meeting, linkedin, event or None),
+              owner (the team member leading the action, or None) and summary;
+              None for a blank action
+    """
+    action = (action or '').strip()
+    if not action:
+        return None
+    channel = _CHANNEL_PATTERN.search(action)
+    owner = _OWNER_PATTERN.match(action)
+    # "Email Sep 10, 2025: Pitch ..." - the text after a dated prefix is the summary
+    prefix, colon, rest = action.partition(':')
+    summary = rest.strip() if colon and _DATE_PATTERN.search(prefix) and rest.strip() else action
+    return {
+        'due_date': parse_due_date(action, today),
+        'channel': _CHANNEL_OF[channel.group(1).lower()] if channel else None,
+        'owner': owner.group('owner') if owner and owner.group('owner').split()[0].lower() not in _CHANNEL_OF else None,
+        'summary': summary
+    }
+
+
+def format_due(due_date: date, today: Optional[date] = None) -> str:
+    """
+    Describe a due date relative to today, e.g. "today", "in 3 days" or "12 days overdue"
+    """
+    days = (due_date - (today or datetime.now().date())).days
+    if days == 0:
+        return 'today'
+    if days > 0:
+        return 'tomorrow' if days == 1 else f"in {days} days"
+    return '1 day overdue' if days == -1 else f"{-days} days overdue"
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Protocol
+
+
+class LLMBackend(Protocol):
+    """
+    Interface every text-generation backend implements
+    """
+
+    name: str
+
+    def available(self) -> bool:
+        """Whether the backend is configured and can be called"""
+
+    def generate(self, prompt: str) -> str:
+        """Return the full response text for a prompt"""
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response text in chunks as it is produced"""
+
+    def batch(self, prompts: List[str]) -> List[str]:
+        """Return one response per prompt, in order"""
+
+
+class GeminiBackend:
+    """
+    Google Gemini backend; the SDK is imported and the model created on first use
+    """
+
+    name = 'gemini'
+
+    def __init__(self, api_key: Optional[str], model_name: str = 'gemini-pro'):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def generate(self, prompt: str) -> str:
+        return self._get_model().generate_content(prompt).text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self._get_model().generate_content(prompt, stream=True):
+            yield chunk.text
+
+    def batch(self, prompts: List[str]) -> List[str]:
+        return [self.generate(prompt) for prompt in prompts]
+
+
+class LocalBackendError(RuntimeError):
+    """Failure injected by the local backend"""
+
+
+class LocalBackend:
+    """
+    Deterministic offline backend for benchmarks, load tests and development
+
+    The same prompt always produces the same text. Latency and failures are
+    configurable; failures are drawn from a seeded generator so runs repeat.
+    A responder callable can replace the default text, e.g. to return JSON.
+    """
+
+    name = 'local'
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, failure_rate: float = 0.0, seed: int = 0,
+                 responder: Optional[Callable[[str], str]] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.responder = responder
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return True
+
+    def _draw(self):
+        with self._lock:
+            return self._random.random(), self._random.random()
+
+    def _respond(self, prompt: str) -> str:
+        if self.responder is not None:
+            return self.responder(prompt)
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+        summary = re.sub(r'\s+', ' ', prompt).strip()[:200]
+        return f"[local model {digest}]\n\n{summary}"
+
+    def generate(self, prompt: str) -> str:
+        failure_draw, jitter_draw = self._draw()
+        time.sleep(max(0.0, self.latency + (jitter_draw * 2 - 1) * self.jitter))
+        if failure_draw < self.failure_rate:
+            raise LocalBackendError("Injected local backend failure")
+        return self._respond(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        text = self.generate(prompt)
+        for word in re.findall(r'\S+\s*', text):
+            yield word
+
+    def batch(self, prompts: List[str]) -> List[str]:
+        return [self.generate(prompt) for prompt in prompts]
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Create the backend named by name or the LLM_BACKEND environment variable
+    """
+    name = (name or os.getenv('LLM_BACKEND') or 'gemini').lower()
+    if name == 'gemini':
+        return GeminiBackend(os.getenv('GOOGLE_API_KEY'))
+    if name == 'local':
+        return LocalBackend(
+            latency=float(os.getenv('LOCAL_LLM_LATENCY_MS', '50')) / 1000,
+            jitter=float(os.getenv('LOCAL_LLM_JITTER_MS', '0')) / 1000,
+            failure_rate=float(os.getenv('LOCAL_LLM_FAILURE_RATE', '0')),
+            seed=int(os.getenv('LOCAL_LLM_SEED', '0'))
+        )
+    raise ValueError(f"Unknown LLM_BACKEND {name!r} (expected 'gemini' or 'local')")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> LLMBackend:
+    """
+    Get the process-wide backend, creating it from the environment on first use
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend: Optional[LLMBackend]):
+    """
+    Replace the process-wide backend; None re-reads the environment on next use
+    """
+    global _backend
+    _backend = backend
@@ -0,0 +1,220 @@
+import functools
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import dash
+from dash.exceptions import PreventUpdate
+from flask import Response, g, has_request_context
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple, float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}')
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative histogram with optional labels, in Prometheus bucket layout
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self.values: Dict[Tuple, List] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            for key, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, (('le', _format_number(bound)),))
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f'{self.name}_sum{labels} {_format_number(total)}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    """
+    Collection of metrics rendered together in Prometheus text format
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+callback_duration = REGISTRY.register(Histogram(
+    'dash_callback_duration_seconds', 'Time spent running a Dash callback.', ['callback']))
+callback_errors = REGISTRY.register(Counter(
+    'dash_callback_errors_total', 'Dash callbacks that raised an exception.', ['callback']))
+callback_response_bytes = REGISTRY.register(Histogram(
+    'dash_callback_response_bytes', 'Size of the serialized Dash callback response.', ['callback'], SIZE_BUCKETS))
+callback_sql_queries = REGISTRY.register(Histogram(
+    'dash_callback_sql_queries', 'SQL statements executed per Dash callback.', ['callback'], COUNT_BUCKETS))
+sql_query_duration = REGISTRY.register(Histogram(
+    'sql_query_duration_seconds', 'SQL statement execution time.', ['statement']))
+llm_request_duration = REGISTRY.register(Histogram(
+    'llm_request_duration_seconds', 'Time spent in AI model calls, including fallbacks.', ['function']))
+llm_requests = REGISTRY.register(Counter(
+    'llm_requests_total', 'AI requests by outcome (ai, fallback, error or circuit_open).', ['function', 'outcome']))
+cache_requests = REGISTRY.register(Counter(
+    'cache_requests_total', 'Cache lookups by result (hit or miss).', ['cache', 'result']))
+
+# Per-thread SQL statement count, used to attribute queries to callbacks
+_sql_state = threading.local()
+
+
+def _sql_count() -> int:
+    return getattr(_sql_state, 'count', 0)
+
+
+def instrumented_callback(*args, **kwargs):
+    """
+    Drop-in replacement for dash.callback that records latency, errors,
+    response size and SQL statement count per callback
+    """
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*func_args, **func_kwargs):
+            if has_request_context():
+                g.metrics_callback = name
+            queries_before = _sql_count()
+            started = time.perf_counter()
+            try:
+                return func(*func_args, **func_kwargs)
+            except PreventUpdate:
+                raise
+            except Exception:
+                callback_errors.inc(callback=name)
+                raise
+            finally:
+                callback_duration.observe(time.perf_counter() - started, callback=name)
+                callback_sql_queries.observe(_sql_count() - queries_before, callback=name)
+
+        return dash.callback(*args, **kwargs)(wrapper)
+
+    return decorator
+
+
+_sqlalchemy_instrumented = False
+
+
+def instrument_sqlalchemy():
+    """
+    Record the count and duration of every SQL statement executed by any engine
+    """
+    global _sqlalchemy_instrumented
+    if _sqlalchemy_instrumented:
+        return
+    _sqlalchemy_instrumented = True
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['metrics_query_start'].pop()
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'UNKNOWN'
+        sql_query_duration.observe(time.perf_counter() - started, statement=verb)
+        _sql_state.count = _sql_count() + 1
+
+
+def register_metrics_route(server):
+    """
+    Expose /metrics on the Flask server and record callback response sizes
+
+    Metrics are kept per process; with several gunicorn workers each worker
+    reports its own values.
+    """
+    instrument_sqlalchemy()
+
+    @server.after_request
+    def record_response_size(response):
+        name = g.pop('metrics_callback', None)
+        if name and not response.is_streamed:
+            callback_response_bytes.observe(response.calculate_content_length() or 0, callback=name)
+        return response
+
+    @server.route('/metrics')
+    def metrics():
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
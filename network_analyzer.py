@@ -1,16 +1,95 @@
 import re
-from typing import List, Dict, Tuple, Set
+import sys
+import threading
+from collections import deque
+from typing import List, Dict, NamedTuple, Optional, Tuple, Set
+import numpy as np
 import pandas as pd
 
+from profiling import profiled
+
+
+class Person(NamedTuple):
+    """
+    A node in the network; company is None for Asymchem leadership
+    """
+    name: str
+    title: str = ''
+    company: Optional[str] = None
+
+
+class Connection(NamedTuple):
+    """
+    One parsed "Person: detail" entry
+    """
+    person: str
+    detail: str
+    type: str
+
+
+# Bit per relationship type in an edge's type_mask
+TYPE_BITS = {'alumni': 1, 'work': 2, 'event': 4, 'network': 8, 'other': 16}
+# Type names for every mask, shared by the edges that have it
+_MASK_TYPES = tuple(
+    tuple(conn_type for conn_type, bit in TYPE_BITS.items() if mask & bit) for mask in range(2 ** len(TYPE_BITS))
+)
+
+
+def _intern(value):
+    """
+    Intern names, companies and details, which repeat across thousands of connections
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class NetworkAnalyzer:
     """
     Improved network analyzer with precise connection matching
+    
+    Every pair of connected people is one weighted edge carrying all of the
+    relationship types and details mentioned by either side. Network
+    statistics are maintained incrementally as people are added, so reading
+    them does not depend on the size of the graph.
     """
     
+    # Number of most-connected people kept ranked for find_central_people
+    TOP_CENTRAL_SIZE = 10
+    
     def __init__(self):
         self.person_names = set()
         self.connection_map = {}
         self.edge_data = []
+        self._lock = threading.RLock()
+        self._reset_counters()
+    
+    def _reset_counters(self):
+        """
+        Clear the aggregates maintained by add_person
+        """
+        self.people = {}
+        self.total_connections = 0
+        # Connected pairs per relationship type, and distinct connected people per person
+        self.connection_types = {}
+        self.degree = {}
+        # Mentions of names not (yet) in the network: target -> [(source, connection)]
+        self.pending_references = {}
+        self._top_central = []
+        # Connections behind each edge (from either side), keyed by the sorted pair of names
+        self._pair_mentions = {}
+        # Element caches: edges by pair in creation order and node elements keyed
+        # by name with the connection count and scale they were built for
+        self._edges = {}
+        self._node_cache = {}
+        # Indexes for filtered views: edges per relationship type and per person, people per company and role
+        self._edges_by_type = {}
+        self._edges_by_person = {}
+        self._company_people = {}
+        self._role_people = {'leader': set(), 'bd_person': set()}
+    
+    @property
+    def valid_connections(self) -> int:
+        """Number of connected pairs"""
+        return len(self._edges)
     
     def extract_person_names(self, all_people: List[Dict]) -> Set[str]:
         """
@@ -21,7 +100,7 @@ class NetworkAnalyzer:
             names.add(person['name'])
         return names
     
-    def parse_connections(self, connections_text: str) -> List[Dict]:
+    def parse_connections(self, connections_text: str) -> List[Connection]:
         """
         Parse connection text into structured data
         Format: "Person1: Detail1; Person2: Detail2"
@@ -39,11 +118,7 @@ class NetworkAnalyzer:
                 if len(person_detail) == 2:
                     person_name = person_detail[0].strip()
                     detail = person_detail[1].strip()
-                    connections.append({
-                        'person': person_name,
-                        'detail': detail,
-                        'type': self._classify_connection(detail)
-                    })
+                    connections.append(Connection(_intern(person_name), _intern(detail), self._classify_connection(detail)))
         
         return connections
     
@@ -64,199 +139,560 @@ class NetworkAnalyzer:
         else:
             return 'other'
     
+    @profiled
     def create_precise_network_elements(self, bd_data: pd.DataFrame, leadership_data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
         """
         Create network elements with precise connection matching
         """
-        # Combine all people
-        all_people = leadership_data + bd_data.to_dict('records')
+        with self._lock:
+            self.person_names = set()
+            self.connection_map = {}
+            self._reset_counters()
+            
+            for person in leadership_data:
+                self._index_person(*self._to_person(person), track_edges=False)
+            columns = [bd_data[column] if column in bd_data else [None] * len(bd_data) for column in ('name', 'company', 'connections')]
+            for name, company, connections_text in zip(*columns):
+                self._index_person(Person(_intern(name), '', _intern(company)), connections_text or '', track_edges=False)
+            self._create_edges()
+            
+            return self.build_elements()
+    
+    def add_person(self, person: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Add one person to the network, updating the statistics incrementally
         
-        # Extract all person names
-        self.person_names = self.extract_person_names(all_people)
+        Only the new person's connections are parsed; references to them from
+        people already in the network are resolved by name.
+        """
+        return self.add_people([person])
+    
+    @profiled
+    def add_people(self, people: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Add or replace several people, building the elements once at the end
+        """
+        with self._lock:
+            for person in people:
+                self._index_person(*self._to_person(person))
+            return self.build_elements()
+    
+    def remove_people(self, names: Set[str]):
+        """
+        Remove people (e.g. the old names of renamed contacts) with their nodes and edges
         
-        # Build connection map
-        self.connection_map = {}
-        connection_counts = {}
+        Other people's mentions of a removed name wait in pending_references,
+        so the edges come back if the name is added again.
+        """
+        with self._lock:
+            for person_name in names:
+                if person_name not in self.people:
+                    continue
+                self._unindex_person(person_name)
+                for pair in list(self._edges_by_person.get(person_name, {})):
+                    source = pair[1] if pair[0] == person_name else pair[0]
+                    self._node_cache.pop(source, None)
+                    for conn in self._pair_mentions[pair]:
+                        self.pending_references.setdefault(person_name, []).append((source, conn))
+                    self._set_edge(pair, ())
+                del self.people[person_name]
+                self.person_names.discard(person_name)
+                self.degree.pop(person_name, None)
+                self._edges_by_person.pop(person_name, None)
+            self._rank_central()
+    
+    def get_edges_for(self, names: Set[str]) -> List[Dict]:
+        """
+        Get the edges that start or end at any of the given people
+        """
+        with self._lock:
+            edges = {pair: edge for name in names for pair, edge in self._edges_by_person.get(name, {}).items()}
+            return list(edges.values())
+    
+    def get_companies(self) -> List[str]:
+        """
+        Get the companies with people in the network
+        """
+        with self._lock:
+            return sorted(company for company, names in self._company_people.items() if names)
+    
+    @profiled
+    def get_filtered_elements(self, connection_type: Optional[str] = None, company: Optional[str] = None,
+                              role: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Create the subgraph matching the given filters from the precomputed indexes
         
-        for person in all_people:
-            person_name = person['name']
-            connections_text = person.get('connections') or person.get('key_connections', '')
+        Args:
+            connection_type (str): Keep only edges that include this type ('alumni', 'work', ...)
+            company (str): Keep the people at this company and the people they are connected to
+            role (str): Keep only 'leader' or 'bd_person' nodes
+        
+        Returns:
+            tuple: (nodes, edges); node sizes stay on the full-network scale
+        """
+        with self._lock:
+            type_bit = TYPE_BITS.get(connection_type, 0)
+            if company:
+                members = self._company_people.get(company, set())
+                edges = [edge for edge in self.get_edges_for(members)
+                         if not connection_type or edge['data']['type_mask'] & type_bit]
+                names = set(members)
+            elif role and (not connection_type or
+                           len(self._role_people[role]) < len(self._edges_by_type.get(connection_type, {}))):
+                # Start from the people of the role when there are fewer of them than typed edges
+                names = set(self._role_people[role])
+                edges = self.get_edges_for(names)
+                if connection_type:
+                    edges = [edge for edge in edges if edge['data']['type_mask'] & type_bit]
+                    names = set()
+            elif connection_type:
+                edges = self._edges_by_type.get(connection_type, {}).values()
+                names = set()
+            else:
+                edges = self._edges.values()
+                names = set()
             
-            if connections_text:
-                parsed_connections = self.parse_connections(connections_text)
-                self.connection_map[person_name] = parsed_connections
-                
-                # Count valid connections (only to people in our dataset)
-                valid_connections = [
-                    conn for conn in parsed_connections 
-                    if conn['person'] in self.person_names
+            if role:
+                names = {name for name in names if self._node_class(self.people[name]) == role}
+                edges = [
+                    edge for edge in edges
+                    if self._node_class(self.people[edge['data']['source']]) == role
+                    and self._node_class(self.people[edge['data']['target']]) == role
                 ]
-                connection_counts[person_name] = len(valid_connections)
+            
+            for edge in edges:
+                names.add(edge['data']['source'])
+                names.add(edge['data']['target'])
+            
+            max_connections = max(self.degree.values(), default=1)
+            people = [self.people[name] for name in names]
+            return self._create_nodes(people, self.degree, max_connections), list(edges)
+    
+    @profiled
+    def get_ego_elements(self, person_name: str, hops: int = 2, max_nodes: int = 200) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Create the k-hop neighborhood of one person with a bounded breadth-first search
+        
+        Args:
+            person_name (str): Center of the ego network
+            hops (int): Maximum distance from the center
+            max_nodes (int): Stop adding people once this many are included
+        
+        Returns:
+            tuple: (nodes, edges) with node sizes scaled by degree inside the ego network
+        """
+        with self._lock:
+            if person_name not in self.people:
+                return [], []
+            
+            depth = {person_name: 0}
+            queue = deque([person_name])
+            while queue and len(depth) < max_nodes:
+                name = queue.popleft()
+                if depth[name] >= hops:
+                    continue
+                for pair in self._edges_by_person.get(name, {}):
+                    neighbor = pair[1] if pair[0] == name else pair[0]
+                    if neighbor not in depth:
+                        depth[neighbor] = depth[name] + 1
+                        queue.append(neighbor)
+                        if len(depth) >= max_nodes:
+                            break
+            
+            edges = {}
+            local_counts = dict.fromkeys(depth, 0)
+            for name in depth:
+                for pair, edge in self._edges_by_person.get(name, {}).items():
+                    if pair[0] in depth and pair[1] in depth and pair not in edges:
+                        edges[pair] = edge
+                        local_counts[pair[0]] += 1
+                        local_counts[pair[1]] += 1
+            
+            nodes = self._create_nodes([self.people[name] for name in depth], self.degree,
+                                       size_counts=local_counts)
+            nodes[0] = dict(nodes[0], classes=nodes[0]['classes'] + ' ego_center')
+            return nodes, list(edges.values())
+    
+    def build_elements(self) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Create nodes and edges from the current network without reparsing connections
+        """
+        with self._lock:
+            nodes = self._create_nodes(list(self.people.values()), self.degree)
+            return nodes, list(self._edges.values())
+    
+    @staticmethod
+    def _to_person(record: Dict) -> Tuple[Person, str]:
+        """
+        Convert a database record (BD or leadership dict) to a Person and its connections text
+        """
+        connections_text = record.get('connections') or record.get('key_connections') or ''
+        person = Person(_intern(record['name']), record.get('title') or '', _intern(record.get('company')))
+        return person, connections_text
+    
+    def _index_person(self, person: Person, connections_text: str, track_edges: bool = True):
+        """
+        Add a person's connections to the connection map and the aggregates
+        
+        With track_edges the edges and their counters are updated as well; a
+        full build creates all edges at the end instead.
+        """
+        person_name = person.name
+        if person_name in self.people:
+            self._unindex_person(person_name)
+        
+        self.people[person_name] = person
+        self.person_names.add(person_name)
+        self.degree.setdefault(person_name, 0)
+        self._company_people.setdefault(self._company_of(person), set()).add(person_name)
+        self._role_people[self._node_class(person)].add(person_name)
+        
+        # Mentions that were waiting for this name become edges
+        for source, conn in self.pending_references.pop(person_name, []):
+            # The source's tooltip now lists this person
+            self._node_cache.pop(source, None)
+            if track_edges:
+                self._add_mention(source, conn)
+        
+        if not connections_text:
+            return
+        
+        parsed_connections = self.parse_connections(connections_text)
+        self.connection_map[person_name] = parsed_connections
+        self.total_connections += len(parsed_connections)
+        
+        for conn in parsed_connections:
+            if conn.person in self.person_names:
+                if track_edges:
+                    self._add_mention(person_name, conn)
             else:
-                connection_counts[person_name] = 0
+                self.pending_references.setdefault(conn.person, []).append((person_name, conn))
+    
+    def _unindex_person(self, person_name: str):
+        """
+        Remove a person's own connections from the aggregates (used when a name is re-added)
+        
+        Mentions of this name by other people stay, since the name is added
+        back straight away.
+        """
+        for conn in self.connection_map.pop(person_name, []):
+            self.total_connections -= 1
+            target = conn.person
+            if target not in self.person_names:
+                remaining = [mention for mention in self.pending_references[target] if mention[1] is not conn]
+                if remaining:
+                    self.pending_references[target] = remaining
+                else:
+                    del self.pending_references[target]
+            elif target != person_name and self._pair(person_name, target) in self._pair_mentions:
+                # During a full build edges are only created at the end
+                pair = self._pair(person_name, target)
+                self._set_edge(pair, tuple(mention for mention in self._pair_mentions[pair] if mention is not conn))
+        
+        self._node_cache.pop(person_name, None)
+        self._company_people[self._company_of(self.people[person_name])].discard(person_name)
+        self._role_people[self._node_class(self.people[person_name])].discard(person_name)
+        
+        # Degrees can drop here, so rebuild the ranking
+        self._rank_central()
+    
+    @staticmethod
+    def _pair(a: str, b: str) -> Tuple[str, str]:
+        return (a, b) if a < b else (b, a)
+    
+    def _add_mention(self, source: str, connection: Connection):
+        """
+        Add one "source mentions target" connection to the edge of that pair
+        """
+        if source == connection.person:
+            return
+        pair = self._pair(source, connection.person)
+        mentions = self._pair_mentions.get(pair, ())
+        self._set_edge(pair, mentions + (connection,))
+    
+    def _set_edge(self, pair: Tuple[str, str], mentions: Tuple[Connection, ...]):
+        """
+        Replace the edge of a pair with one built from its mentions, updating
+        indexes, type counts and degrees; no mentions removes the edge
+        
+        Edges are replaced rather than changed in place, since element lists
+        handed out earlier may still be serialized.
+        """
+        old = self._edges.get(pair)
+        old_mask = old['data']['type_mask'] if old else 0
         
-        # Create nodes
-        nodes = self._create_nodes(all_people, connection_counts)
+        if mentions:
+            edge = self._edge_element(pair, mentions)
+            self._pair_mentions[pair] = mentions
+            self._edges[pair] = edge
+            for name in pair:
+                self._edges_by_person.setdefault(name, {})[pair] = edge
+                if old is None:
+                    self._raise_degree(name)
+            new_mask = edge['data']['type_mask']
+        else:
+            edge = None
+            self._pair_mentions.pop(pair, None)
+            self._edges.pop(pair, None)
+            for name in pair:
+                self._edges_by_person[name].pop(pair, None)
+                self.degree[name] -= 1
+            new_mask = 0
         
-        # Create edges
-        edges = self._create_edges()
+        for conn_type, bit in TYPE_BITS.items():
+            if new_mask & bit:
+                self._edges_by_type.setdefault(conn_type, {})[pair] = edge
+                if not old_mask & bit:
+                    self.connection_types[conn_type] = self.connection_types.get(conn_type, 0) + 1
+            elif old_mask & bit:
+                del self._edges_by_type[conn_type][pair]
+                self.connection_types[conn_type] -= 1
+                if not self.connection_types[conn_type]:
+                    del self.connection_types[conn_type]
+    
+    @staticmethod
+    def _edge_element(pair: Tuple[str, str], mentions: Tuple[Connection, ...]) -> Dict:
+        """
+        Create the element for a pair: weight is the number of mentions from either side
+        """
+        first = mentions[0]
+        # The source of a mention is the side of the pair it does not point to
+        first_source = pair[0] if first.person == pair[1] else pair[1]
+        if len(mentions) == 1:
+            type_mask = TYPE_BITS.get(first.type, TYPE_BITS['other'])
+            details = (first.detail,)
+        else:
+            type_mask = 0
+            for conn in mentions:
+                type_mask |= TYPE_BITS.get(conn.type, TYPE_BITS['other'])
+            details = tuple(conn.detail for conn in mentions)
+        return {
+            'data': {
+                'source': first_source,
+                'target': first.person,
+                'connection_type': first.type,
+                'types': _MASK_TYPES[type_mask],
+                'type_mask': type_mask,
+                'weight': len(mentions),
+                'detail': first.detail,
+                'details': details
+            }
+        }
+    
+    @staticmethod
+    def _company_of(person: Person) -> str:
+        return 'Asymchem' if person.company is None else person.company
+    
+    @staticmethod
+    def _node_class(person: Person) -> str:
+        return 'bd_person' if person.company and person.company != 'Asymchem' else 'leader'
+    
+    def _raise_degree(self, person_name: str):
+        """
+        Increase a person's degree and keep the top-central ranking current
+        
+        Degrees only grow between full rebuilds, so a person outside the
+        ranking can only enter it by passing its last entry.
+        """
+        new_count = self.degree.get(person_name, 0) + 1
+        self.degree[person_name] = new_count
         
-        return nodes, edges
+        top = [entry for entry in self._top_central if entry[1] != person_name]
+        if len(top) == len(self._top_central) and len(top) >= self.TOP_CENTRAL_SIZE and new_count <= top[-1][0]:
+            return
+        position = len(top)
+        while position > 0 and top[position - 1][0] < new_count:
+            position -= 1
+        top.insert(position, (new_count, person_name))
+        self._top_central = top[:self.TOP_CENTRAL_SIZE]
+    
+    def _rank_central(self, size: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Rank people with at least one connection by degree
+        """
+        ranked = sorted(
+            ((count, name) for name, count in self.degree.items() if count),
+            key=lambda x: x[0], reverse=True
+        )
+        if size is None:
+            self._top_central = ranked[:self.TOP_CENTRAL_SIZE]
+        return ranked[:size] if size else ranked
     
-    def _create_nodes(self, all_people: List[Dict], connection_counts: Dict[str, int]) -> List[Dict]:
+    def _create_nodes(self, all_people: List[Person], connection_counts: Dict[str, int],
+                      max_connections: Optional[int] = None, size_counts: Optional[Dict[str, int]] = None) -> List[Dict]:
         """
         Create node elements for the network graph
+        
+        size_counts, if given, sizes nodes by those counts (e.g. degree within
+        a subgraph) while tooltips keep the full connection counts.
         """
         nodes = []
-        max_connections = max(connection_counts.values()) if connection_counts else 1
+        if max_connections is None:
+            max_connections = max((size_counts or connection_counts).values(), default=1)
         
         for person in all_people:
-            person_name = person['name']
+            person_name = person.name
             conn_count = connection_counts.get(person_name, 0)
+            size_count = conn_count if size_counts is None else size_counts.get(person_name, 0)
+            
+            # Reuse the node if it was built for the same count and scale
+            cached = self._node_cache.get(person_name)
+            if size_counts is None and cached and cached[0] == conn_count and cached[1] == max_connections:
+                nodes.append(cached[2])
+                continue
             
             # Scale size from 20 to 80 based on connection count
-            node_size = 20 + (conn_count / max_connections) * 60 if max_connections > 0 else 20
+            node_size = 20 + (size_count / max_connections) * 60 if max_connections > 0 else 20
             
             # Determine node class
-            if person.get('company') and person['company'] != 'Asymchem':
-                node_class = 'bd_person'
-            else:
-                node_class = 'leader'
+            node_class = self._node_class(person)
             
             # Create detailed tooltip
             tooltip = self._create_node_tooltip(person, conn_count)
             
-            nodes.append({
+            node = {
                 'data': {
                     'id': person_name,
                     'label': person_name,
                     'size': node_size,
                     'tooltip': tooltip,
-                    'title': person.get('title', ''),
-                    'company': person.get('company', 'Asymchem'),
+                    'title': person.title,
+                    'company': self._company_of(person),
                     'connections_count': conn_count
                 },
                 'classes': node_class
-            })
+            }
+            if size_counts is None:
+                self._node_cache[person_name] = (conn_count, max_connections, node)
+            nodes.append(node)
         
         return nodes
     
-    def _create_node_tooltip(self, person: Dict, conn_count: int) -> str:
+    def _create_node_tooltip(self, person: Person, conn_count: int) -> str:
         """
         Create detailed tooltip for a node with enhanced connection details
         """
-        name = person['name']
-        title = person.get('title', '')
-        company = person.get('company', 'Asymchem')
+        name = person.name
+        title = person.title
+        company = self._company_of(person)
         
         tooltip = f"<b>{name}</b><br>Title: {title}<br>Company: {company}<br>Connections: {conn_count}"
         
         # Add connection details with better formatting
-        connections_text = person.get('connections') or person.get('key_connections', '')
-        if connections_text:
-            parsed_connections = self.parse_connections(connections_text)
-            if parsed_connections:
-                tooltip += "<br><br><b>Key Connections:</b>"
-                for conn in parsed_connections[:5]:  # Show first 5 connections
-                    if conn['person'] in self.person_names:
-                        # Format connection type with emoji
-                        type_emoji = {
-                            'alumni': '🎓',
-                            'work': '💼',
-                            'event': '🎪',
-                            'network': '🔗',
-                            'other': '📞'
-                        }.get(conn['type'], '📞')
-                        
-                        tooltip += f"<br>{type_emoji} <b>{conn['person']}</b>: {conn['detail']}"
-        
+        parsed_connections = self.connection_map.get(name)
+        if parsed_connections:
+            tooltip += "<br><br><b>Key Connections:</b>"
+            for conn in parsed_connections[:5]:  # Show first 5 connections
+                if conn.person in self.person_names:
+                    # Format connection type with emoji
+                    type_emoji = {
+                        'alumni': '🎓',
+                        'work': '💼',
+                        'event': '🎪',
+                        'network': '🔗',
+                        'other': '📞'
+                    }.get(conn.type, '📞')
+                    
+                    tooltip += f"<br>{type_emoji} <b>{conn.person}</b>: {conn.detail}"
+    
         return tooltip
     
     def _create_edges(self) -> List[Dict]:
         """
-        Create edge elements based on precise connection matching
+        Create one weighted edge per connected pair from all parsed connections
         """
-        edges = []
-        processed_edges = set()
-        
+        pair_mentions = {}
+        person_names = self.person_names
         for person_name, connections in self.connection_map.items():
             for connection in connections:
-                target_person = connection['person']
+                target_person = connection.person
                 
                 # Only create edge if target person exists in our dataset
-                if target_person in self.person_names and person_name != target_person:
-                    # Create unique edge ID
-                    edge_id = tuple(sorted([person_name, target_person]))
-                    
-                    if edge_id not in processed_edges:
-                        edges.append({
-                            'data': {
-                                'source': person_name,
-                                'target': target_person,
-                                'connection_type': connection['type'],
-                                'detail': connection['detail']
-                            }
-                        })
-                        processed_edges.add(edge_id)
-        
-        return edges
+                if target_person in person_names and person_name != target_person:
+                    pair = (person_name, target_person) if person_name < target_person else (target_person, person_name)
+                    pair_mentions[pair] = pair_mentions.get(pair, ()) + (connection,)
+        
+        edge_element = self._edge_element
+        self._pair_mentions = pair_mentions
+        self._edges = {pair: edge_element(pair, mentions) for pair, mentions in pair_mentions.items()}
+        edges_by_person = self._edges_by_person = {name: {} for name in self.people}
+        edges_by_mask = {}
+        for pair, edge in self._edges.items():
+            edges_by_person[pair[0]][pair] = edge
+            edges_by_person[pair[1]][pair] = edge
+            edges_by_mask.setdefault(edge['data']['type_mask'], {})[pair] = edge
+        
+        self.degree = {name: len(edges) for name, edges in edges_by_person.items()}
+        self._edges_by_type = {}
+        for mask, edges in edges_by_mask.items():
+            for conn_type in _MASK_TYPES[mask]:
+                self._edges_by_type.setdefault(conn_type, {}).update(edges)
+        self.connection_types = {conn_type: len(edges) for conn_type, edges in self._edges_by_type.items()}
+        
+        self._rank_central()
+        return list(self._edges.values())
     
-    def get_network_statistics(self) -> Dict:
+    def export_adjacency(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
         """
-        Get network statistics for analysis
-        """
-        if not self.connection_map:
-            return {}
+        Get the network as a CSR adjacency matrix, for analyses outside this process
         
-        total_people = len(self.person_names)
-        total_connections = sum(len(conns) for conns in self.connection_map.values())
-        valid_connections = sum(
-            len([c for c in conns if c['person'] in self.person_names])
-            for conns in self.connection_map.values()
-        )
+        Returns:
+            tuple: (names, indptr, indices, weights); the neighbors of names[i] are
+                   indices[indptr[i]:indptr[i + 1]], with edge weights (mentions) alongside
+        """
+        with self._lock:
+            names = list(self.people)
+            position = {name: i for i, name in enumerate(names)}
+            count = len(self._edges)
+            first = np.fromiter((position[a] for a, _ in self._edges), dtype=np.int32, count=count)
+            second = np.fromiter((position[b] for _, b in self._edges), dtype=np.int32, count=count)
+            weights = np.fromiter((edge['data']['weight'] for edge in self._edges.values()), dtype=np.float32, count=count)
         
-        # Connection type distribution
-        connection_types = {}
-        for connections in self.connection_map.values():
-            for conn in connections:
-                conn_type = conn['type']
-                connection_types[conn_type] = connection_types.get(conn_type, 0) + 1
+        rows = np.concatenate((first, second))
+        order = np.argsort(rows, kind='stable')
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=len(names))))).astype(np.int64)
+        return names, indptr, np.concatenate((second, first))[order], np.concatenate((weights, weights))[order]
+    
+    def get_network_statistics(self) -> Dict:
+        """
+        Get network statistics for analysis
         
-        return {
-            'total_people': total_people,
-            'total_connections': total_connections,
-            'valid_connections': valid_connections,
-            'connection_types': connection_types,
-            'average_connections': valid_connections / total_people if total_people > 0 else 0
-        }
+        total_connections counts every parsed mention; valid_connections and
+        connection_types count connected pairs, matching the graph's edges.
+        """
+        with self._lock:
+            if not self.connection_map:
+                return {}
+            
+            total_people = len(self.person_names)
+            return {
+                'total_people': total_people,
+                'total_connections': self.total_connections,
+                'valid_connections': self.valid_connections,
+                'connection_types': dict(self.connection_types),
+                'average_connections': 2 * self.valid_connections / total_people if total_people > 0 else 0,
+                'central_people': self.find_central_people()
+            }
     
     def find_central_people(self, top_n: int = 5) -> List[Dict]:
         """
-        Find the most connected people in the network
+        Find the most connected people (by number of distinct connected people)
         """
-        if not self.connection_map:
-            return []
-        
-        # Count incoming connections for each person
-        incoming_counts = {}
-        for person_name, connections in self.connection_map.items():
-            for connection in connections:
-                target = connection['person']
-                if target in self.person_names:
-                    incoming_counts[target] = incoming_counts.get(target, 0) + 1
-        
-        # Sort by connection count
-        sorted_people = sorted(
-            incoming_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        return [
-            {'name': name, 'connections': count}
-            for name, count in sorted_people[:top_n]
-        ]
+        with self._lock:
+            if not self.connection_map:
+                return []
+            
+            if top_n <= self.TOP_CENTRAL_SIZE:
+                ranked = self._top_central
+            else:
+                ranked = self._rank_central(top_n)
+            
+            return [
+                {'name': name, 'connections': count}
+                for count, name in ranked[:top_n]
+            ]
     
+    @profiled
     def suggest_connections(self, person_name: str) -> List[Dict]:
         """
         Suggest potential connections for a person
@@ -265,8 +701,8 @@ class NetworkAnalyzer:
             return []
         
         current_connections = {
-            conn['person'] for conn in self.connection_map[person_name]
-            if conn['person'] in self.person_names
+            conn.person for conn in self.connection_map[person_name]
+            if conn.person in self.person_names
         }
         
         # Find people not currently connected
@@ -278,8 +714,8 @@ class NetworkAnalyzer:
             common_connections = []
             if potential in self.connection_map:
                 for conn in self.connection_map[potential]:
-                    if conn['person'] in current_connections:
-                        common_connections.append(conn['person'])
+                    if conn.person in current_connections:
+                        common_connections.append(conn.person)
             
             if common_connections:
                 suggestions.append({
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from metrics import cache_requests
+
+# Market data columns that can be weighted, with their labels
+FACTORS = {
+    'business_potential': 'Business Potential',
+    'tech_mapping': 'Tech Mapping',
+    'market_value': 'Market Value'
+}
+DEFAULT_WEIGHTS = {'business_potential': 5, 'tech_mapping': 3, 'market_value': 2}
+
+# Tier by percentile rank: a company gets the first tier whose threshold its percentile reaches
+TIERS = [('A', 90.0), ('B', 70.0), ('C', 40.0), ('D', 0.0)]
+_TIER_NAMES = np.array([name for name, _ in TIERS], dtype=object)
+_TIER_THRESHOLDS = np.array([threshold for _, threshold in reversed(TIERS)])
+
+# Number of (weights) results kept per data version; each takes about 13 bytes per company
+CACHE_SIZE = 16
+
+
+class OpportunityScorer:
+    """
+    Weighted opportunity scores, percentile ranks and tiers over all market data rows
+
+    Each factor is min-max scaled to 0-1 once per data version; a score is the
+    weighted mean of the scaled factors, on a 0-100 scale. Results are cached
+    per weights, so moving a slider back to an earlier value is free.
+    """
+
+    def __init__(self, df_market: pd.DataFrame, version: str = ''):
+        self.version = version
+        self.companies = df_market['company'].to_numpy() if 'company' in df_market else np.array([], dtype=object)
+        self.row_ids = df_market.index.to_numpy()
+        self._factors = np.empty((len(FACTORS), len(df_market)), dtype=np.float64)
+        for i, column in enumerate(FACTORS):
+            values = pd.to_numeric(df_market[column], errors='coerce').to_numpy(dtype=np.float64) \
+                if column in df_market else np.zeros(len(df_market))
+            low, high = (np.nanmin(values), np.nanmax(values)) if len(values) else (0.0, 0.0)
+            scaled = (values - low) / (high - low) if high > low else np.zeros_like(values)
+            self._factors[i] = np.nan_to_num(scaled)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    @staticmethod
+    def _weights_key(weights: Dict[str, float]) -> Tuple[float, ...]:
+        return tuple(float(weights.get(column, 0) or 0) for column in FACTORS)
+
+    def score(self, weights: Dict[str, float]) -> Dict[str, np.ndarray]:
+        """
+        Score every company for the given factor weights
+
+        Returns:
+            dict: 'score' (0-100), 'percentile' (share of companies scoring lower, 0-100),
+                  'tier' (index into TIERS) and 'order' (row positions from best to worst)
+        """
+        key = self._weights_key(weights)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                cache_requests.inc(cache='opportunity_scores', result='hit')
+                return cached
+        cache_requests.inc(cache='opportunity_scores', result='miss')
+
+        weight_vector = np.array(key, dtype=np.float64)
+        total = weight_vector.sum()
+        if total <= 0:
+            weight_vector = np.ones(len(FACTORS))
+            total = len(FACTORS)
+        scores = weight_vector @ self._factors * (100.0 / total)
+
+        order = np.argsort(-scores, kind='stable')
+        ascending = scores[order[::-1]]
+        percentiles = np.searchsorted(ascending, scores, side='left') * (100.0 / max(len(scores), 1))
+
+        tiers = len(TIERS) - np.searchsorted(_TIER_THRESHOLDS, percentiles, side='right')
+
+        result = {
+            'score': scores.astype(np.float32),
+            'percentile': percentiles.astype(np.float32),
+            'tier': tiers.astype(np.int8),
+            'order': order.astype(np.int32)
+        }
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def ranked(self, weights: Dict[str, float], limit: int = 100) -> List[Dict]:
+        """
+        Get the best-scoring companies as table rows, best first
+        """
+        result = self.score(weights)
+        top = result['order'][:limit]
+        return [
+            {
+                'rank': rank,
+                'id': int(self.row_ids[position]),
+                'company': self.companies[position],
+                'score': round(float(result['score'][position]), 1),
+                'percentile': round(float(result['percentile'][position]), 1),
+                'tier': _TIER_NAMES[result['tier'][position]]
+            }
+            for rank, position in enumerate(top, start=1)
+        ]
+
+    def tier_counts(self, weights: Dict[str, float]) -> Dict[str, int]:
+        """
+        Number of companies in each tier for the given weights
+        """
+        counts = np.bincount(self.score(weights)['tier'], minlength=len(TIERS))
+        return {name: int(count) for (name, _), count in zip(TIERS, counts)}
@@ -0,0 +1,210 @@
+import cProfile
+import functools
+import heapq
+import hmac
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+from flask import has_request_context, jsonify, request
+
+# off (default), always (every wrapped call, subject to PROFILING_SAMPLE_RATE) or
+# header (only requests sending PROFILE_HEADER with PROFILING_TOKEN, e.g. from curl or browser devtools)
+PROFILING_MODE = os.getenv('PROFILING', 'off').strip().lower()
+PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '50'))
+PROFILING_SLOWEST = int(os.getenv('PROFILING_SLOWEST', '20'))
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '1.0'))
+# Value PROFILE_HEADER must carry in header mode and on /debug/profiles; required,
+# or any client could turn on profiling or read the recorded profiles
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+PROFILE_HEADER = 'X-Profile'
+
+ENABLED = PROFILING_MODE == 'always' or (PROFILING_MODE == 'header' and bool(PROFILING_TOKEN))
+if PROFILING_MODE == 'header' and not PROFILING_TOKEN:
+    print("Profiling disabled: PROFILING=header requires PROFILING_TOKEN")
+
+# Number of functions (by cumulative time) and allocation sites kept per record
+TOP_ENTRIES = 10
+
+# One profile at a time per process: tracemalloc is process-wide, and a
+# second cProfile would replace the first one's hook
+_profile_lock = threading.Lock()
+_records_lock = threading.Lock()
+_slowest: List[tuple] = []
+_sequence = 0
+
+
+def _requested() -> bool:
+    """
+    Check whether the current call should be profiled
+    """
+    if PROFILING_MODE == 'always':
+        return PROFILING_SAMPLE_RATE >= 1 or random.random() < PROFILING_SAMPLE_RATE
+    if not has_request_context():
+        return False
+    return _token_matches()
+
+
+def _token_matches() -> bool:
+    """
+    Check whether the current request's PROFILE_HEADER carries PROFILING_TOKEN
+    """
+    value = request.headers.get(PROFILE_HEADER)
+    if not value or not PROFILING_TOKEN:
+        return False
+    return hmac.compare_digest(value.encode('utf-8'), PROFILING_TOKEN.encode('utf-8'))
+
+
+def profiled(func=None, *, name: str = None):
+    """
+    Profile a function with cProfile and tracemalloc when profiling is enabled
+
+    With PROFILING unset or off the function is returned unchanged, so there
+    is no overhead. Calls made while another profile is running (nested
+    profiled functions, or concurrent requests) are not profiled separately.
+    """
+    if func is None:
+        return lambda f: profiled(f, name=name)
+    if not ENABLED:
+        return func
+
+    label = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _requested() or not _profile_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            return _run_profiled(label, func, args, kwargs)
+        finally:
+            _profile_lock.release()
+
+    return wrapper
+
+
+def _run_profiled(label: str, func, args, kwargs):
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        allocations = tracemalloc.take_snapshot().compare_to(before, 'lineno')[:TOP_ENTRIES]
+        if started_tracing:
+            tracemalloc.stop()
+        try:
+            _save_profile(label, seconds, peak, profiler, allocations)
+        except Exception as e:
+            print(f"Error saving profile for {label}: {e}")
+
+
+def _save_profile(label: str, seconds: float, peak_bytes: int, profiler: cProfile.Profile, allocations):
+    """
+    Write the pstats file, rotate old ones and update the slowest-calls record
+    """
+    global _sequence
+    os.makedirs(PROFILING_DIR, exist_ok=True)
+    now = datetime.now()
+    filename = f"{now:%Y%m%d-%H%M%S-%f}-{label.replace('.', '_')}-{seconds * 1000:.0f}ms.prof"
+    path = os.path.join(PROFILING_DIR, filename)
+    profiler.dump_stats(path)
+
+    stats = pstats.Stats(profiler)
+    top_functions = [
+        {'function': pstats.func_std_string(func), 'calls': calls, 'cumulative_seconds': round(cumulative, 6)}
+        for func, (_, calls, _, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+    ]
+    record = {
+        'name': label,
+        'seconds': round(seconds, 6),
+        'peak_memory_mb': round(peak_bytes / 1024 / 1024, 3),
+        'timestamp': now.isoformat(),
+        'path': request.path if has_request_context() else None,
+        'profile': filename,
+        'top_functions': top_functions,
+        'top_allocations': [
+            {'location': str(stat.traceback), 'size_kb': round(stat.size_diff / 1024, 1), 'count': stat.count_diff}
+            for stat in allocations
+        ],
+    }
+
+    with _records_lock:
+        _sequence += 1
+        entry = (seconds, _sequence, record)
+        if len(_slowest) < PROFILING_SLOWEST:
+            heapq.heappush(_slowest, entry)
+        elif seconds > _slowest[0][0]:
+            heapq.heapreplace(_slowest, entry)
+        keep = {item[2]['profile'] for item in _slowest}
+        _rotate(keep)
+        with open(os.path.join(PROFILING_DIR, 'slowest.json'), 'w') as f:
+            json.dump(_sorted_records(), f, indent=2)
+
+
+def _rotate(keep: set):
+    """
+    Delete the oldest .prof files beyond PROFILING_MAX_FILES, keeping those of the slowest calls
+    """
+    files = sorted(name for name in os.listdir(PROFILING_DIR) if name.endswith('.prof'))
+    excess = len(files) - PROFILING_MAX_FILES
+    for name in files:
+        if excess <= 0:
+            break
+        if name in keep:
+            continue
+        try:
+            os.remove(os.path.join(PROFILING_DIR, name))
+        except OSError:
+            pass
+        excess -= 1
+
+
+def get_slowest_profiles() -> List[Dict]:
+    """
+    Get the records of the slowest profiled calls, slowest first
+    """
+    with _records_lock:
+        return _sorted_records()
+
+
+def _sorted_records() -> List[Dict]:
+    return [record for _, _, record in sorted(_slowest, reverse=True)]
+
+
+def register_profiling_routes(server):
+    """
+    Expose /debug/profiles with the slowest profiled calls when profiling is enabled
+
+    The route needs PROFILING_TOKEN, sent in PROFILE_HEADER; without a token
+    set it is not registered. Records are kept per process; with several gunicorn workers each worker
+    reports (and writes to PROFILING_DIR) its own calls.
+    """
+    if not ENABLED:
+        return
+
+    print(f"Profiling enabled ({PROFILING_MODE}); writing profiles to {os.path.abspath(PROFILING_DIR)}")
+    if not PROFILING_TOKEN:
+        print("/debug/profiles disabled: set PROFILING_TOKEN to serve it")
+        return
+
+    @server.route('/debug/profiles')
+    def slowest_profiles():
+        if not _token_matches():
+            return jsonify({'error': f'{PROFILE_HEADER} header with PROFILING_TOKEN required'}), 403
+        return jsonify(get_slowest_profiles())
@@ -0,0 +1,182 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Market data fields describing what a company does and needs
+TEXT_FIELDS = ('focus', 'pain_point', 'solution')
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-/][a-z0-9]+)*")
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from in into is it its of on or our the their to with via'.split()
+)
+
+# Rebuild (refreshing IDF weights) once incremental inserts exceed this share of the indexed companies
+REBUILD_FRACTION = 0.1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase words and adjacent word pairs (bigrams), without stop words
+    """
+    words = [word for word in TOKEN_PATTERN.findall((text or '').lower()) if word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _company_terms(record: Dict) -> Counter:
+    return Counter(term for field in TEXT_FIELDS for term in tokenize(record.get(field)))
+
+
+class ProspectIndex:
+    """
+    TF-IDF index over market focus, pain point and solution text for look-alike queries
+
+    Term weights are stored as an inverted index (postings per term) in NumPy
+    arrays, so a query only touches the companies sharing a term with it.
+    Companies added after the build use the build's IDF weights; call
+    needs_rebuild() to know when to build a fresh index.
+    """
+
+    def __init__(self, df_market: pd.DataFrame, version: str = ''):
+        self.version = version
+        self._lock = threading.RLock()
+        self._vocabulary = {}
+        self._row_ids = []
+        self._companies = []
+        self._texts = []
+        self._doc_by_row = {}
+        self._doc_by_company = {}
+        # Postings added since the build: term -> [(doc, weight)]
+        self._added_postings = {}
+        self._added = 0
+        self._build(df_market)
+
+    def _build(self, df_market: pd.DataFrame):
+        term_ids, doc_ids, counts = [], [], []
+        records = df_market.to_dict('records')
+        for doc, (row_id, record) in enumerate(zip(df_market.index, records)):
+            self._register(doc, row_id, record)
+            for term, count in _company_terms(record).items():
+                term_ids.append(self._vocabulary.setdefault(term, len(self._vocabulary)))
+                doc_ids.append(doc)
+                counts.append(count)
+
+        n_docs, n_terms = len(records), len(self._vocabulary)
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+
+        doc_freq = np.bincount(term_ids, minlength=n_terms)
+        self._n_built = n_docs
+        self._idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float64))) * self._idf[term_ids]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights * weights, minlength=n_docs))
+        weights = (weights / norms[doc_ids]).astype(np.float32)
+
+        order = np.argsort(term_ids, kind='stable')
+        self._posting_docs = doc_ids[order]
+        self._posting_weights = weights[order]
+        self._posting_start = np.concatenate(([0], np.cumsum(doc_freq))).astype(np.int64)
+        self._active = np.ones(n_docs, dtype=bool)
+
+    def _register(self, doc: int, row_id, record: Dict):
+        if row_id in self._doc_by_row:
+            self._active[self._doc_by_row[row_id]] = False
+        self._row_ids.append(row_id)
+        self._companies.append(record['company'])
+        self._texts.append(tuple(record.get(field) for field in TEXT_FIELDS))
+        self._doc_by_row[row_id] = doc
+        self._doc_by_company[record['company']] = doc
+
+    def __len__(self) -> int:
+        return int(self._active.sum())
+
+    def needs_rebuild(self) -> bool:
+        """
+        Whether enough companies were added since the build that IDF weights should be refreshed
+        """
+        return self._added > REBUILD_FRACTION * max(self._n_built, 10)
+
+    def add(self, rows: Iterable[Dict]):
+        """
+        Add or replace companies (market data dicts with an id) without rebuilding the index
+        """
+        with self._lock:
+            for row in rows:
+                doc = len(self._row_ids)
+                replaced = self._doc_by_row.get(row['id'])
+                self._active = np.append(self._active, True)
+                if replaced is not None and self._doc_by_company.get(self._companies[replaced]) == replaced:
+                    del self._doc_by_company[self._companies[replaced]]
+                self._register(doc, row['id'], row)
+                terms, weights = self._vector(self._texts[doc], add_terms=True)
+                for term, weight in zip(terms, weights):
+                    self._added_postings.setdefault(term, []).append((doc, weight))
+                self._added += 1
+
+    def _vector(self, texts: Iterable[Optional[str]], add_terms: bool = False):
+        """
+        Normalized TF-IDF weights of a text's terms; unknown terms are skipped unless add_terms
+        """
+        counts = Counter(term for text in texts for term in tokenize(text))
+        terms, weights = [], []
+        new_idf = math.log((1 + self._n_built) / 2) + 1
+        for term, count in counts.items():
+            term_id = self._vocabulary.get(term)
+            if term_id is None:
+                if not add_terms:
+                    continue
+                term_id = self._vocabulary[term] = len(self._vocabulary)
+            idf = self._idf[term_id] if term_id < len(self._idf) else new_idf
+            terms.append(term_id)
+            weights.append((1 + math.log(count)) * idf)
+        norm = math.sqrt(sum(weight * weight for weight in weights)) or 1.0
+        return terms, [weight / norm for weight in weights]
+
+    def _top(self, terms: List[int], weights: List[float], k: int, exclude: Optional[int] = None) -> List[Dict]:
+        scores = np.zeros(len(self._row_ids), dtype=np.float32)
+        for term, weight in zip(terms, weights):
+            if term < len(self._idf):
+                start, end = self._posting_start[term], self._posting_start[term + 1]
+                scores[self._posting_docs[start:end]] += weight * self._posting_weights[start:end]
+            for doc, doc_weight in self._added_postings.get(term, ()):
+                scores[doc] += weight * doc_weight
+        scores[~self._active] = 0
+        if exclude is not None:
+            scores[exclude] = 0
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [
+            {'id': self._row_ids[doc], 'company': self._companies[doc], 'similarity': min(float(scores[doc]), 1.0)}
+            for doc in top if scores[doc] > 0
+        ]
+
+    def similar_to(self, company: str, k: int = 10) -> List[Dict]:
+        """
+        Find the companies whose focus, pain point and solution text is most similar to a company's
+
+        Returns:
+            list: Dicts with id, company and cosine similarity, most similar first
+        """
+        with self._lock:
+            doc = self._doc_by_company.get(company)
+            if doc is None:
+                return []
+            terms, weights = self._vector(self._texts[doc])
+            return [match for match in self._top(terms, weights, k + 1, exclude=doc)
+                    if match['company'] != company][:k]
+
+    def search(self, text: str, k: int = 10) -> List[Dict]:
+        """
+        Find the companies most similar to free text (e.g. "mRNA cost reduction")
+        """
+        with self._lock:
+            terms, weights = self._vector([text])
+            return self._top(terms, weights, k)
@@ -0,0 +1,60 @@
+import os
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from flask import jsonify, request
+
+from database import get_data_version, parse_data_version, get_changes_since
+
+# Rows are timestamped by the worker that writes them, so one can commit
+# slightly after a later-stamped row from another worker. Every change feed
+# re-sends this window before the token; changes are applied by id, so the
+# repeats are harmless.
+SYNC_OVERLAP_SECONDS = float(os.getenv('SYNC_OVERLAP_SECONDS', '5'))
+
+
+def get_changes(since: Optional[str] = None) -> Dict:
+    """
+    Get the rows changed since a version token
+
+    Args:
+        since (str): Token from an earlier call or get_data_version(); empty for every row
+
+    Returns:
+        dict: 'version' (token to pass next time), 'changed' and the changed
+        'market', 'bd' and 'leadership' rows, each with its id and updated_at
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    since_time = parse_data_version(since)
+    version = get_data_version()
+    if since and version == since:
+        return {'version': version, 'changed': False, 'market': [], 'bd': [], 'leadership': []}
+
+    if since_time is not None:
+        since_time -= timedelta(seconds=SYNC_OVERLAP_SECONDS)
+    changes = get_changes_since(since_time)
+    for rows in changes.values():
+        for row in rows:
+            row['updated_at'] = row['updated_at'].isoformat() if row['updated_at'] else None
+    return dict(changes, version=version, changed=True)
+
+
+def register_sync_routes(server, edges_for_changes: Optional[Callable[[Dict], List[Dict]]] = None):
+    """
+    Register /api/changes?since=<token> on the Flask server
+
+    edges_for_changes, if given, returns the network edges touching the
+    changed people; they are added to the response as 'edges'.
+    """
+
+    @server.route('/api/changes')
+    def api_changes():
+        try:
+            changes = get_changes(request.args.get('since', ''))
+        except ValueError:
+            return jsonify({'error': 'Invalid version token'}), 400
+        if edges_for_changes is not None:
+            changes['edges'] = edges_for_changes(changes) if changes['changed'] else []
+        return jsonify(changes)
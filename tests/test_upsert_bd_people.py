@@ -0,0 +1,144 @@
+import pytest
+
+import database
+from database import BDData, FollowUp, configure_database, init_database, get_session, upsert_bd_people
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    original = database.DATABASE_URL
+    configure_database(f"sqlite:///{tmp_path / 'test.db'}")
+    init_database()
+    yield
+    configure_database(original)
+
+
+def _contacts():
+    session = get_session()
+    try:
+        return session.query(BDData).order_by(BDData.id).all()
+    finally:
+        session.close()
+
+
+def _follow_ups():
+    session = get_session()
+    try:
+        return {f.bd_id: f for f in session.query(FollowUp).all()}
+    finally:
+        session.close()
+
+
+def test_linkedin_first_then_email_updates_the_contact():
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'linkedin': 'https://www.linkedin.com/in/anaruiz/'}])
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'Ana@Moderna.com',
+                       'linkedin': 'linkedin.com/in/anaruiz', 'action': 'Email Sep 10, 2025: Pitch biocatalysis'}])
+
+    contacts = _contacts()
+    assert len(contacts) == 1
+    assert contacts[0].email == 'Ana@Moderna.com'
+    assert contacts[0].email_key == 'ana@moderna.com'
+    assert contacts[0].linkedin_key == 'linkedin.com/in/anaruiz'
+    assert _follow_ups()[contacts[0].id].summary == 'Pitch biocatalysis'
+
+
+def test_email_first_then_linkedin_only_updates_the_contact():
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com',
+                       'linkedin': 'linkedin.com/in/anaruiz'}])
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'linkedin': 'linkedin.com/in/anaruiz',
+                       'school': 'MIT'}])
+
+    contacts = _contacts()
+    assert len(contacts) == 1
+    assert contacts[0].email == 'ana@moderna.com'
+    assert contacts[0].school == 'MIT'
+
+
+def test_batch_rows_sharing_either_key_are_merged():
+    count = upsert_bd_people([
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com', 'school': 'MIT'},
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'linkedin': 'linkedin.com/in/anaruiz', 'action': 'Call Oct 2'},
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ANA@moderna.com', 'linkedin': 'https://linkedin.com/in/anaruiz'},
+    ])
+
+    contacts = _contacts()
+    assert count == 1
+    assert len(contacts) == 1
+    assert contacts[0].school == 'MIT'
+    assert contacts[0].action == 'Call Oct 2'
+    assert contacts[0].linkedin_key == 'linkedin.com/in/anaruiz'
+
+
+def test_batch_rows_match_stored_contacts_by_either_key():
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'linkedin': 'linkedin.com/in/anaruiz'}])
+    upsert_bd_people([
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com', 'linkedin': 'linkedin.com/in/anaruiz'},
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com', 'action': 'Email Oct 1: intro'},
+    ])
+
+    contacts = _contacts()
+    assert len(contacts) == 1
+    assert contacts[0].email_key == 'ana@moderna.com'
+    assert contacts[0].action == 'Email Oct 1: intro'
+    assert len(_follow_ups()) == 1
+
+
+def test_blank_fields_keep_stored_values():
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com', 'school': 'MIT'}])
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': '', 'email': ' ana@moderna.com '}])
+
+    contacts = _contacts()
+    assert (contacts[0].company, contacts[0].school) == ('Moderna', 'MIT')
+
+
+def test_linkedin_of_a_contact_with_another_email_is_rejected():
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com',
+                       'linkedin': 'linkedin.com/in/anaruiz'}])
+
+    with pytest.raises(ValueError):
+        upsert_bd_people([{'name': 'Bo Chen', 'company': 'Moderna', 'email': 'bo@moderna.com',
+                           'linkedin': 'linkedin.com/in/anaruiz'}])
+    assert [c.email for c in _contacts()] == ['ana@moderna.com']
+
+
+def test_batch_giving_one_linkedin_two_emails_is_rejected():
+    with pytest.raises(ValueError):
+        upsert_bd_people([
+            {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com', 'linkedin': 'linkedin.com/in/anaruiz'},
+            {'name': 'Bo Chen', 'company': 'Moderna', 'email': 'bo@moderna.com', 'linkedin': 'linkedin.com/in/anaruiz'},
+        ])
+    assert _contacts() == []
+
+
+def test_email_and_linkedin_of_two_stored_contacts_are_rejected():
+    upsert_bd_people([
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com'},
+        {'name': 'A. Ruiz', 'company': 'Moderna', 'linkedin': 'linkedin.com/in/anaruiz'},
+    ])
+
+    with pytest.raises(ValueError):
+        upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com',
+                           'linkedin': 'linkedin.com/in/anaruiz', 'school': 'MIT'}])
+    assert [c.school for c in _contacts()] == ['', '']
+
+
+def test_people_without_keys_match_by_name_and_company():
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Moderna'}])
+    upsert_bd_people([{'name': ' ana  RUIZ', 'company': 'moderna', 'action': 'Email Oct 1: intro'}])
+    upsert_bd_people([{'name': 'Ana Ruiz', 'company': 'Pfizer'}])
+
+    contacts = _contacts()
+    assert [(c.name, c.company) for c in contacts] == [(' ana  RUIZ', 'moderna'), ('Ana Ruiz', 'Pfizer')]
+    assert contacts[0].action == 'Email Oct 1: intro'
+    assert list(_follow_ups()) == [contacts[0].id]
+
+
+def test_batch_people_without_keys_merge_into_a_contact_with_their_name():
+    count = upsert_bd_people([
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'email': 'ana@moderna.com'},
+        {'name': 'Ana Ruiz', 'company': 'Moderna', 'school': 'MIT'},
+    ])
+
+    contacts = _contacts()
+    assert count == 1
+    assert (contacts[0].email, contacts[0].school) == ('ana@moderna.com', 'MIT')